@@ -10,6 +10,7 @@ Outputs:
 - Trait Classification (Intellectual Processor, Zen Master, Adaptive Solver)
 - Composite Cognitive Profile
 - Recommendations for Growth Plan
+- Live fatigue / drift detection during N-Back and Stroop sessions
 
 Ethical Constraints:
 - Vietnamese language output
@@ -20,7 +21,14 @@ Ethical Constraints:
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
+from collections import deque
 import json
+import logging
+import math
+
+from reaction_time_fitting import event_reaction_time
+
+logger = logging.getLogger(__name__)
 
 # ============================================================================
 # DATA MODELS
@@ -427,6 +435,182 @@ def profile_to_json(profile: AdvancedCognitiveProfile) -> str:
     return json.dumps(data, ensure_ascii=False, indent=2)
 
 
+# ============================================================================
+# STREAMING FATIGUE DETECTION (N-Back / Stroop live sessions)
+# ============================================================================
+
+@dataclass
+class FatigueConfig:
+    """Tuning for the live fatigue detector (all updates are O(1) per trial)."""
+    warmup_trials: int = 12          # Trials used to learn the child's own baseline
+    window_size: int = 10            # Sliding window for live RT / accuracy
+    rt_delta: float = 0.5            # Page-Hinkley drift allowance (baseline SDs)
+    rt_threshold: float = 6.0        # Page-Hinkley alarm level (baseline SDs)
+    error_slack: float = 0.15        # CUSUM allowance above baseline error rate
+    error_threshold: float = 3.0     # CUSUM alarm level (excess errors)
+    min_rt_cv: float = 0.15          # Floor for baseline SD as a share of mean RT
+
+
+# Presets keyed by the stored game_sessions.game_type:
+# N-Back (time_warp_cargo) trials are slower and more variable than Stroop (command_override)
+FATIGUE_PRESETS: Dict[str, FatigueConfig] = {
+    "time_warp_cargo": FatigueConfig(warmup_trials=12, window_size=8, rt_threshold=7.0),
+    "command_override": FatigueConfig(warmup_trials=15, window_size=12),
+}
+
+
+def fatigue_config(game_type: Optional[str]) -> FatigueConfig:
+    """Preset for a stored game_type, or the defaults (logged) if there is none."""
+    preset = FATIGUE_PRESETS.get(game_type or "")
+    if preset is None:
+        logger.warning("No fatigue preset for game_type %r; using defaults", game_type)
+        return FatigueConfig()
+    return preset
+
+
+@dataclass
+class FatigueStatus:
+    """Detector state after one trial."""
+    trial_index: int
+    window_rt_ms: float
+    window_accuracy: float
+    rt_drift: float        # Page-Hinkley statistic (baseline SDs)
+    error_drift: float     # CUSUM statistic (excess errors)
+    fatigued: bool
+    reason: Optional[str] = None
+    message_vi: Optional[str] = None
+
+
+class FatigueDetector:
+    """
+    Streaming fatigue / drift detector for a live session.
+
+    - Warmup: Welford mean/SD of RT and baseline error rate
+    - Rising RT: one-sided Page-Hinkley test on baseline z-scores
+    - Accuracy decay: one-sided CUSUM on the error indicator
+    - Sliding window (deque + running sums) for live display values
+    """
+
+    def __init__(self, config: Optional[FatigueConfig] = None):
+        self.config = config or FatigueConfig()
+        self.trial_index = 0
+
+        # Warmup baseline (Welford)
+        self._base_n = 0
+        self._base_mean = 0.0
+        self._base_m2 = 0.0
+        self._base_errors = 0
+
+        # Sliding window
+        self._window: deque = deque()
+        self._window_rt_sum = 0.0
+        self._window_correct = 0
+
+        # Page-Hinkley (RT) and CUSUM (errors)
+        self._ph_sum = 0.0
+        self._ph_min = 0.0
+        self._cusum = 0.0
+        self._alarm_reason: Optional[str] = None
+
+    @property
+    def baseline_ready(self) -> bool:
+        return self._base_n >= self.config.warmup_trials
+
+    def push(self, reaction_time_ms: float, is_correct: bool) -> FatigueStatus:
+        """Feed one trial and return the updated status."""
+        cfg = self.config
+        self.trial_index += 1
+
+        # ---- Sliding window ----
+        self._window.append((reaction_time_ms, is_correct))
+        self._window_rt_sum += reaction_time_ms
+        self._window_correct += int(is_correct)
+        if len(self._window) > cfg.window_size:
+            old_rt, old_correct = self._window.popleft()
+            self._window_rt_sum -= old_rt
+            self._window_correct -= int(old_correct)
+
+        if not self.baseline_ready:
+            # ---- Warmup: learn the baseline ----
+            self._base_n += 1
+            delta = reaction_time_ms - self._base_mean
+            self._base_mean += delta / self._base_n
+            self._base_m2 += delta * (reaction_time_ms - self._base_mean)
+            self._base_errors += int(not is_correct)
+        elif self._alarm_reason is None:
+            # ---- Drift tests ----
+            sd = max(cfg.min_rt_cv * self._base_mean, math.sqrt(self._base_m2 / max(1, self._base_n - 1)))
+            z = (reaction_time_ms - self._base_mean) / sd
+            self._ph_sum += z - cfg.rt_delta
+            self._ph_min = min(self._ph_min, self._ph_sum)
+
+            # Laplace-smoothed so an error-free warmup doesn't make every miss an alarm
+            base_error_rate = (self._base_errors + 1) / (self._base_n + 2)
+            self._cusum = max(0.0, self._cusum + (not is_correct) - base_error_rate - cfg.error_slack)
+
+            if self._ph_sum - self._ph_min > cfg.rt_threshold:
+                self._alarm_reason = "rt_drift"
+            elif self._cusum > cfg.error_threshold:
+                self._alarm_reason = "accuracy_decay"
+
+        return self.status()
+
+    def status(self) -> FatigueStatus:
+        """Current status without consuming a trial."""
+        n = len(self._window)
+        fatigued = self._alarm_reason is not None
+        return FatigueStatus(
+            trial_index=self.trial_index,
+            window_rt_ms=self._window_rt_sum / n if n else 0.0,
+            window_accuracy=self._window_correct / n * 100 if n else 0.0,
+            rt_drift=self._ph_sum - self._ph_min,
+            error_drift=self._cusum,
+            fatigued=fatigued,
+            reason=self._alarm_reason,
+            message_vi=FATIGUE_MESSAGES_VI.get(self._alarm_reason) if fatigued else None
+        )
+
+
+FATIGUE_MESSAGES_VI = {
+    "rt_drift": "Con đang phản hồi chậm dần. Mình nghỉ một chút rồi chơi tiếp nhé!",
+    "accuracy_decay": "Con có vẻ đã hơi mệt. Nghỉ ngơi một lát sẽ giúp con tập trung hơn.",
+}
+
+
+def replay_fatigue(
+    telemetry: List[Dict[str, Any]],
+    game_type: Optional[str] = None,
+    config: Optional[FatigueConfig] = None
+) -> Dict[str, Any]:
+    """
+    Replay stored per-trial telemetry through the live detector.
+
+    Input: `game_sessions.telemetry` events with reaction_time (or
+    reaction_time_ms) / is_correct
+    Output: first alarm (if any) and the full status trace for validation
+    """
+    detector = FatigueDetector(config or fatigue_config(game_type))
+    trace = []
+    first_alarm = None
+
+    for event in telemetry:
+        reaction_time_ms = event_reaction_time(event)
+        if reaction_time_ms is None:
+            continue
+        status = detector.push(reaction_time_ms, bool(event.get("is_correct", True)))
+        trace.append(status)
+        if status.fatigued and first_alarm is None:
+            first_alarm = status
+
+    return {
+        "trials": detector.trial_index,
+        "fatigued": first_alarm is not None,
+        "alarm_trial": first_alarm.trial_index if first_alarm else None,
+        "reason": first_alarm.reason if first_alarm else None,
+        "trace": trace
+    }
+
+
 # ============================================================================
 # EXAMPLE USAGE
 # ============================================================================
@@ -479,3 +663,21 @@ if __name__ == "__main__":
     print("\n" + "=" * 60)
     print("JSON Output:")
     print(profile_to_json(profile))
+
+    # Live fatigue detection (replayed Stroop session: RT drifts up after trial 30)
+    import random
+    random.seed(1)
+    stroop_telemetry = [
+        {"type": "response", "timestamp": 1_700_000_000_000 + i * 1500,
+         "reaction_time": round(random.gauss(450 + max(0, i - 30) * 12, 50)),
+         "is_correct": random.random() > (0.05 if i < 30 else 0.2), "trial_index": i}
+        for i in range(60)
+    ]
+    fatigue = replay_fatigue(stroop_telemetry, game_type="command_override")
+    assert fatigue["trials"] == 60 and fatigue["fatigued"], fatigue["trials"]
+
+    print("\n" + "=" * 60)
+    print("😴 FATIGUE REPLAY")
+    print(f"   Fatigued: {fatigue['fatigued']} at trial {fatigue['alarm_trial']} ({fatigue['reason']})")
+    if fatigue["fatigued"]:
+        print(f"   {fatigue['trace'][-1].message_vi}")
@@ -0,0 +1,439 @@
+"""
+📬 ASSESSMENT PROCESSING PIPELINE
+==================================
+Queue-backed, asynchronous processing of completed assessment sessions.
+
+Flow:
+    enqueue(session) → SQLite queue → worker pool → ResultSink
+
+Each job runs:
+1. analyze_advanced_metrics()  (if N-Back / Stroop / Wisconsin data is present)
+2. calculate_profile() + generate_growth_plan()
+
+Guarantees:
+- Durable: jobs live in a local SQLite file (WAL) and survive restarts
+- Bounded: each of the `workers` threads processes one job at a time;
+  enqueue() refuses new work once `max_pending` jobs are waiting (backpressure)
+- Retries with exponential backoff, then dead-lettering after `max_attempts`
+- Queue errors (e.g. a locked database) are logged and retried; workers stay alive
+- Throughput / lag metrics for monitoring after-school bursts
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Callable, Optional
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from analyze_traits import analyze_advanced_metrics, generate_trait_report
+from growth_engine import generate_growth_plan, growth_plan_to_json
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+STATUS_QUEUED = "queued"
+STATUS_IN_FLIGHT = "in_flight"
+STATUS_DONE = "done"
+STATUS_DEAD = "dead"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, available_at, id);
+"""
+
+
+class QueueFullError(RuntimeError):
+    """Raised by enqueue() when the pending backlog is at capacity."""
+
+
+# ============================================================================
+# DURABLE QUEUE
+# ============================================================================
+
+class SessionQueue:
+    """SQLite-backed job queue, safe to share between worker threads."""
+
+    def __init__(self, path: str, max_pending: Optional[int] = None, lease_seconds: float = 300.0):
+        self.path = path
+        self.max_pending = max_pending
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, payload: Dict[str, Any]) -> int:
+        """Add a completed session; raises QueueFullError under backpressure."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.max_pending is not None:
+                pending = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = ?", (STATUS_QUEUED,)
+                ).fetchone()[0]
+                if pending >= self.max_pending:
+                    raise QueueFullError(f"{pending} sessions already pending")
+            now = time.time()
+            cursor = conn.execute(
+                "INSERT INTO jobs (payload, available_at, enqueued_at) VALUES (?, ?, ?)",
+                (json.dumps(payload, ensure_ascii=False), now, now)
+            )
+            conn.execute("COMMIT")
+            return cursor.lastrowid
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest ready job (also reclaims expired leases)."""
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                """
+                SELECT id, payload, attempts, enqueued_at FROM jobs
+                WHERE (status = ? AND available_at <= ?)
+                   OR (status = ? AND started_at <= ?)
+                ORDER BY id LIMIT 1
+                """,
+                (STATUS_QUEUED, now, STATUS_IN_FLIGHT, now - self.lease_seconds)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (STATUS_IN_FLIGHT, now, row[0])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return {
+            "id": row[0],
+            "payload": json.loads(row[1]),
+            "attempts": row[2] + 1,
+            "enqueued_at": row[3],
+        }
+
+    def ack(self, job_id: int) -> None:
+        self._conn().execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, last_error = NULL WHERE id = ?",
+            (STATUS_DONE, time.time(), job_id)
+        )
+
+    def fail(self, job_id: int, error: str, retry_in: Optional[float]) -> None:
+        """Schedule a retry after `retry_in` seconds, or dead-letter if None."""
+        now = time.time()
+        if retry_in is None:
+            self._conn().execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, last_error = ? WHERE id = ?",
+                (STATUS_DEAD, now, error, job_id)
+            )
+        else:
+            self._conn().execute(
+                "UPDATE jobs SET status = ?, available_at = ?, started_at = NULL, last_error = ? WHERE id = ?",
+                (STATUS_QUEUED, now + retry_in, error, job_id)
+            )
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {STATUS_QUEUED: 0, STATUS_IN_FLIGHT: 0, STATUS_DONE: 0, STATUS_DEAD: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT id, payload, attempts, last_error FROM jobs WHERE status = ? ORDER BY id",
+            (STATUS_DEAD,)
+        ).fetchall()
+        return [
+            {"id": r[0], "payload": json.loads(r[1]), "attempts": r[2], "last_error": r[3]}
+            for r in rows
+        ]
+
+    def requeue_dead(self) -> int:
+        """Move dead-lettered jobs back to the queue (e.g. after a bug fix)."""
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = ?, attempts = 0, available_at = ? WHERE status = ?",
+            (STATUS_QUEUED, time.time(), STATUS_DEAD)
+        )
+        return cursor.rowcount
+
+
+# ============================================================================
+# RESULT SINKS
+# ============================================================================
+
+class ResultSink(ABC):
+    """Destination for pipeline results."""
+
+    @abstractmethod
+    def write(self, job_id: int, payload: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Persist one result; raising makes the job retry."""
+
+
+class MemorySink(ResultSink):
+    """Keeps results in a dict (tests, notebooks)."""
+
+    def __init__(self):
+        self.results: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def write(self, job_id: int, payload: Dict[str, Any], result: Dict[str, Any]) -> None:
+        with self._lock:
+            self.results[job_id] = result
+
+
+class JsonlSink(ResultSink):
+    """Appends one JSON line per result to a local file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, job_id: int, payload: Dict[str, Any], result: Dict[str, Any]) -> None:
+        line = json.dumps({"job_id": job_id, **result}, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+# ============================================================================
+# PROCESSING
+# ============================================================================
+
+def process_session(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the analysis chain for one completed session.
+
+    Input: {"child_name", "game_data", "advanced"?, "plan_duration_months"?}
+    Output: trait report (if advanced data present) + growth plan
+    """
+    result: Dict[str, Any] = {"child_name": payload.get("child_name", "")}
+
+    if payload.get("advanced"):
+        profile = analyze_advanced_metrics(payload["advanced"])
+        result["trait_report"] = generate_trait_report(profile)
+
+    plan = generate_growth_plan(
+        child_name=payload.get("child_name", ""),
+        game_data=payload.get("game_data", {}),
+        plan_duration_months=payload.get("plan_duration_months", 6)
+    )
+    result["growth_plan"] = json.loads(growth_plan_to_json(plan))
+    return result
+
+
+@dataclass
+class PipelineMetrics:
+    """Throughput and lag counters (thread-safe via the pipeline lock)."""
+    started_at: float = field(default_factory=time.time)
+    processed: int = 0
+    retried: int = 0
+    dead_lettered: int = 0
+    queue_errors: int = 0
+    total_lag_s: float = 0.0
+    max_lag_s: float = 0.0
+    total_processing_s: float = 0.0
+
+    def snapshot(self, queue_counts: Dict[str, int]) -> Dict[str, Any]:
+        elapsed = max(1e-9, time.time() - self.started_at)
+        return {
+            "processed": self.processed,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "queue_errors": self.queue_errors,
+            "throughput_per_s": round(self.processed / elapsed, 2),
+            "avg_lag_s": round(self.total_lag_s / self.processed, 3) if self.processed else 0.0,
+            "max_lag_s": round(self.max_lag_s, 3),
+            "avg_processing_ms": round(self.total_processing_s / self.processed * 1000, 2) if self.processed else 0.0,
+            "queue": queue_counts,
+        }
+
+
+# ============================================================================
+# WORKER POOL
+# ============================================================================
+
+class AssessmentPipeline:
+    """Pool of worker threads draining a SessionQueue into a ResultSink."""
+
+    def __init__(
+        self,
+        queue: SessionQueue,
+        sink: ResultSink,
+        workers: int = 4,
+        max_attempts: int = 3,
+        base_backoff_s: float = 2.0,
+        processor: Callable[[Dict[str, Any]], Dict[str, Any]] = process_session,
+        poll_interval_s: float = 0.2
+    ):
+        self.queue = queue
+        self.sink = sink
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_backoff_s = base_backoff_s
+        self.processor = processor
+        self.poll_interval_s = poll_interval_s
+        self.metrics = PipelineMetrics()
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _handle(self, job: Dict[str, Any]) -> None:
+        lag = time.time() - job["enqueued_at"]
+        start = time.perf_counter()
+        try:
+            result = self.processor(job["payload"])
+            self.sink.write(job["id"], job["payload"], result)
+        except Exception as e:
+            if job["attempts"] >= self.max_attempts:
+                self.queue.fail(job["id"], repr(e), retry_in=None)
+                with self._lock:
+                    self.metrics.dead_lettered += 1
+            else:
+                backoff = self.base_backoff_s * (2 ** (job["attempts"] - 1))
+                self.queue.fail(job["id"], repr(e), retry_in=backoff)
+                with self._lock:
+                    self.metrics.retried += 1
+            return
+
+        self.queue.ack(job["id"])
+        with self._lock:
+            self.metrics.processed += 1
+            self.metrics.total_lag_s += lag
+            self.metrics.max_lag_s = max(self.metrics.max_lag_s, lag)
+            self.metrics.total_processing_s += time.perf_counter() - start
+
+    def _worker(self, drain: bool) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim()
+                if job is not None:
+                    self._handle(job)
+                    continue
+                counts = self.queue.counts()
+                if drain and counts[STATUS_QUEUED] == 0 and counts[STATUS_IN_FLIGHT] == 0:
+                    return
+            except Exception:
+                # Queue unavailable (locked / disk error): an in-flight job's
+                # lease expires and it is reclaimed, so just back off and retry
+                logger.exception("Assessment queue error in %s", threading.current_thread().name)
+                with self._lock:
+                    self.metrics.queue_errors += 1
+            self._stop.wait(self.poll_interval_s)
+
+    def start(self, drain: bool = False) -> None:
+        """Start workers; with drain=True they exit once the queue is empty."""
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._worker, args=(drain,), daemon=True, name=f"assessment-worker-{i}")
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Signal workers to stop after their current job and wait for them."""
+        self._stop.set()
+        self.join(timeout)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def run_until_empty(self) -> Dict[str, Any]:
+        """Process everything currently queued (including retries) and return metrics."""
+        self.start(drain=True)
+        self.join()
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return self.metrics.snapshot(self.queue.counts())
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    random.seed(4)
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = SessionQueue(os.path.join(tmp, "sessions.db"), max_pending=5000)
+        sink = MemorySink()
+
+        # After-school burst
+        for i in range(1000):
+            queue.enqueue({
+                "child_name": f"Bé {i}",
+                "game_data": {
+                    "pattern_accuracy": random.uniform(40, 95),
+                    "reaction_avg_time_ms": random.uniform(300, 800),
+                    "impulse_errors": random.randint(0, 8),
+                    "attention_consistency": random.uniform(30, 90),
+                    "visual_preference_score": random.uniform(20, 80),
+                    "auditory_preference_score": random.uniform(20, 80),
+                    "interaction_intensity": random.uniform(20, 80),
+                },
+                "advanced": {"nback": {"maxNLevel": random.randint(1, 3), "accuracyPercent": 80}},
+            })
+        queue.enqueue({"child_name": "broken", "game_data": None})  # Will dead-letter
+
+        pipeline = AssessmentPipeline(queue, sink, workers=4, base_backoff_s=0.05)
+        stats = pipeline.run_until_empty()
+
+        print("=" * 60)
+        print("📬 ASSESSMENT PIPELINE")
+        print("=" * 60)
+        for key, value in stats.items():
+            print(f"   - {key}: {value}")
+        print(f"\nDead letters: {[(d['id'], d['last_error']) for d in queue.dead_letters()]}")
+
+        # A failing claim() is logged and retried instead of killing the worker
+        class FlakyQueue(SessionQueue):
+            failures = 3
+
+            def claim(self):
+                if self.failures:
+                    self.failures -= 1
+                    raise sqlite3.OperationalError("database is locked")
+                return super().claim()
+
+        logging.basicConfig(level=logging.CRITICAL)
+        flaky = FlakyQueue(os.path.join(tmp, "flaky.db"))
+        for i in range(20):
+            flaky.enqueue({"child_name": f"Bé {i}", "game_data": {"pattern_accuracy": 70}})
+        flaky_stats = AssessmentPipeline(flaky, MemorySink(), workers=1, poll_interval_s=0.01).run_until_empty()
+        assert flaky_stats["processed"] == 20 and flaky_stats["queue_errors"] == 3, flaky_stats
+        print(f"Flaky queue: {flaky_stats['processed']} processed after {flaky_stats['queue_errors']} claim errors")
@@ -0,0 +1,390 @@
+"""
+📋 CASELOAD AGGREGATOR
+=======================
+Materialized per-therapist caseload snapshots for the clinician dashboard and
+caseload-management table, kept up to date incrementally.
+
+Per patient:
+- Latest CognitiveProfile (visual, auditory, movement, logic)
+- Trend arrows vs the previous assessment
+- Alerts (sharp drop, very low domain score)
+- Latest growth-plan strategy
+
+Per therapist:
+- Patient count, alert count, trend counts (improving / stable / declining)
+
+Modes:
+- Incremental: on_assessment() / on_growth_plan() / on_patient_assigned()
+  touch one patient and adjust the therapist totals in O(1) (O(caseload)
+  only when the therapist's most recent activity has to be recomputed)
+- Idempotent: replayed assessment events (same id) are ignored; rows
+  without session_completed_at (unfinished) are skipped, NULL domain
+  scores get no arrow or alert
+- Full rebuild: rebuild() recomputes everything from source rows
+- check_consistency(): rebuilds in a scratch aggregator and diffs snapshots
+
+Source tables: cognitive_assessments, growth_plans, profiles.therapist_id
+"""
+
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+from collections import Counter
+import bisect
+import json
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DOMAINS = ["visual", "auditory", "movement", "logic"]
+
+# Change (1-5 scale) needed for an up/down arrow
+TREND_THRESHOLD = 0.2
+
+# Drop since the previous assessment that raises an alert
+ALERT_DROP = 0.5
+
+# Any domain below this raises an alert
+ALERT_LOW_SCORE = 2.0
+
+UNASSIGNED = "__unassigned__"
+
+
+# ============================================================================
+# DATA MODELS
+# ============================================================================
+
+@dataclass
+class PatientSummary:
+    """Dashboard row for one patient."""
+    user_id: str
+    child_name: str = ""
+    therapist_id: str = UNASSIGNED
+    assessment_count: int = 0
+    assessment_ids: List[str] = field(default_factory=list)  # Sorted, for idempotent replays
+    latest_at: Optional[str] = None
+    latest_profile: Optional[Dict[str, Optional[float]]] = None
+    previous_at: Optional[str] = None
+    previous_profile: Optional[Dict[str, Optional[float]]] = None
+    trend_arrows: Dict[str, str] = field(default_factory=dict)
+    alerts: List[str] = field(default_factory=list)
+    plan_at: Optional[str] = None
+    plan_strategy: Optional[str] = None
+
+    @property
+    def overall_trend(self) -> str:
+        arrows = Counter(self.trend_arrows.values())
+        if not arrows:
+            return "stable"
+        if arrows["down"] > arrows["up"]:
+            return "declining"
+        if arrows["up"] > arrows["down"]:
+            return "improving"
+        return "stable"
+
+
+@dataclass
+class TherapistSnapshot:
+    """Materialized caseload aggregate for one therapist."""
+    therapist_id: str
+    patient_ids: List[str] = field(default_factory=list)
+    alert_count: int = 0
+    trend_counts: Dict[str, int] = field(default_factory=lambda: {"improving": 0, "stable": 0, "declining": 0})
+    last_activity_at: Optional[str] = None
+
+
+# ============================================================================
+# PURE HELPERS
+# ============================================================================
+
+def _profile_from_row(row: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Domain scores of an assessment row (profile_* columns are nullable)."""
+    profile = {}
+    for d in DOMAINS:
+        value = row.get(f"profile_{d}")
+        profile[d] = None if value is None else round(float(value), 2)
+    return profile
+
+
+def _activity(summary: PatientSummary) -> Optional[str]:
+    return max(filter(None, [summary.latest_at, summary.plan_at]), default=None)
+
+
+def _derive(summary: PatientSummary) -> None:
+    """Recompute arrows and alerts from the latest/previous profiles."""
+    summary.trend_arrows = {}
+    summary.alerts = []
+    if summary.latest_profile is None:
+        return
+
+    for domain in DOMAINS:
+        latest = summary.latest_profile[domain]
+        if latest is None:
+            continue
+        if latest < ALERT_LOW_SCORE:
+            summary.alerts.append(f"low_{domain}")
+        previous = summary.previous_profile[domain] if summary.previous_profile else None
+        if previous is None:
+            summary.trend_arrows[domain] = "flat"
+            continue
+        delta = latest - previous
+        summary.trend_arrows[domain] = "up" if delta >= TREND_THRESHOLD else "down" if delta <= -TREND_THRESHOLD else "flat"
+        if delta <= -ALERT_DROP:
+            summary.alerts.append(f"drop_{domain}")
+
+
+# ============================================================================
+# AGGREGATOR
+# ============================================================================
+
+class CaseloadAggregator:
+    """Keeps PatientSummary rows and TherapistSnapshot totals in sync."""
+
+    def __init__(self):
+        self.patients: Dict[str, PatientSummary] = {}
+        self.therapists: Dict[str, TherapistSnapshot] = {}
+
+    # ---- Therapist totals (add / remove one patient's contribution) ----
+
+    def _therapist(self, therapist_id: str) -> TherapistSnapshot:
+        if therapist_id not in self.therapists:
+            self.therapists[therapist_id] = TherapistSnapshot(therapist_id=therapist_id)
+        return self.therapists[therapist_id]
+
+    def _contribute(self, summary: PatientSummary, sign: int) -> None:
+        snapshot = self._therapist(summary.therapist_id)
+        snapshot.alert_count += sign * len(summary.alerts)
+        if summary.latest_profile is not None:
+            snapshot.trend_counts[summary.overall_trend] += sign
+        activity = _activity(summary)
+        if sign > 0:
+            if activity and (snapshot.last_activity_at is None or activity > snapshot.last_activity_at):
+                snapshot.last_activity_at = activity
+        elif activity is not None and activity == snapshot.last_activity_at:
+            # Withdrawing the most recent activity: fall back to the other patients
+            snapshot.last_activity_at = max(
+                filter(None, (_activity(self.patients[p]) for p in snapshot.patient_ids if p != summary.user_id)),
+                default=None
+            )
+
+    def _patient(self, user_id: str) -> PatientSummary:
+        if user_id not in self.patients:
+            summary = PatientSummary(user_id=user_id)
+            self.patients[user_id] = summary
+            self._therapist(UNASSIGNED).patient_ids.append(user_id)
+        return self.patients[user_id]
+
+    # ---- Incremental events ----
+
+    def on_patient_assigned(self, user_id: str, therapist_id: Optional[str]) -> None:
+        """profiles.therapist_id changed (connect, disconnect or transfer)."""
+        summary = self._patient(user_id)
+        new_id = therapist_id or UNASSIGNED
+        if summary.therapist_id == new_id:
+            return
+        self._contribute(summary, -1)
+        self._therapist(summary.therapist_id).patient_ids.remove(user_id)
+        summary.therapist_id = new_id
+        self._therapist(new_id).patient_ids.append(user_id)
+        self._contribute(summary, +1)
+
+    def on_assessment(self, row: Dict[str, Any]) -> None:
+        """A `cognitive_assessments` row was inserted (may arrive out of order or twice)."""
+        if row.get("session_completed_at") is None:
+            return  # Session not finished: nothing to show yet
+        summary = self._patient(str(row["user_id"]))
+        assessment_id = row.get("id")
+        if assessment_id is not None:
+            assessment_id = str(assessment_id)
+            position = bisect.bisect_left(summary.assessment_ids, assessment_id)
+            if position < len(summary.assessment_ids) and summary.assessment_ids[position] == assessment_id:
+                return  # Replayed event
+            summary.assessment_ids.insert(position, assessment_id)
+        self._contribute(summary, -1)
+
+        completed_at = str(row["session_completed_at"])
+        profile = _profile_from_row(row)
+        summary.assessment_count += 1
+
+        if summary.latest_at is None or completed_at >= summary.latest_at:
+            summary.child_name = row.get("child_name") or summary.child_name
+            summary.previous_at, summary.previous_profile = summary.latest_at, summary.latest_profile
+            summary.latest_at, summary.latest_profile = completed_at, profile
+        elif summary.previous_at is None or completed_at > summary.previous_at:
+            summary.previous_at, summary.previous_profile = completed_at, profile
+
+        _derive(summary)
+        self._contribute(summary, +1)
+
+    def on_growth_plan(self, row: Dict[str, Any]) -> None:
+        """A `growth_plans` row was produced."""
+        if row.get("created_at") is None:
+            return  # No timestamp to order it against other plans
+        summary = self._patient(str(row["user_id"]))
+        created_at = str(row["created_at"])
+        if summary.plan_at is not None and created_at < summary.plan_at:
+            return
+        self._contribute(summary, -1)
+        summary.plan_at = created_at
+        summary.plan_strategy = row.get("primary_strategy") or row.get("strategy_key")
+        self._contribute(summary, +1)
+
+    # ---- Full rebuild ----
+
+    def rebuild(
+        self,
+        assignments: Iterable[Tuple[str, Optional[str]]],
+        assessments: Iterable[Dict[str, Any]],
+        growth_plans: Iterable[Dict[str, Any]] = ()
+    ) -> None:
+        """Recompute every snapshot from source rows (e.g. nightly or after a bug fix)."""
+        self.patients = {}
+        self.therapists = {}
+        for user_id, therapist_id in assignments:
+            self.on_patient_assigned(str(user_id), therapist_id)
+        for row in sorted(assessments, key=lambda r: str(r.get("session_completed_at") or "")):
+            self.on_assessment(row)
+        for row in growth_plans:
+            self.on_growth_plan(row)
+
+    # ---- Reads ----
+
+    def snapshot(self, therapist_id: str) -> Dict[str, Any]:
+        """Dashboard payload for one therapist (cheap: no scans)."""
+        snapshot = self._therapist(therapist_id)
+        patients = sorted(
+            (self.patients[p] for p in snapshot.patient_ids),
+            key=lambda s: (-len(s.alerts), s.latest_at or "")
+        )
+        return {
+            "therapist_id": therapist_id,
+            "patient_count": len(snapshot.patient_ids),
+            "alert_count": snapshot.alert_count,
+            "trend_counts": dict(snapshot.trend_counts),
+            "last_activity_at": snapshot.last_activity_at,
+            "patients": [
+                {**asdict(s), "overall_trend": s.overall_trend}
+                for s in patients
+            ],
+        }
+
+    def check_consistency(
+        self,
+        assignments: Iterable[Tuple[str, Optional[str]]],
+        assessments: Iterable[Dict[str, Any]],
+        growth_plans: Iterable[Dict[str, Any]] = ()
+    ) -> List[str]:
+        """
+        Compare the incremental state against a fresh rebuild.
+
+        Returns:
+            Human-readable discrepancies (empty list when consistent)
+        """
+        reference = CaseloadAggregator()
+        reference.rebuild(assignments, assessments, growth_plans)
+        issues = []
+
+        for therapist_id in sorted(set(self.therapists) | set(reference.therapists)):
+            ours = self.snapshot(therapist_id)
+            theirs = reference.snapshot(therapist_id)
+            for key in ("patient_count", "alert_count", "trend_counts", "last_activity_at"):
+                if ours[key] != theirs[key]:
+                    issues.append(f"{therapist_id}.{key}: {ours[key]} != {theirs[key]}")
+
+        for user_id in sorted(set(self.patients) | set(reference.patients)):
+            ours = self.patients.get(user_id)
+            theirs = reference.patients.get(user_id)
+            if ours is None or theirs is None:
+                issues.append(f"patient {user_id} missing on one side")
+            elif asdict(ours) != asdict(theirs):
+                issues.append(f"patient {user_id} summary differs")
+        return issues
+
+    # ---- Persistence ----
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "patients": [asdict(p) for p in self.patients.values()],
+            "therapists": [asdict(t) for t in self.therapists.values()],
+        }, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> "CaseloadAggregator":
+        data = json.loads(text)
+        aggregator = cls()
+        aggregator.patients = {p["user_id"]: PatientSummary(**p) for p in data["patients"]}
+        aggregator.therapists = {t["therapist_id"]: TherapistSnapshot(**t) for t in data["therapists"]}
+        return aggregator
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+
+    random.seed(8)
+    therapists = [f"therapist-{i}" for i in range(20)]
+    assignments = [(f"child-{i}", random.choice(therapists)) for i in range(600)]
+    assessments = []
+    for i in range(600):
+        base = [random.uniform(1.8, 4.5) for _ in DOMAINS]
+        for month in range(1, 7):
+            base = [min(5, max(1, b + random.gauss(0.05, 0.3))) for b in base]
+            assessments.append({
+                "id": f"a-{i}-{month}", "user_id": f"child-{i}", "child_name": f"Bé {i}",
+                "session_completed_at": f"2026-0{month}-{random.randint(10, 28)}T09:00:00Z",
+                **{f"profile_{d}": b for d, b in zip(DOMAINS, base)},
+            })
+    plans = [{"user_id": f"child-{i}", "created_at": "2026-06-30T12:00:00Z", "primary_strategy": "high_visual"}
+             for i in range(0, 600, 3)]
+
+    # Incremental: events arrive shuffled
+    aggregator = CaseloadAggregator()
+    for user_id, therapist_id in assignments:
+        aggregator.on_patient_assigned(user_id, therapist_id)
+    events = [("a", row) for row in assessments] + [("p", row) for row in plans]
+    random.shuffle(events)
+    for kind, row in events:
+        (aggregator.on_assessment if kind == "a" else aggregator.on_growth_plan)(row)
+
+    # Replays, an unfinished session and a NULL domain score
+    for kind, row in events[:50]:
+        (aggregator.on_assessment if kind == "a" else aggregator.on_growth_plan)(row)
+    extra = [
+        {"id": "a-null-date", "user_id": "child-1", "session_completed_at": None,
+         **{f"profile_{d}": None for d in DOMAINS}},
+        {"id": "a-null-score", "user_id": "child-1", "session_completed_at": "2026-06-29T09:00:00Z",
+         **{f"profile_{d}": (None if d == "logic" else 3.0) for d in DOMAINS}},
+    ]
+    for row in extra:
+        aggregator.on_assessment(row)
+    assessments += extra
+    null_plan = {"user_id": "child-0", "created_at": None, "primary_strategy": "high_auditory"}
+    aggregator.on_growth_plan(null_plan)
+    plans.append(null_plan)
+    assert aggregator.patients["child-0"].plan_at == "2026-06-30T12:00:00Z"
+    child_1 = aggregator.patients["child-1"]
+    assert child_1.assessment_count == 7 and child_1.latest_at == "2026-06-29T09:00:00Z"
+    assert "logic" not in child_1.trend_arrows
+
+    # Transfers between therapists (the most recently active patient moves away)
+    latest_child = max(aggregator.patients.values(), key=lambda s: s.latest_at or "")
+    aggregator.on_patient_assigned(latest_child.user_id, "therapist-19")
+    assignments = [(u, "therapist-19" if u == latest_child.user_id else t) for u, t in assignments]
+    aggregator.on_patient_assigned("child-0", "therapist-19")
+    assignments[0] = ("child-0", "therapist-19")
+    assert not aggregator.check_consistency(assignments, assessments, plans)
+
+    snapshot = aggregator.snapshot("therapist-19")
+    print("=" * 60)
+    print("📋 CASELOAD SNAPSHOT: therapist-19")
+    print("=" * 60)
+    print(f"   Patients: {snapshot['patient_count']}  Alerts: {snapshot['alert_count']}  "
+          f"Trends: {snapshot['trend_counts']}")
+    for patient in snapshot["patients"][:3]:
+        print(f"   - {patient['child_name']}: {patient['trend_arrows']} {patient['alerts']}")
+
+    issues = aggregator.check_consistency(assignments, assessments, plans)
+    print(f"\nConsistency check: {'✅ OK' if not issues else issues[:5]}")
@@ -0,0 +1,347 @@
+"""
+🗺️ CRAWL FRONTIER
+=================
+Priority queue of pages to crawl with persistent URL dedup, so crawls can
+span many searches and result pages without fetching a job twice.
+
+Features:
+- URL normalization: lowercase host, no fragment, tracking parameters
+  (ta_source, u_sr_id, utm_*, ...) stripped, remaining query sorted
+- Priority queue (heapq): lower priority value is popped first, FIFO within
+  a priority
+- Persistent Bloom filter of fetched job URLs (false positives ≈ `error_rate`,
+  i.e. a tiny share of new postings may be skipped; never a duplicate fetch).
+  A URL is added only once its job succeeded; it grows by adding a layer of
+  twice the capacity once the current one is full, so the rate holds
+- Failed jobs are retried on later runs, up to MAX_JOB_ATTEMPTS runs
+- Search/result pages are deduplicated per run only, so every run revisits
+  the searches and discovers new postings
+- State (pending + in-flight items, failure counts, Bloom bits) saved
+  atomically to disk; items popped but not finished are re-queued after a crash
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import hashlib
+import heapq
+import json
+import math
+import os
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+TRACKING_PARAMS = {"ta_source", "u_sr_id", "fbclid", "gclid", "ref", "source"}
+TRACKING_PREFIXES = ("utm_",)
+
+STATE_FILE = "frontier.json"
+BLOOM_FILE = "seen.bloom"
+
+DEFAULT_CAPACITY = 200_000
+DEFAULT_ERROR_RATE = 1e-4
+
+# Each added Bloom layer: GROWTH_FACTOR × the capacity, ERROR_TIGHTENING × the
+# error rate, so the combined false-positive rate stays below 2 × error_rate
+GROWTH_FACTOR = 2
+ERROR_TIGHTENING = 0.5
+
+MAX_JOB_ATTEMPTS = 3  # Runs in which a job may fail before it is given up
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used for dedup (and as the cache / output key)."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+# ============================================================================
+# BLOOM FILTER
+# ============================================================================
+
+class BloomFilter:
+    """Fixed-size Bloom filter (double hashing over one BLAKE2b digest)."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """Insert; returns False if the item was (probably) present already."""
+        added = False
+        for p in self._positions(item):
+            if not self.bits[p >> 3] & (1 << (p & 7)):
+                self.bits[p >> 3] |= 1 << (p & 7)
+                added = True
+        self.count += added
+        return added
+
+
+class ScalableBloomFilter:
+    """Bloom filter that adds a larger, stricter layer whenever the last one is full."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE):
+        self.layers = [BloomFilter(capacity, error_rate * (1 - ERROR_TIGHTENING))]
+
+    @property
+    def count(self) -> int:
+        return sum(layer.count for layer in self.layers)
+
+    def __contains__(self, item: str) -> bool:
+        return any(item in layer for layer in self.layers)
+
+    def add(self, item: str) -> bool:
+        """Insert; returns False if the item was (probably) present already."""
+        if item in self:
+            return False
+        last = self.layers[-1]
+        if last.count >= last.capacity:
+            last = BloomFilter(last.capacity * GROWTH_FACTOR, last.error_rate * ERROR_TIGHTENING)
+            self.layers.append(last)
+        return last.add(item)
+
+    def save(self, path: str) -> None:
+        header = json.dumps({"layers": [
+            {"capacity": layer.capacity, "error_rate": layer.error_rate, "count": layer.count}
+            for layer in self.layers
+        ]})
+        _atomic_write(path, header.encode("utf-8") + b"\n" + b"".join(bytes(layer.bits) for layer in self.layers))
+
+    @classmethod
+    def load(cls, path: str) -> "ScalableBloomFilter":
+        with open(path, "rb") as f:
+            header, bits = f.read().split(b"\n", 1)
+        meta = json.loads(header)
+        bloom = cls()
+        bloom.layers = []
+        offset = 0
+        for layer_meta in meta.get("layers", [meta]):  # Single-layer files from older runs
+            layer = BloomFilter(layer_meta["capacity"], layer_meta["error_rate"])
+            layer.bits = bytearray(bits[offset:offset + len(layer.bits)])
+            layer.count = layer_meta["count"]
+            offset += len(layer.bits)
+            bloom.layers.append(layer)
+        return bloom
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# ============================================================================
+# FRONTIER
+# ============================================================================
+
+@dataclass
+class FrontierItem:
+    url: str
+    kind: str               # "search" (results page) or "job" (detail page)
+    priority: float = 0.0
+    page: int = 1           # Result page number for "search" items
+    seed: str = ""          # Search the item was discovered from
+
+
+class CrawlFrontier:
+    """Priority queue + seen-set, persisted under `state_dir`."""
+
+    def __init__(self, state_dir: Optional[str] = None, capacity: int = DEFAULT_CAPACITY):
+        self.state_dir = state_dir
+        self.seen_jobs = ScalableBloomFilter(capacity)
+        self.failures: Dict[str, int] = {}   # Job URL → runs it failed in
+        self._seen_search: Set[str] = set()
+        self._failed_this_run: Set[str] = set()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._items: Dict[str, FrontierItem] = {}
+        self._in_flight: Dict[str, FrontierItem] = {}
+        self._seq = 0
+        self.stats = {"pushed": 0, "duplicates": 0, "popped": 0, "done": 0, "failed": 0}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    # ---- Queue ----
+
+    def push(self, url: str, kind: str = "job", priority: float = 0.0, page: int = 1, seed: str = "") -> bool:
+        """Queue a URL unless it was seen before. Returns True if queued."""
+        url = normalize_url(url)
+        if kind == "job":
+            fresh = url not in self.seen_jobs and url not in self._failed_this_run
+        else:
+            fresh = url not in self._seen_search
+            self._seen_search.add(url)
+        if not fresh or url in self._items or url in self._in_flight:
+            self.stats["duplicates"] += 1
+            return False
+
+        self._items[url] = FrontierItem(url, kind, priority, page, seed)
+        heapq.heappush(self._heap, (priority, self._seq, url))
+        self._seq += 1
+        self.stats["pushed"] += 1
+        return True
+
+    def pop(self) -> Optional[FrontierItem]:
+        """Highest-priority item, or None when the queue is empty."""
+        while self._heap:
+            _, _, url = heapq.heappop(self._heap)
+            item = self._items.pop(url, None)
+            if item is not None:
+                self._in_flight[url] = item
+                self.stats["popped"] += 1
+                return item
+        return None
+
+    def done(self, item: FrontierItem, ok: bool = True) -> None:
+        """
+        Mark an item finished.
+
+        Successful jobs enter the seen-set and are never fetched again. A
+        failed job is not retried in this run, but is on later runs until it
+        has failed in MAX_JOB_ATTEMPTS of them.
+        """
+        if self._in_flight.pop(item.url, None) is None:
+            return
+        self.stats["done"] += 1
+        if item.kind != "job":
+            return
+        if ok:
+            self.seen_jobs.add(item.url)
+            self.failures.pop(item.url, None)
+            return
+        self.stats["failed"] += 1
+        self._failed_this_run.add(item.url)
+        self.failures[item.url] = self.failures.get(item.url, 0) + 1
+        if self.failures[item.url] >= MAX_JOB_ATTEMPTS:
+            self.seen_jobs.add(item.url)  # Give up on it
+            del self.failures[item.url]
+
+    # ---- Persistence ----
+
+    def save(self) -> None:
+        if not self.state_dir:
+            return
+        os.makedirs(self.state_dir, exist_ok=True)
+        pending = list(self._in_flight.values()) + [self._items[url] for _, _, url in sorted(self._heap)
+                                                    if url in self._items]
+        state = {"pending": [asdict(item) for item in pending], "failures": self.failures, "stats": self.stats}
+        _atomic_write(os.path.join(self.state_dir, STATE_FILE),
+                      json.dumps(state, ensure_ascii=False, indent=1).encode("utf-8"))
+        self.seen_jobs.save(os.path.join(self.state_dir, BLOOM_FILE))
+
+    @classmethod
+    def load(cls, state_dir: str, capacity: int = DEFAULT_CAPACITY) -> "CrawlFrontier":
+        """Restore a frontier (empty if `state_dir` has no saved state)."""
+        frontier = cls(state_dir, capacity)
+        bloom_path = os.path.join(state_dir, BLOOM_FILE)
+        state_path = os.path.join(state_dir, STATE_FILE)
+        if os.path.exists(bloom_path):
+            frontier.seen_jobs = ScalableBloomFilter.load(bloom_path)
+        if os.path.exists(state_path):
+            with open(state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            frontier.failures = state.get("failures", {})
+            for raw in state["pending"]:
+                item = FrontierItem(**raw)
+                if item.kind == "search":
+                    frontier._seen_search.add(item.url)
+                frontier._items[item.url] = item
+                heapq.heappush(frontier._heap, (item.priority, frontier._seq, item.url))
+                frontier._seq += 1
+        return frontier
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    url = ("https://www.topcv.vn/viec-lam/nv-kiem-thu/1563425.html"
+           "?ta_source=JobSearchList_LinkDetail&u_sr_id=9XXS3cANSPX")
+    assert normalize_url(url) == "https://www.topcv.vn/viec-lam/nv-kiem-thu/1563425.html"
+    assert normalize_url("https://www.topcv.vn/tim-viec-lam-tester?page=2&utm_source=x") == \
+        "https://www.topcv.vn/tim-viec-lam-tester?page=2"
+
+    print("=" * 60)
+    print("🗺️ CRAWL FRONTIER")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        frontier = CrawlFrontier(state_dir)
+        frontier.push("https://www.topcv.vn/tim-viec-lam-tester", kind="search", priority=10)
+        for i in range(5_000):
+            frontier.push(f"https://www.topcv.vn/viec-lam/job/{i}.html?u_sr_id={i % 7}", kind="job")
+        frontier.push(url, kind="job")
+        frontier.push(url.replace("9XXS3cANSPX", "other"), kind="job")  # duplicate after normalization
+
+        first = frontier.pop()
+        assert first.kind == "job"
+        failed = frontier.pop()
+        frontier.done(failed, ok=False)  # e.g. a timeout
+        assert not frontier.push(failed.url)  # Not retried in the same run
+        for _ in range(1_000):
+            frontier.done(frontier.pop())
+        frontier.pop()  # "crash" before done()
+        frontier.save()
+
+        restored = CrawlFrontier.load(state_dir)
+        assert len(restored) == len(frontier) + 2  # pending + both in-flight items re-queued
+        print(f"\nQueued {frontier.stats['pushed']:,}, skipped {frontier.stats['duplicates']} duplicate(s)")
+        print(f"Restored {len(restored):,} pending items after a simulated crash")
+        assert not restored.push("https://www.topcv.vn/viec-lam/job/3.html")
+
+        # The failed job is retried on later runs, then given up after MAX_JOB_ATTEMPTS
+        for attempt in range(2, MAX_JOB_ATTEMPTS + 1):
+            assert restored.push(failed.url, priority=-1)
+            item = restored.pop()
+            assert item.url == failed.url
+            restored.done(item, ok=False)
+            restored.save()
+            restored = CrawlFrontier.load(state_dir)
+        assert not restored.push(failed.url) and failed.url not in restored.failures
+
+        started = time.perf_counter()
+        fresh = sum(restored.push(f"https://www.topcv.vn/viec-lam/job/{i}.html") for i in range(100_000))
+        elapsed = time.perf_counter() - started
+        print(f"Dedup check: {100_000 / elapsed:,.0f} URLs/s; {fresh:,} of 100,000 new "
+              f"(expected 95,000 minus rare Bloom false positives)")
+        layer = restored.seen_jobs.layers[0]
+        print(f"Bloom filter: {len(layer.bits) / 1024:.0f} KiB, {layer.hashes} hashes")
+
+    # Past capacity the filter adds a layer instead of letting false positives climb
+    small = ScalableBloomFilter(capacity=1_000, error_rate=1e-3)
+    for i in range(10_000):
+        small.add(f"seen-{i}")
+    false_positives = sum(f"new-{i}" in small for i in range(100_000))
+    print(f"Scalable filter: 10x capacity in {len(small.layers)} layers, "
+          f"false-positive rate {false_positives / 100_000:.2e} (target < {2 * 1e-3:.0e})")
+    assert all(f"seen-{i}" in small for i in range(10_000)) and false_positives / 100_000 < 2e-3
@@ -0,0 +1,249 @@
+"""
+📊 CRAWL METRICS
+================
+Per-stage timings and outcome counters for job_crawler, so a slow crawl can
+be attributed to navigation, load waits, page.content(), parsing or the
+keyword analyzer instead of guessed from print statements.
+
+Collected:
+- Stage timers → histograms (count, sum, min, max, fixed buckets; p50/p95
+  estimated from the buckets)
+- Event counters: success, timeout, extraction_failed, fallback, ...
+- Bytes downloaded (decoded HTML bytes, HTTP and browser)
+
+Export at the end of a run:
+- summary() → JSON-ready dict (write_json)
+- to_prometheus() → Prometheus text exposition format (write_prometheus),
+  e.g. for node_exporter's textfile collector
+
+Disabled instances (NULL_METRICS) return a shared no-op timer and skip all
+bookkeeping, so instrumented code pays one attribute check per call.
+"""
+
+from typing import Dict, List, Any
+import bisect
+import json
+import math
+import os
+import time
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+# Upper bounds in seconds (Prometheus-style cumulative buckets + inf)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = "crawler"
+
+
+# ============================================================================
+# HISTOGRAM
+# ============================================================================
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = list(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # Last slot: > largest bound
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding rank q."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 6),
+            "mean_s": round(self.total / self.count, 6) if self.count else 0.0,
+            "min_s": round(self.min, 6) if self.count else 0.0,
+            "p50_s": round(self.quantile(0.5), 6),
+            "p95_s": round(self.quantile(0.95), 6),
+            "max_s": round(self.max, 6),
+        }
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "stage", "started")
+
+    def __init__(self, metrics: "CrawlMetrics", stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        # Failed stages are timed too: a slow timeout is exactly what we look for
+        self.metrics.observe(self.stage, time.perf_counter() - self.started)
+
+
+class CrawlMetrics:
+    """Stage histograms + event counters for one crawl run."""
+
+    def __init__(self, enabled: bool = True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self.stages: Dict[str, Histogram] = {}
+        self.events: Dict[str, int] = {}
+        self.bytes_downloaded = 0
+        self.started = time.time()
+
+    def time(self, stage: str):
+        """Context manager timing one stage (works around awaits too)."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, stage)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        if stage not in self.stages:
+            self.stages[stage] = Histogram(self.buckets)
+        self.stages[stage].observe(seconds)
+
+    def inc(self, event: str, n: int = 1) -> None:
+        if self.enabled:
+            self.events[event] = self.events.get(event, 0) + n
+
+    def add_bytes(self, n: int) -> None:
+        if self.enabled:
+            self.bytes_downloaded += n
+
+    # ---- Export ----
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started,
+            "duration_s": round(time.time() - self.started, 3),
+            "bytes_downloaded": self.bytes_downloaded,
+            "events": dict(sorted(self.events.items())),
+            "stages": {stage: hist.summary() for stage, hist in self.stages.items()},
+        }
+
+    def to_prometheus(self, prefix: str = METRIC_PREFIX) -> str:
+        lines: List[str] = [
+            f"# HELP {prefix}_stage_seconds Time spent per crawl stage.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        for stage, hist in self.stages.items():
+            cumulative = 0
+            for bound, bucket_count in zip(hist.bounds + ["+Inf"], hist.counts):
+                cumulative += bucket_count
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {hist.total:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {hist.count}')
+
+        lines += [f"# HELP {prefix}_events_total Crawl outcomes by type.",
+                  f"# TYPE {prefix}_events_total counter"]
+        lines += [f'{prefix}_events_total{{event="{event}"}} {n}' for event, n in sorted(self.events.items())]
+        lines += [f"# HELP {prefix}_bytes_downloaded_total Decoded HTML bytes downloaded.",
+                  f"# TYPE {prefix}_bytes_downloaded_total counter",
+                  f"{prefix}_bytes_downloaded_total {self.bytes_downloaded}"]
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str) -> None:
+        _write_text(path, json.dumps(self.summary(), indent=2, ensure_ascii=False))
+
+    def write_prometheus(self, path: str) -> None:
+        _write_text(path, self.to_prometheus())
+
+    def report(self) -> str:
+        """Short human-readable stage table for the end-of-run printout."""
+        rows = [f"   {'stage':<22}{'count':>7}{'total s':>10}{'p50 ms':>9}{'p95 ms':>9}"]
+        for stage, hist in sorted(self.stages.items(), key=lambda item: -item[1].total):
+            rows.append(f"   {stage:<22}{hist.count:>7}{hist.total:>10.2f}"
+                        f"{hist.quantile(0.5) * 1e3:>9.1f}{hist.quantile(0.95) * 1e3:>9.1f}")
+        events = ", ".join(f"{event}={n}" for event, n in sorted(self.events.items()))
+        rows.append(f"   events: {events or '-'} | {self.bytes_downloaded / 1e6:.1f} MB downloaded")
+        return "\n".join(rows)
+
+
+def _write_text(path: str, text: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+NULL_METRICS = CrawlMetrics(enabled=False)
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+
+    rng = random.Random(5)
+    metrics = CrawlMetrics()
+    for _ in range(500):
+        metrics.observe("navigation", rng.lognormvariate(-0.5, 0.6))
+        metrics.observe("page_content", rng.lognormvariate(-4, 0.4))
+        with metrics.time("parse"):
+            sum(range(2_000))
+        metrics.inc("success")
+        metrics.add_bytes(rng.randint(80_000, 200_000))
+    metrics.inc("timeout", 7)
+    metrics.inc("fallback", 31)
+
+    print("=" * 60)
+    print("📊 CRAWL METRICS")
+    print("=" * 60)
+    print(f"\n{metrics.report()}")
+    print("\nPrometheus (excerpt):")
+    print("\n".join(metrics.to_prometheus().splitlines()[:4]) + "\n   ...")
+
+    # Overhead per instrumented call
+    n = 200_000
+    for label, instance in (("enabled", CrawlMetrics()), ("disabled", NULL_METRICS)):
+        started = time.perf_counter()
+        for _ in range(n):
+            with instance.time("stage"):
+                pass
+            instance.inc("event")
+        print(f"Overhead ({label:8}): {(time.perf_counter() - started) / n * 1e6:.2f} µs per timed stage + counter")
+    assert not NULL_METRICS.stages and not NULL_METRICS.events
@@ -593,6 +593,33 @@ def _translate_domain(domain: str) -> str:
 # PARTNER MATCHING (For DB Integration)
 # ============================================================================
 
+DIRECTION_FOCUS_MAP = {
+    "technical_system": ["STEM"],
+    "visual_creative": ["Art"],
+    "research_analysis": ["STEM"],
+    "craft_hands_on": ["Craft", "Art"],
+    "nature_environment": ["Nature"],
+    "social_support": ["Social"]
+}
+
+
+def preferred_focus_areas(profile: CognitiveProfile) -> set:
+    """Partner focus areas suggested by the profile's top 2 directions"""
+    preferred_focuses = set()
+    for direction in suggest_broad_direction(profile)[:2]:
+        preferred_focuses.update(DIRECTION_FOCUS_MAP.get(direction.cluster_id, []))
+    return preferred_focuses
+
+
+def focus_match_score(partner_focus: str, preferred_focuses: set) -> int:
+    """Base match score of one partner focus area (90 / 60 / 50)"""
+    if partner_focus in preferred_focuses:
+        return 90
+    if partner_focus in FOCUS_AREAS:
+        return 60
+    return 50
+
+
 def match_partners(
     profile: CognitiveProfile,
     partners: List[Dict[str, Any]]
@@ -600,6 +627,9 @@ def match_partners(
     """
     Match cognitive profile to suitable partners from database.
     
+    Location is not considered here; see proximity_index.rank_nearby_partners
+    for distance-aware ranking.
+    
     Args:
         profile: Cognitive profile
         partners: List of partner records from DB
@@ -607,36 +637,14 @@ def match_partners(
     Returns:
         Sorted list of partners with match scores
     """
-    directions = suggest_broad_direction(profile)
-    direction_focus_map = {
-        "technical_system": ["STEM"],
-        "visual_creative": ["Art"],
-        "research_analysis": ["STEM"],
-        "craft_hands_on": ["Craft", "Art"],
-        "nature_environment": ["Nature"],
-        "social_support": ["Social"]
-    }
-    
-    # Get focus areas from top directions
-    preferred_focuses = set()
-    for direction in directions[:2]:
-        focuses = direction_focus_map.get(direction.cluster_id, [])
-        preferred_focuses.update(focuses)
+    preferred_focuses = preferred_focus_areas(profile)
     
     # Score partners
     scored_partners = []
     for partner in partners:
-        partner_focus = partner.get("focus_area", "")
-        base_score = 50
-        
-        if partner_focus in preferred_focuses:
-            base_score = 90
-        elif partner_focus in FOCUS_AREAS:
-            base_score = 60
-            
         scored_partners.append({
             **partner,
-            "match_score": base_score
+            "match_score": focus_match_score(partner.get("focus_area", ""), preferred_focuses)
         })
     
     # Sort by match score
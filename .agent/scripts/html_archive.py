@@ -0,0 +1,413 @@
+"""
+🗄️ RAW HTML ARCHIVE (WARC-LIKE)
+===============================
+Keeps every fetched job page so extraction can be improved and re-run
+offline instead of re-crawling TopCV.
+
+Storage:
+- Append-only segment files (segment-00000.warc.gz / .warc.zst), rolled
+  over at SEGMENT_MAX_BYTES
+- One independently compressed member per page (gzip, or zstd when the
+  `zstandard` package is installed), so a segment is a valid multi-member
+  .gz / .zst stream and any record can be decoded on its own
+- Each record is a WARC/1.1 "resource" record (header block + HTML)
+- Offset index in SQLite: url → (segment, offset, length, fetched_at),
+  one row per snapshot; pages identical to the last snapshot (same content
+  fingerprint as the page cache) are not stored again
+
+Reading:
+- get(url) / read(entry): random access through a read-only mmap per segment
+- iter_pages(): bulk iterator in segment/offset order (sequential disk
+  reads), optionally latest snapshot per URL only
+- rebuild_index(): re-scan the segments if the index is lost
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+import datetime
+import gzip
+import mmap
+import os
+import sqlite3
+import time
+import uuid
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+from http_cache import content_fingerprint
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DEFAULT_ARCHIVE_DIR = "html_archive"
+SEGMENT_MAX_BYTES = 256 * 1024 * 1024
+INDEX_FILE = "index.sqlite"
+SCAN_CHUNK_SIZE = 64 * 1024  # Bytes fed per step when re-scanning a segment
+
+CODEC_EXTENSIONS = {"gzip": ".warc.gz", "zstd": ".warc.zst"}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    source TEXT,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_url ON records (url, fetched_at);
+"""
+
+
+class ArchiveError(ValueError):
+    """Raised when a segment record is malformed or uses an unknown codec."""
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+# ============================================================================
+# RECORD FORMAT
+# ============================================================================
+
+@dataclass
+class ArchivedPage:
+    url: str
+    html: str
+    fetched_at: float
+    source: str = ""        # "http" or "browser"
+
+
+@dataclass
+class IndexEntry:
+    url: str
+    segment: str
+    offset: int
+    length: int
+    fetched_at: float
+    source: str
+
+
+def encode_record(url: str, html: str, fetched_at: float, source: str = "") -> bytes:
+    """Uncompressed WARC/1.1 resource record."""
+    body = html.encode("utf-8")
+    date = datetime.datetime.fromtimestamp(fetched_at, datetime.timezone.utc)
+    headers = [
+        "WARC/1.1",
+        "WARC-Type: resource",
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+        f"WARC-Target-URI: {url}",
+        f"WARC-Date: {date.strftime('%Y-%m-%dT%H:%M:%S.%fZ')}",
+        f"X-Fetched-At: {fetched_at!r}",
+        f"X-Fetch-Source: {source}",
+        "Content-Type: text/html; charset=utf-8",
+        f"Content-Length: {len(body)}",
+    ]
+    return ("\r\n".join(headers) + "\r\n\r\n").encode("utf-8") + body + b"\r\n\r\n"
+
+
+def decode_record(raw: bytes) -> ArchivedPage:
+    header, sep, rest = raw.partition(b"\r\n\r\n")
+    lines = header.decode("utf-8").split("\r\n")
+    if not sep or not lines or not lines[0].startswith("WARC/"):
+        raise ArchiveError("Not a WARC record")
+    fields = dict(line.split(": ", 1) for line in lines[1:] if ": " in line)
+    length = int(fields["Content-Length"])
+    return ArchivedPage(
+        url=fields["WARC-Target-URI"],
+        html=rest[:length].decode("utf-8", errors="replace"),
+        fetched_at=float(fields.get("X-Fetched-At", 0)),
+        source=fields.get("X-Fetch-Source", ""),
+    )
+
+
+def _codec_of(segment: str) -> str:
+    for codec, extension in CODEC_EXTENSIONS.items():
+        if segment.endswith(extension):
+            return codec
+    raise ArchiveError(f"Unknown segment type: {segment}")
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _decompressor(codec: str):
+    if codec == "zstd":
+        if zstandard is None:
+            raise ArchiveError("zstd segment but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompressobj()
+    return zlib.decompressobj(zlib.MAX_WBITS | 16)  # One gzip member
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ArchiveError("zstd segment but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data, zlib.MAX_WBITS | 16)
+
+
+def scan_segment(path: str) -> Iterator[Tuple[int, int, ArchivedPage]]:
+    """Yield (offset, length, page) for every complete member of a segment."""
+    codec = _codec_of(path)
+    errors = (zlib.error, zstandard.ZstdError) if zstandard is not None else (zlib.error,)
+    size = os.path.getsize(path)
+    if not size:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset = 0
+        while offset < size:
+            decompressor = _decompressor(codec)
+            parts, position = [], offset
+            try:
+                while not decompressor.eof and position < size:
+                    chunk = data[position:position + SCAN_CHUNK_SIZE]
+                    position += len(chunk)
+                    parts.append(decompressor.decompress(chunk))
+            except errors:
+                return  # Corrupt / torn tail from a crash mid-write
+            if not decompressor.eof:
+                return
+            length = position - offset - len(decompressor.unused_data)
+            yield offset, length, decode_record(b"".join(parts))
+            offset += length
+
+
+# ============================================================================
+# ARCHIVE
+# ============================================================================
+
+class HtmlArchive:
+    """Append-only compressed HTML store with an SQLite offset index."""
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_ARCHIVE_DIR,
+        codec: Optional[str] = None,
+        segment_max_bytes: int = SEGMENT_MAX_BYTES
+    ):
+        self.codec = codec or default_codec()
+        if self.codec not in CODEC_EXTENSIONS:
+            raise ArchiveError(f"Unknown codec: {self.codec}")
+        if self.codec == "zstd" and zstandard is None:
+            raise ArchiveError("zstd requested but the zstandard package is not installed")
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(os.path.join(directory, INDEX_FILE))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._files: Dict[str, Any] = {}
+        self._segment, self._writer = self._open_segment()
+        self.stats = {"stored": 0, "unchanged": 0, "bytes_in": 0, "bytes_out": 0}
+
+    # ---- Segments ----
+
+    def _segments(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.directory) if name.startswith("segment-"))
+
+    def _open_segment(self, force_new: bool = False):
+        extension = CODEC_EXTENSIONS[self.codec]
+        segments = [name for name in self._segments() if name.endswith(extension)]
+        if segments and not force_new:
+            name = segments[-1]
+            path = os.path.join(self.directory, name)
+            indexed_end = self._conn.execute(
+                "SELECT MAX(offset + length) FROM records WHERE segment = ?", (name,)
+            ).fetchone()[0]
+            if indexed_end is not None and os.path.getsize(path) > indexed_end:
+                # Crash between writing a member and indexing it: drop the orphan bytes
+                with open(path, "r+b") as f:
+                    f.truncate(indexed_end)
+            if os.path.getsize(path) < self.segment_max_bytes:
+                return name, open(path, "ab")
+        number = len(self._segments())
+        name = f"segment-{number:05d}{extension}"
+        return name, open(os.path.join(self.directory, name), "ab")
+
+    # ---- Writing ----
+
+    def put(self, url: str, html: str, source: str = "", fetched_at: Optional[float] = None) -> bool:
+        """
+        Append a snapshot of `url`.
+
+        Returns:
+            False if the content matches the latest stored snapshot (not stored)
+        """
+        content_hash = content_fingerprint(html)
+        row = self._conn.execute(
+            "SELECT content_hash FROM records WHERE url = ? ORDER BY fetched_at DESC, id DESC LIMIT 1", (url,)
+        ).fetchone()
+        if row is not None and row[0] == content_hash:
+            self.stats["unchanged"] += 1
+            return False
+
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        raw = encode_record(url, html, fetched_at, source)
+        member = _compress(raw, self.codec)
+        if self._writer.tell() and self._writer.tell() + len(member) > self.segment_max_bytes:
+            self._writer.close()
+            self._segment, self._writer = self._open_segment(force_new=True)
+
+        offset = self._writer.tell()
+        self._writer.write(member)
+        self._writer.flush()  # Bytes first, then the index row that points at them
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO records (url, segment, offset, length, fetched_at, source, content_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, self._segment, offset, len(member), fetched_at, source, content_hash)
+            )
+        self.stats["stored"] += 1
+        self.stats["bytes_in"] += len(raw)
+        self.stats["bytes_out"] += len(member)
+        return True
+
+    def close(self) -> None:
+        self._writer.close()
+        for segment_map in self._maps.values():
+            segment_map.close()
+        for f in self._files.values():
+            f.close()
+        self._maps.clear()
+        self._files.clear()
+        self._conn.close()
+
+    def __enter__(self) -> "HtmlArchive":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ---- Reading ----
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def entries(self, url: Optional[str] = None, latest_only: bool = False) -> List[IndexEntry]:
+        """Index rows in segment/offset order (all snapshots, or the latest per URL)."""
+        query = "SELECT url, segment, offset, length, fetched_at, source FROM records"
+        params: Tuple = ()
+        if latest_only:
+            query += " WHERE id IN (SELECT MAX(id) FROM records GROUP BY url)"
+        if url is not None:
+            query += (" AND" if latest_only else " WHERE") + " url = ?"
+            params = (url,)
+        query += " ORDER BY segment, offset"
+        return [IndexEntry(*row) for row in self._conn.execute(query, params)]
+
+    def _segment_map(self, segment: str, needed: int) -> mmap.mmap:
+        segment_map = self._maps.get(segment)
+        if segment_map is None or len(segment_map) < needed:
+            if segment == self._segment:
+                self._writer.flush()
+            if segment_map is not None:
+                segment_map.close()
+            if segment not in self._files:
+                self._files[segment] = open(os.path.join(self.directory, segment), "rb")
+            segment_map = mmap.mmap(self._files[segment].fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = segment_map
+        return segment_map
+
+    def read(self, entry: IndexEntry) -> ArchivedPage:
+        segment_map = self._segment_map(entry.segment, entry.offset + entry.length)
+        member = segment_map[entry.offset:entry.offset + entry.length]
+        return decode_record(_decompress(member, _codec_of(entry.segment)))
+
+    def get(self, url: str) -> Optional[ArchivedPage]:
+        """Latest snapshot of `url`, or None."""
+        row = self._conn.execute(
+            "SELECT url, segment, offset, length, fetched_at, source FROM records "
+            "WHERE url = ? ORDER BY fetched_at DESC, id DESC LIMIT 1", (url,)
+        ).fetchone()
+        return self.read(IndexEntry(*row)) if row else None
+
+    def iter_pages(self, latest_only: bool = True) -> Iterator[ArchivedPage]:
+        """All archived pages, read sequentially segment by segment."""
+        for entry in self.entries(latest_only=latest_only):
+            yield self.read(entry)
+
+    # ---- Recovery ----
+
+    def rebuild_index(self) -> int:
+        """Recreate the index from the segment files. Returns records indexed."""
+        self._writer.flush()
+        rows = []
+        for segment in self._segments():
+            for offset, length, page in scan_segment(os.path.join(self.directory, segment)):
+                rows.append((page.url, segment, offset, length, page.fetched_at, page.source,
+                             content_fingerprint(page.html)))
+        with self._conn:
+            self._conn.execute("DELETE FROM records")
+            self._conn.executemany(
+                "INSERT INTO records (url, segment, offset, length, fetched_at, source, content_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def summary(self) -> str:
+        ratio = self.stats["bytes_in"] / self.stats["bytes_out"] if self.stats["bytes_out"] else 0.0
+        return (f"🗄️ Archive: {self.stats['stored']} pages stored ({ratio:.1f}x {self.codec}), "
+                f"{self.stats['unchanged']} unchanged, {len(self)} snapshots in {self.directory}")
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    from fast_extractor import _synthetic_page, extract_page
+
+    rng = random.Random(8)
+    pages = [(f"https://www.topcv.vn/viec-lam/job/{i}.html", _synthetic_page(rng, i)) for i in range(3_000)]
+    raw_bytes = sum(len(html.encode("utf-8")) for _, html in pages)
+
+    print("=" * 60)
+    print("🗄️ RAW HTML ARCHIVE")
+    print("=" * 60)
+    print(f"\nCorpus: {len(pages):,} pages, {raw_bytes / 1e6:.1f} MB of HTML")
+
+    codecs = ["gzip"] + (["zstd"] if zstandard is not None else [])
+    for codec in codecs:
+        with tempfile.TemporaryDirectory() as tmp:
+            with HtmlArchive(tmp, codec=codec, segment_max_bytes=4 * 1024 * 1024) as archive:
+                started = time.perf_counter()
+                for url, html in pages:
+                    archive.put(url, html, source="http")
+                write_s = time.perf_counter() - started
+                assert not archive.put(*pages[0], source="http")  # Unchanged snapshot skipped
+
+                on_disk = sum(os.path.getsize(os.path.join(tmp, name)) for name in archive._segments())
+                print(f"\n[{codec}] {len(archive._segments())} segments, {on_disk / 1e6:.1f} MB "
+                      f"({raw_bytes / on_disk:.1f}x), write {len(pages) / write_s:,.0f} pages/s")
+
+                sample = rng.sample(pages, 500)
+                started = time.perf_counter()
+                for url, html in sample:
+                    assert archive.get(url).html == html
+                print(f"   Random access (mmap): {len(sample) / (time.perf_counter() - started):,.0f} pages/s")
+
+                started = time.perf_counter()
+                records = [extract_page(page.html) for page in archive.iter_pages()]
+                elapsed = time.perf_counter() - started
+                print(f"   Offline re-extraction: {len(records):,} pages at {len(records) / elapsed:,.0f} pages/s")
+
+                assert archive.rebuild_index() == len(pages)
+                print(f"   Index rebuilt from segments: {len(archive):,} records")
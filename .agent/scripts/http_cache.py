@@ -0,0 +1,207 @@
+"""
+💾 CRAWLER PAGE CACHE
+=====================
+Persistent per-URL cache so repeat crawls mostly cost a 304.
+
+Stored per URL (SQLite, one row):
+- ETag / Last-Modified validators from the last 200 response
+- Content fingerprint: SHA-256 of the HTML with scripts, styles and
+  whitespace removed (CSRF tokens and tracking snippets change every load)
+- The job record extracted from that content
+
+Per fetch:
+- conditional_headers() → If-None-Match / If-Modified-Since
+- 304 → reuse the cached record ("revalidated")
+- 200 with the same fingerprint → reuse the cached record ("unchanged")
+- Otherwise extraction runs and store() saves the new record
+
+Stats: hit ratio = (revalidated + unchanged) / lookups, reported per run.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from collections import Counter
+import hashlib
+import json
+import re
+import sqlite3
+import time
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DEFAULT_CACHE_PATH = "crawl_cache.sqlite"
+
+VOLATILE_PATTERN = re.compile(
+    r"<script\b.*?</script>|<style\b.*?</style>|<!--.*?-->|<meta[^>]+csrf[^>]*>",
+    re.IGNORECASE | re.DOTALL
+)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    record TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    validated_at REAL NOT NULL
+);
+"""
+
+
+def content_fingerprint(html: str) -> str:
+    """Hash of the page content that matters for extraction."""
+    stripped = WHITESPACE_PATTERN.sub(" ", VOLATILE_PATTERN.sub("", html)).strip()
+    return hashlib.sha256(stripped.encode("utf-8")).hexdigest()
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+@dataclass
+class CachedPage:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+    record: Dict[str, Any]
+
+
+class PageCache:
+    """SQLite-backed URL → (validators, fingerprint, record) cache."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self.stats: Counter = Counter()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ---- Lookup ----
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        row = self._conn.execute(
+            "SELECT url, etag, last_modified, content_hash, record FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        self.stats["lookups"] += 1
+        if row is None:
+            return None
+        return CachedPage(row[0], row[1], row[2], row[3], json.loads(row[4]))
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedPage]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    # ---- Outcomes ----
+
+    def not_modified(self, entry: CachedPage) -> Dict[str, Any]:
+        """Server answered 304: the cached record is still valid."""
+        self.stats["revalidated"] += 1
+        self._touch(entry.url)
+        return entry.record
+
+    def unchanged_record(
+        self,
+        entry: Optional[CachedPage],
+        html: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Cached record if a full 200 body has the same fingerprint, else None."""
+        if entry is None or entry.content_hash != content_fingerprint(html):
+            return None
+        self.stats["unchanged"] += 1
+        with self._conn:
+            # Keep the newest validators so the next run can get a 304
+            self._conn.execute(
+                "UPDATE pages SET etag = ?, last_modified = ?, validated_at = ? WHERE url = ?",
+                (etag, last_modified, time.time(), entry.url)
+            )
+        return entry.record
+
+    def store(
+        self,
+        url: str,
+        html: str,
+        record: Dict[str, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """Save the record extracted from a fresh (or changed) page."""
+        self.stats["stored"] += 1
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, content_fingerprint(html),
+                 json.dumps(record, ensure_ascii=False), now, now)
+            )
+
+    def _touch(self, url: str) -> None:
+        with self._conn:
+            self._conn.execute("UPDATE pages SET validated_at = ? WHERE url = ?", (time.time(), url))
+
+    # ---- Reporting ----
+
+    def hit_ratio(self) -> float:
+        hits = self.stats["revalidated"] + self.stats["unchanged"]
+        return hits / self.stats["lookups"] if self.stats["lookups"] else 0.0
+
+    def summary(self) -> str:
+        return (f"💾 Cache: {self.hit_ratio():.0%} hit ratio "
+                f"({self.stats['revalidated']} × 304, {self.stats['unchanged']} unchanged, "
+                f"{self.stats['stored']} stored, {self.stats['lookups']} lookups)")
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    page = ("<html><head><meta name='csrf-token' content='{token}'><script>var t={token};</script></head>"
+            "<body><h1>Tester</h1><div><h3>Mô tả công việc</h3><p>Kiểm thử phần mềm</p></div></body></html>")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PageCache(os.path.join(tmp, "cache.sqlite"))
+        url = "https://www.topcv.vn/viec-lam/tester/1.html"
+
+        # Run 1: miss → extract → store
+        entry = cache.lookup(url)
+        html = page.format(token="a1")
+        assert entry is None and cache.unchanged_record(entry, html) is None
+        cache.store(url, html, {"title": "Tester", "neuro_score": 65}, etag='"v1"')
+
+        # Run 2: server honours validators → 304
+        entry = cache.lookup(url)
+        assert cache.conditional_headers(entry) == {"If-None-Match": '"v1"'}
+        assert cache.not_modified(entry)["neuro_score"] == 65
+
+        # Run 3: server ignores validators, only the CSRF token changed → unchanged
+        entry = cache.lookup(url)
+        assert cache.unchanged_record(entry, page.format(token="b2")) is not None
+
+        # Run 4: real content change → extraction needed
+        entry = cache.lookup(url)
+        assert cache.unchanged_record(entry, html.replace("Kiểm thử", "Phân tích")) is None
+
+        print("=" * 60)
+        print("💾 CRAWLER PAGE CACHE")
+        print("=" * 60)
+        print(f"\n{cache.summary()}")
+        cache.close()
@@ -1,56 +1,91 @@
 import os
-import json
 import time
 import asyncio
-from playwright.async_api import async_playwright
+import argparse
+import contextlib
+from urllib.parse import urljoin, urlparse, parse_qsl, urlencode
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from bs4 import BeautifulSoup
 import re
 
+from keyword_automaton import KeywordAutomaton
+from neuro_keywords import NEURO_KEYWORDS, score_traits
+from http_cache import PageCache, DEFAULT_CACHE_PATH
+from crawl_frontier import CrawlFrontier, normalize_url
+from jsonl_writer import JsonlWriter, compact_jsonl, import_legacy_array
+import fast_extractor
+from crawl_metrics import CrawlMetrics, NULL_METRICS
+from html_archive import HtmlArchive, DEFAULT_ARCHIVE_DIR
+
+try:
+    import aiohttp  # Optional: HTTP fast path (falls back to Playwright only)
+except ImportError:
+    aiohttp = None
+
 # --- CONFIGURATION ---
 TARGET_URL = "https://www.topcv.vn/tim-viec-lam-tester"
 
-NEURO_KEYWORDS = {
-    "High_Focus": ["nhập liệu", "định kỳ", "lặp lại", "dữ liệu", "data entry", "kiên nhẫn"],
-    "Visual_Detail": ["soi lỗi", "chi tiết", "kiểm thử", "tester", "qa", "qc", "đồ họa", "pixel"],
-    "Logic_System": ["thuật toán", "backend", "logic", "hệ thống", "phân tích", "sql"],
-    "Low_Social": ["remote", "tại nhà", "ít giao tiếp", "chat support", "không nghe gọi", "độc lập"]
+# Search seeds (--seeds); each is followed through its result pages
+SEARCH_SEEDS = [
+    TARGET_URL,
+    "https://www.topcv.vn/tim-viec-lam-qa-qc",
+    "https://www.topcv.vn/tim-viec-lam-kiem-thu-phan-mem",
+    "https://www.topcv.vn/tim-viec-lam-nhap-lieu",
+    "https://www.topcv.vn/tim-viec-lam-data-entry",
+]
+MAX_PAGES_PER_SEED = 3    # Result pages per seed (--max-pages)
+STATE_DIR = "crawl_state" # Frontier queue + seen-URL Bloom filter (--state-dir)
+OUTPUT_FILE = "jobs_data.json"    # Legacy array for seed_opportunities.py (--output)
+METRICS_JSON = "metrics.json"     # Per-run stage timings/counters, written to the state dir
+METRICS_PROM = "metrics.prom"     # Same, Prometheus text format (--no-metrics to disable)
+ARCHIVE_DIR = DEFAULT_ARCHIVE_DIR # Compressed raw HTML of fetched pages (--archive / --no-archive)
+
+# Frontier priorities (lower first): finish known jobs before paging deeper
+JOB_PRIORITY = 0
+SEARCH_PRIORITY = 10
+
+MAX_JOBS = 5              # Job detail pages per run (--max-jobs)
+CONCURRENCY = 8           # Detail pages in flight (--concurrency)
+HOST_RATE_PER_SEC = 1.0   # Politeness: sustained requests/sec per host (--rate), the old sleep(1) pace
+HOST_BURST = 1            # Politeness: no back-to-back requests by default (--burst)
+
+# Browser fallback: reused tabs, and only the requests that carry the job text
+BROWSER_POOL_SIZE = 4     # Browser contexts/tabs kept open (--browser-pool)
+BLOCKED_RESOURCE_TYPES = ["image", "media", "font"]  # (--block-types)
+BLOCKED_DOMAINS = [       # Analytics / ads / trackers, subdomains included (--block-domains)
+    "google-analytics.com", "googletagmanager.com", "googlesyndication.com", "doubleclick.net",
+    "facebook.net", "facebook.com", "hotjar.com", "clarity.ms", "analytics.tiktok.com",
+    "criteo.com", "criteo.net", "mixpanel.com", "segment.io", "onesignal.com",
+]
+
+# HTTP fast path: most TopCV detail pages are server-rendered
+HTTP_TIMEOUT_S = 20
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "vi-VN,vi;q=0.9,en;q=0.8",
+    # aiohttp also advertises/decodes "br" when the Brotli package is installed
+    "Accept-Encoding": "gzip, deflate",
 }
+MIN_SERVER_HTML_CHARS = 2000
+JS_SHELL_MARKERS = [
+    'id="__next"></div>', 'id="app"></div>', 'id="root"></div>',
+    "enable javascript", "bật javascript", "just a moment...", "cf-browser-verification",
+]
+
+EXTRACTION_FAILED = "Description extraction failed."
+
+# Compiled once; same counts as per-keyword str.count (see keyword_automaton.py)
+NEURO_MATCHER = KeywordAutomaton(NEURO_KEYWORDS)
 
-def local_neuro_analyzer(text: str) -> dict:
+def local_neuro_analyzer(text: str, matcher: KeywordAutomaton = None) -> dict:
     """
     Analyzes job description text using keyword weighting essentially cost-free.
+    Keyword hits are counted by the shared KeywordAutomaton (see keyword_automaton.py).
     """
-    text_lower = text.lower()
-    scores = {trait: 0 for trait in NEURO_KEYWORDS}
-    total_hits = 0
-
-    for trait, keywords in NEURO_KEYWORDS.items():
-        for keyword in keywords:
-            count = text_lower.count(keyword.lower())
-            if count > 0:
-                scores[trait] += count
-                total_hits += count
-
-    # Determine primary tag
-    if total_hits == 0:
-        primary_tag = "General"
-        neuro_score = 50 # Neutral
-    else:
-        primary_tag = max(scores, key=scores.get)
-        # Cap score at 99, base 50
-        neuro_score = min(50 + (total_hits * 5), 99) 
-
-    # Get all tags with at least 1 hit
-    active_tags = [trait for trait, score in scores.items() if score > 0]
-    if not active_tags:
-        active_tags = ["General"]
+    return score_traits((matcher or NEURO_MATCHER).count(text))
 
-    return {
-        "tags": active_tags,
-        "primary_tag": primary_tag,
-        "neuro_score": neuro_score,
-        "keyword_hits": total_hits
-    }
 
 def extract_job_content(soup: BeautifulSoup) -> str:
     """
@@ -90,102 +125,590 @@ def extract_job_content(soup: BeautifulSoup) -> str:
     if len(best_text) > 100:
         return best_text
 
-    return "Description extraction failed."
+    return EXTRACTION_FAILED
+
+class TokenBucket:
+    """
+    Async token bucket: refills `rate` tokens/sec, banks at most `capacity`.
+    Waiting uses asyncio.sleep so other pages keep loading meanwhile.
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()  # FIFO: waiters are served in arrival order
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, so politeness holds no matter how many pages are in flight."""
+    def __init__(self, rate: float = HOST_RATE_PER_SEC, burst: float = HOST_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+
+    async def wait(self, url: str):
+        host = urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        await self.buckets[host].acquire()
+
+
+def build_job_record(html: str, url: str, metrics: CrawlMetrics = NULL_METRICS) -> dict:
+    """
+    Parse a job detail page and run the local analysis.
+    """
+    with metrics.time("parse"):
+        if fast_extractor.available:
+            # Single lxml pass, same output as the BeautifulSoup path below
+            title, company, description_text = fast_extractor.extract_page(html)
+        else:
+            soup = BeautifulSoup(html, 'html.parser')
+
+            # Metadata
+            title_el = soup.select_one("h1, .job-detail-title")
+            title = title_el.get_text(strip=True) if title_el else "Unknown Title"
+
+            company_el = soup.select_one(".company-name, .company-title")
+            company = company_el.get_text(strip=True) if company_el else "Unknown Company"
+
+            # Extract Description
+            description_text = extract_job_content(soup)
+
+    # Analyze Locally
+    with metrics.time("analyzer"):
+        analysis = local_neuro_analyzer(description_text)
+
+    return {
+        "title": title,
+        "company": company,
+        "description_snippet": description_text[:200] + "...", # Preview
+        "description": description_text, # Full text, for offline re-scoring (job_rescorer.py)
+        "full_description_length": len(description_text),
+        "tags": analysis["tags"],
+        "primary_tag": analysis["primary_tag"],
+        "neuro_score": analysis["neuro_score"],
+        "url": url
+    }
+
+
+def looks_js_rendered(html: str) -> bool:
+    """
+    Cheap check on raw HTML: empty app shells, JS-required notices and bot
+    challenges need a real browser.
+    """
+    if len(html) < MIN_SERVER_HTML_CHARS:
+        return True
+    lower = html.lower()
+    return any(marker in lower for marker in JS_SHELL_MARKERS)
+
+
+def create_http_session(concurrency: int):
+    """
+    Pooled keep-alive client shared by all workers (None if aiohttp is missing).
+    """
+    if aiohttp is None:
+        return None
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency, ttl_dns_cache=300)
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=HTTP_HEADERS,
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_S),
+    )
+
+
+async def read_html(response, metrics: CrawlMetrics = NULL_METRICS) -> str:
+    """
+    Response body as text, counting the downloaded bytes.
+    """
+    body = await response.read()
+    metrics.add_bytes(len(body))
+    return body.decode(response.get_encoding(), errors="replace")
+
+
+def http_failed(url: str, e: Exception, metrics: CrawlMetrics = NULL_METRICS):
+    print(f"   ↪️ HTTP fetch failed for {url}: {e!r}")
+    metrics.inc("http_timeout" if isinstance(e, asyncio.TimeoutError) else "http_error")
+
+
+async def fetch_html(http, url: str, metrics: CrawlMetrics = NULL_METRICS):
+    """
+    Plain GET (compressed, keep-alive). Returns the HTML or None.
+    """
+    try:
+        with metrics.time("http_fetch"):
+            async with http.get(url, allow_redirects=True) as response:
+                if response.status != 200 or "html" not in response.headers.get("Content-Type", ""):
+                    return None
+                return await read_html(response, metrics)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        http_failed(url, e, metrics)
+        return None
+
+
+async def fetch_detail(http, url: str, cache: PageCache = None, metrics: CrawlMetrics = NULL_METRICS):
+    """
+    GET a job page, revalidating against the page cache when enabled.
+
+    Returns (html, cached_record, validators). cached_record is set when the
+    server answered 304 or the content fingerprint is unchanged.
+    """
+    entry = cache.lookup(url) if cache is not None else None
+    try:
+        with metrics.time("http_fetch"):
+            async with http.get(url, headers=PageCache.conditional_headers(entry), allow_redirects=True) as response:
+                if response.status == 304 and entry is not None:
+                    return None, cache.not_modified(entry), {}
+                if response.status != 200 or "html" not in response.headers.get("Content-Type", ""):
+                    return None, None, {}
+                html = await read_html(response, metrics)
+                validators = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        http_failed(url, e, metrics)
+        return None, None, {}
+
+    if cache is not None:
+        return html, cache.unchanged_record(entry, html, **validators), validators
+    return html, None, validators
+
+
+def is_blocked_host(host: str, blocked_domains) -> bool:
+    """
+    True if `host` is one of the blocked domains or a subdomain of one.
+    """
+    host = (host or "").lower()
+    return any(host == domain or host.endswith("." + domain) for domain in blocked_domains)
+
+
+class LazyBrowser:
+    """
+    Launches Chromium only when a page actually needs it, then reuses a
+    bounded pool of tabs (one browser context each).
+
+    Every context aborts blocked resource types (images, media, fonts) and
+    tracker domains; HTML, scripts, stylesheets and XHR still load, so the
+    rendered text is unchanged.
+    """
+    def __init__(
+        self,
+        playwright,
+        pool_size: int = BROWSER_POOL_SIZE,
+        block_types=BLOCKED_RESOURCE_TYPES,
+        block_domains=BLOCKED_DOMAINS,
+        metrics: CrawlMetrics = NULL_METRICS
+    ):
+        self.playwright = playwright
+        self.browser = None
+        self.pool_size = max(1, pool_size)
+        self.block_types = set(block_types or ())
+        self.block_domains = [domain.lower() for domain in block_domains or ()]
+        self.metrics = metrics
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(self.pool_size)  # One per tab in use or idle
+        self._idle = asyncio.Queue()
+
+    async def _route(self, route):
+        request = route.request
+        if request.resource_type in self.block_types or \
+                is_blocked_host(urlparse(request.url).hostname, self.block_domains):
+            self.metrics.inc("blocked_requests")
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _open_page(self):
+        context = await self.browser.new_context()
+        if self.block_types or self.block_domains:
+            await context.route("**/*", self._route)
+        return await context.new_page()
+
+    @contextlib.asynccontextmanager
+    async def page(self):
+        """
+        Borrow a tab. It goes back to the pool on success; on any error its
+        context is closed and the slot is released, so the next borrower
+        opens a fresh one.
+        """
+        async with self._slots:
+            async with self._lock:
+                if self.browser is None:
+                    print(f"🌐 Launching Chromium for JS-rendered pages (pool of {self.pool_size})...")
+                    self.browser = await self.playwright.chromium.launch(headless=True) # Headless for speed
+
+            # Holding a slot guarantees an idle tab or room to open one
+            if self._idle.empty():
+                page = await self._open_page()
+                self.metrics.inc("browser_pages_opened")
+            else:
+                page = self._idle.get_nowait()
+                self.metrics.inc("browser_pages_reused")
+
+            healthy = False
+            try:
+                yield page
+                healthy = not page.is_closed()
+            finally:
+                if healthy:
+                    self._idle.put_nowait(page)
+                else:
+                    try:
+                        await page.context.close()
+                    except Exception:
+                        pass
+
+    async def close(self):
+        if self.browser is not None:
+            await self.browser.close()  # Closes every pooled context too
+
+
+def parse_job_links(html: str, base_url: str) -> list:
+    """
+    Job detail links from a server-rendered search results page.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    # TopCV selector strategy, with the same fallback as the browser path
+    links = soup.select(".job-list-search-result .job-item .title a") or soup.select("h3 a")
+    urls = []
+    for link in links:
+        url = link.get("href")
+        if url and urljoin(base_url, url) not in urls:
+            urls.append(urljoin(base_url, url))
+    return urls
+
+
+def next_page_url(html: str, url: str, page: int) -> str:
+    """
+    Link to the next results page: rel="next" if present, else ?page=N+1.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    link = soup.select_one('a[rel="next"], link[rel="next"]')
+    if link and link.get("href"):
+        return urljoin(url, link["href"])
+    parts = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "page"] + [("page", str(page + 1))]
+    return parts._replace(query=urlencode(query)).geturl()
+
+
+async def fetch_search_page(
+    browser: LazyBrowser,
+    http,
+    limiter: HostRateLimiter,
+    url: str,
+    metrics: CrawlMetrics = NULL_METRICS
+) -> str:
+    """
+    Read a search results page: plain HTML first, Playwright if that finds no jobs.
+    """
+    print(f"🚀 Navigating to {url}...")
+    if http is not None:
+        await limiter.wait(url)
+        html = await fetch_html(http, url, metrics)
+        if html and not looks_js_rendered(html) and parse_job_links(html, url):
+            return html
+        metrics.inc("search_fallback")
+
+    await limiter.wait(url)
+    async with browser.page() as page:
+        with metrics.time("search_navigation"):
+            await page.goto(url)
 
-async def main():
-    jobs_data = []
-    
-    async with async_playwright() as p:
-        # Launch browser
-        browser = await p.chromium.launch(headless=True) # Headless for speed
-        page = await browser.new_page()
-        
-        print(f"🚀 Navigating to {TARGET_URL}...")
-        await page.goto(TARGET_URL)
-        
         # Wait for list to load
         try:
             # Wait for job titles
-            await page.wait_for_selector(".job-list-search-result, .job-item", timeout=10000)
+            with metrics.time("wait_for_selector"):
+                await page.wait_for_selector(".job-list-search-result, .job-item", timeout=10000)
         except:
              print("⚠️ List selector timeout. Proceeding with available DOM...")
+             metrics.inc("search_timeout")
+
+        with metrics.time("page_content"):
+            html = await page.content()
+        metrics.add_bytes(len(html.encode("utf-8")))
+        return html
+
+
+async def scrape_job(
+    browser: LazyBrowser,
+    http,
+    url: str,
+    limiter: HostRateLimiter,
+    semaphore: asyncio.Semaphore,
+    position: str,
+    fetch_counts: dict,
+    cache: PageCache = None,
+    metrics: CrawlMetrics = NULL_METRICS,
+    archive: HtmlArchive = None
+):
+    """
+    Fetch one job detail page. Returns the job record, or None on failure.
+
+    Tries the HTTP fast path first and escalates to Playwright when the
+    page looks JS-rendered or the description cannot be extracted.
+    """
+    async with semaphore:
+        print(f"   [{position}] Processing: {url}...")
+
+        html, validators = None, {}
+        if http is not None:
+            await limiter.wait(url)
+            html, job_record, validators = await fetch_detail(http, url, cache, metrics)
+            if job_record is not None:
+                # Unchanged since the last run: skip extraction and analysis
+                fetch_counts["cache"] += 1
+                metrics.inc("cache_hit")
+                metrics.inc("success")
+                return job_record
+            if html and not looks_js_rendered(html):
+                if archive is not None:
+                    archive.put(url, html, source="http")
+                job_record = build_job_record(html, url, metrics)
+                if not job_record["description_snippet"].startswith(EXTRACTION_FAILED):
+                    fetch_counts["http"] += 1
+                    metrics.inc("success")
+                    if cache is not None:
+                        cache.store(url, html, job_record, **validators)
+                    return job_record
+                metrics.inc("http_extraction_failed")
+            print(f"   ↪️ [{position}] Falling back to browser")
+            metrics.inc("fallback")
+
+        await limiter.wait(url)
+        try:
+            # Pooled tab; a failing page is discarded instead of returned to the pool
+            async with browser.page() as job_page:
+                with metrics.time("navigation"):
+                    await job_page.goto(url)
 
-        # Collect Links
-        # TopCV selector strategy
-        job_links = await page.locator(".job-list-search-result .job-item .title a").all()
-        
-        # Fallback if specific structure failed
-        if not job_links:
-             job_links = await page.locator("h3 a").all()
-
-        print(f"🔎 Found {len(job_links)} potential jobs. Processing top 5...")
-        
-        # Limit processing
-        targets = job_links[:5]
-        
-        for i, link in enumerate(targets):
-            url = await link.get_attribute("href")
-            # TopCV links might be relative or absolute, usually absolute
-            
-            print(f"   [{i+1}/5] Processing: {url}...")
-            
-            try:
-                # Open separate tab/page for job detail to preserve list state if needed (though we have URLs)
-                job_page = await browser.new_page()
-                await job_page.goto(url)
-                
                 # Wait for body
-                await job_page.wait_for_load_state("domcontentloaded")
-                
-                content = await job_page.content()
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                # Metadata
-                title_el = soup.select_one("h1, .job-detail-title")
-                title = title_el.get_text(strip=True) if title_el else "Unknown Title"
-                
-                company_el = soup.select_one(".company-name, .company-title")
-                company = company_el.get_text(strip=True) if company_el else "Unknown Company"
-
-                # Extract Description
-                description_text = extract_job_content(soup)
-                
-                # Analyze Locally
-                analysis = local_neuro_analyzer(description_text)
-                
-                job_record = {
-                    "title": title,
-                    "company": company,
-                    "description_snippet": description_text[:200] + "...", # Preview
-                    "full_description_length": len(description_text),
-                    "tags": analysis["tags"],
-                    "primary_tag": analysis["primary_tag"],
-                    "neuro_score": analysis["neuro_score"],
-                    "url": url
-                }
-                
-                jobs_data.append(job_record)
-                await job_page.close()
-                time.sleep(1) # Rate limit politeness
+                with metrics.time("wait_for_load_state"):
+                    await job_page.wait_for_load_state("domcontentloaded")
 
-            except Exception as e:
-                print(f"❌ Error scraping {url}: {e}")
+                with metrics.time("page_content"):
+                    content = await job_page.content()
+            metrics.add_bytes(len(content.encode("utf-8")))
+            fetch_counts["browser"] += 1
+            if archive is not None:
+                archive.put(url, content, source="browser")
+            job_record = build_job_record(content, url, metrics)
+            extracted = not job_record["description_snippet"].startswith(EXTRACTION_FAILED)
+            metrics.inc("success" if extracted else "extraction_failed")
+            # Cache against the server HTML only when it carries the content (not a JS shell),
+            # and never a failed extraction: the next run must try again
+            if extracted and cache is not None and html and not looks_js_rendered(html):
+                cache.store(url, html, job_record, **validators)
+            return job_record
 
-        await browser.close()
+        except Exception as e:
+            print(f"❌ Error scraping {url}: {e}")
+            metrics.inc("timeout" if isinstance(e, PlaywrightTimeoutError) else "error")
+            return None
+
+
+async def main(
+    max_jobs: int = MAX_JOBS,
+    concurrency: int = CONCURRENCY,
+    rate: float = HOST_RATE_PER_SEC,
+    burst: float = HOST_BURST,
+    use_http: bool = True,
+    cache_path: str = DEFAULT_CACHE_PATH,
+    seeds: list = None,
+    max_pages: int = MAX_PAGES_PER_SEED,
+    state_dir: str = STATE_DIR,
+    fresh: bool = False,
+    output_file: str = OUTPUT_FILE,
+    metrics_enabled: bool = True,
+    browser_pool: int = BROWSER_POOL_SIZE,
+    block_types: list = None,
+    block_domains: list = None,
+    archive_dir: str = ARCHIVE_DIR
+):
+    preview = []
+    metrics = CrawlMetrics(enabled=metrics_enabled)
+    limiter = HostRateLimiter(rate, burst)
+    semaphore = asyncio.Semaphore(concurrency)
+    fetch_counts = {"cache": 0, "http": 0, "browser": 0}
+
+    # Frontier: resumes pending jobs and remembers every job URL already fetched
+    frontier = CrawlFrontier(state_dir) if fresh else CrawlFrontier.load(state_dir)
+    for seed in seeds or SEARCH_SEEDS:
+        frontier.push(seed, kind="search", priority=SEARCH_PRIORITY, page=1, seed=seed)
+    jobs_started = 0
+    active = 0
+
+    # Results stream to a JSONL log (crash-safe); jobs_data.json is compacted from it
+    log_path = os.path.splitext(output_file)[0] + ".jsonl"
+    first_run = not os.path.exists(log_path)
+    writer = JsonlWriter(log_path, key_fn=normalize_url)
+    if first_run:
+        imported = import_legacy_array(writer, output_file)
+        if imported:
+            print(f"📥 Imported {imported} jobs from {output_file} into {log_path}")
+    resumed = len(writer.urls)
+    imported_written = writer.written  # Legacy records, not crawled by this run
+
+    async with async_playwright() as p:
+        browser = LazyBrowser(
+            p, browser_pool,
+            BLOCKED_RESOURCE_TYPES if block_types is None else block_types,
+            BLOCKED_DOMAINS if block_domains is None else block_domains,
+            metrics
+        )
+        http = create_http_session(concurrency) if use_http else None
+        cache = PageCache(cache_path) if (http is not None and cache_path) else None
+        archive = HtmlArchive(archive_dir) if archive_dir else None
+
+        async def crawl_search(item):
+            html = await fetch_search_page(browser, http, limiter, item.url, metrics)
+            links = parse_job_links(html, item.url) if html else []
+            new_jobs = sum(frontier.push(url, kind="job", priority=JOB_PRIORITY, seed=item.seed) for url in links)
+            print(f"🔎 Page {item.page} of {item.seed}: {len(links)} jobs ({new_jobs} new)")
+            if links and item.page < max_pages:
+                frontier.push(next_page_url(html, item.url, item.page), kind="search",
+                              priority=SEARCH_PRIORITY + item.page, page=item.page + 1, seed=item.seed)
+
+        async def worker():
+            nonlocal jobs_started, active
+            while jobs_started < max_jobs:
+                item = frontier.pop()
+                if item is None:
+                    if active == 0:
+                        return  # Queue drained and nobody can add more
+                    await asyncio.sleep(0.05)
+                    continue
+
+                active += 1
+                ok = cancelled = False
+                try:
+                    if item.kind == "search":
+                        await crawl_search(item)
+                        ok = True
+                    elif item.url in writer and not fresh:
+                        ok = True
+                        continue  # Written by an earlier (possibly crashed) run
+                    else:
+                        jobs_started += 1
+                        job_record = await scrape_job(
+                            browser, http, item.url, limiter, semaphore,
+                            f"{jobs_started}/{max_jobs}", fetch_counts, cache, metrics, archive
+                        )
+                        if job_record:
+                            ok = True
+                            writer.write(job_record)
+                            if len(preview) < 3:
+                                preview.append(job_record)
+                except asyncio.CancelledError:
+                    cancelled = True  # Stays in flight, so the next run re-queues it
+                    raise
+                except Exception as e:
+                    print(f"❌ Error crawling {item.url}: {e}")
+                finally:
+                    active -= 1
+                    if not cancelled:
+                        # Failed jobs are not marked seen, so a later run retries them
+                        frontier.done(item, ok)
+                        if frontier.stats["done"] % 25 == 0:
+                            frontier.save()
+
+        print(f"🚀 Crawling up to {max_jobs} jobs from {len(seeds or SEARCH_SEEDS)} searches "
+              f"({concurrency} at a time, {rate:g} req/s per host)...")
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            await asyncio.gather(*workers)
+
+        except asyncio.CancelledError:
+            # Ctrl+C / task cancellation: stop in-flight pages, keep what we have
+            print(f"\n⚠️ Crawl cancelled. {writer.written} finished jobs are already on disk.")
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+
+        finally:
+            frontier.save()
+            if http is not None:
+                await http.close()
+            await browser.close()
+            writer.close()
+            total = compact_jsonl(log_path, output_file, key_fn=normalize_url)
+            new_jobs = len(writer.urls) - resumed
+            revisited = writer.written - imported_written - new_jobs
+            print(f"\n✅ Success! {new_jobs} new jobs, {revisited} re-visited "
+                  f"({resumed} from earlier runs), {total} total saved to {output_file}")
+            print(f"   Unchanged (cache): {fetch_counts['cache']} | via HTTP: {fetch_counts['http']} "
+                  f"| via browser: {fetch_counts['browser']} | still queued: {len(frontier)}")
+            if cache is not None:
+                print(f"   {cache.summary()}")
+                cache.close()
+            if archive is not None:
+                print(f"   {archive.summary()}")
+                archive.close()
+            if metrics.enabled:
+                metrics.write_json(os.path.join(state_dir, METRICS_JSON))
+                metrics.write_prometheus(os.path.join(state_dir, METRICS_PROM))
+                print(f"📊 Stage timings (saved to {state_dir}/{METRICS_JSON}, {METRICS_PROM}):")
+                print(metrics.report())
 
-    # Save Data
-    output_file = "jobs_data.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(jobs_data, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n✅ Success! {len(jobs_data)} jobs saved to {output_file}")
-    
     # Print preview for User Verification
     print("\n--- PREVIEW OF CAPTURED DATA ---")
-    for job in jobs_data[:3]:
+    for job in preview:
         print(f"\n[JOB] {job['title']} @ {job['company']}")
         print(f"   Score: {job['neuro_score']} | Tags: {job['tags']}")
         print(f"   Desc Snippet: {job['description_snippet']}")
 
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Crawl job postings and tag them with neuro traits.")
+    parser.add_argument("--max-jobs", type=int, default=MAX_JOBS, help="Job detail pages to process")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Detail pages in flight")
+    parser.add_argument("--rate", type=float, default=HOST_RATE_PER_SEC, help="Max requests/sec per host")
+    parser.add_argument("--burst", type=float, default=HOST_BURST, help="Burst allowance per host")
+    parser.add_argument("--browser-only", action="store_true", help="Skip the HTTP fast path")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Page cache file (SQLite)")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-download and re-extract")
+    parser.add_argument("--seeds", nargs="+", default=SEARCH_SEEDS, help="Search result URLs to start from")
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES_PER_SEED, help="Result pages per seed")
+    parser.add_argument("--state-dir", default=STATE_DIR, help="Where the crawl frontier is persisted")
+    parser.add_argument("--fresh", action="store_true", help="Ignore saved frontier state and re-visit known jobs "
+                        "(unchanged pages are revalidated through the page cache)")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="Legacy JSON array (a .jsonl log is kept next to it)")
+    parser.add_argument("--browser-pool", type=int, default=BROWSER_POOL_SIZE, help="Browser tabs kept open")
+    parser.add_argument("--block-types", nargs="*", default=BLOCKED_RESOURCE_TYPES,
+                        help="Playwright resource types to abort (e.g. image media font stylesheet)")
+    parser.add_argument("--block-domains", nargs="*", default=BLOCKED_DOMAINS,
+                        help="Hosts (and their subdomains) whose requests are aborted")
+    parser.add_argument("--load-everything", action="store_true", help="Disable request blocking")
+    parser.add_argument("--archive", default=ARCHIVE_DIR, help="Raw HTML archive directory (html_archive.py)")
+    parser.add_argument("--no-archive", action="store_true", help="Do not keep the fetched HTML")
+    parser.add_argument("--no-metrics", action="store_true", help="Skip stage timing / counter collection")
+    parser.add_argument("--fold-keywords", action="store_true",
+                        help="Match keywords ignoring Vietnamese diacritics and extra whitespace")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    if args.fold_keywords:
+        NEURO_MATCHER = KeywordAutomaton(NEURO_KEYWORDS, fold=True, collapse_whitespace=True)
+    try:
+        asyncio.run(main(args.max_jobs, args.concurrency, args.rate, args.burst, not args.browser_only,
+                         None if args.no_cache else args.cache, args.seeds, args.max_pages,
+                         args.state_dir, args.fresh, args.output, not args.no_metrics, args.browser_pool,
+                         [] if args.load_everything else args.block_types,
+                         [] if args.load_everything else args.block_domains,
+                         None if args.no_archive else args.archive))
+    except KeyboardInterrupt:
+        print("🛑 Stopped by user.")
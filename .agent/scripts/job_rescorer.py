@@ -0,0 +1,446 @@
+"""
+🧮 OFFLINE JOB RE-SCORING (SPARSE TERM MATRIX)
+==============================================
+Refreshes `tags` / `primary_tag` / `neuro_score` of every stored posting
+after NEURO_KEYWORDS or the scoring formula changes — no re-crawl.
+
+Default counting is the crawler's own (KeywordAutomaton substring hits), so
+re-scored postings match what local_neuro_analyzer gives new ones.
+
+Opt-in whole-word / TF-IDF pipeline (--whole-words, --tfidf):
+- Tokenize each stored description once (NFC, lowercase, \\w+ tokens) into
+  a sparse document × term count matrix (CSR) + the token-id stream; both
+  are cached on disk and reused while the corpus is unchanged
+- Single-word keywords: hits = X · K (K: term × trait weights)
+- Multi-word keywords: counted per document from the token stream with
+  one vectorized scan each, then · K
+- Optional TF-IDF: each keyword column weighted by its IDF, rescaled so the
+  average keyword weight stays 1 (rare keywords count more)
+- Scores/tags via neuro_keywords.score_traits (same formula as the crawler);
+  the JSONL log and jobs_data.json are rewritten in one bulk pass
+
+Whole-word matching ("tester" does not match inside "testers") differs from
+the crawler's substring count; the benchmark reports how many stored scores
+change because of that, so only opt in when the crawler is switched as well.
+
+Backends: scipy.sparse when installed, else a NumPy CSR product
+(bincount per trait column).
+"""
+
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+try:
+    from scipy import sparse  # Optional
+except ImportError:
+    sparse = None
+
+from keyword_automaton import KeywordAutomaton, normalize_text
+from neuro_keywords import NEURO_KEYWORDS, score_traits
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+TOKEN_PATTERN = re.compile(r"\w+")
+DEFAULT_MATRIX_CACHE = os.path.join("crawl_state", "term_matrix.npz")
+# Crawler output at the repo root, wherever the script is run from
+DEFAULT_JOBS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "jobs_data.json")
+
+
+def record_text(record: Dict[str, Any]) -> str:
+    """Full stored description ("" for records crawled before it was kept)."""
+    return record.get("description") or ""
+
+
+def tokenize(text: str, fold: bool = False) -> List[str]:
+    return TOKEN_PATTERN.findall(normalize_text(text, fold=fold))
+
+
+# ============================================================================
+# TERM MATRIX
+# ============================================================================
+
+def _csr_dot(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """CSR matrix · dense (columns × k) matrix."""
+    documents = len(indptr) - 1
+    if sparse is not None:
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=(documents, weights.shape[0]))
+        return np.asarray(matrix @ weights)
+    # Only entries in weighted columns contribute; skip the rest of the vocabulary
+    mask = weights.any(axis=1)[indices]
+    rows = np.repeat(np.arange(documents), np.diff(indptr))[mask]
+    contributions = data[mask, None] * weights[indices[mask]]
+    result = np.zeros((documents, weights.shape[1]))
+    for k in range(weights.shape[1]):
+        result[:, k] = np.bincount(rows, weights=contributions[:, k], minlength=documents)
+    return result
+
+
+class TermMatrix:
+    """
+    Document × term counts (CSR) plus the token-id stream they came from.
+
+    Single-word keywords are columns of the matrix; multi-word keywords are
+    counted from the token stream on demand (one vectorized scan each), so
+    editing keyword phrases never needs a re-tokenize.
+    """
+
+    def __init__(
+        self,
+        vocabulary: List[str],
+        tokens: np.ndarray,
+        token_ptr: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        digest: str = "",
+        fold: bool = False
+    ):
+        self.vocabulary = vocabulary
+        self.term_ids = {term: i for i, term in enumerate(vocabulary)}
+        self.tokens = tokens          # Token ids of all documents, concatenated
+        self.token_ptr = token_ptr    # Document d owns tokens[token_ptr[d]:token_ptr[d + 1]]
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.digest = digest
+        self.fold = fold
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.indptr) - 1, len(self.vocabulary)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    # ---- Build ----
+
+    @classmethod
+    def build(cls, texts: Sequence[str], fold: bool = False) -> "TermMatrix":
+        vocabulary: Dict[str, int] = {}
+        token_ids: List[int] = []
+        token_ptr = np.zeros(len(texts) + 1, dtype=np.int64)
+        for doc, text in enumerate(texts):
+            tokens = tokenize(text, fold)
+            token_ptr[doc + 1] = token_ptr[doc] + len(tokens)
+            token_ids.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokens)
+
+        tokens = np.asarray(token_ids, dtype=np.int32)
+        docs = np.repeat(np.arange(len(texts), dtype=np.int64), np.diff(token_ptr))
+        size = max(len(vocabulary), 1)
+        cells, counts = np.unique(docs * size + tokens, return_counts=True)
+        indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells // size, minlength=len(texts)), out=indptr[1:])
+
+        return cls(list(vocabulary), tokens, token_ptr, indptr, (cells % size).astype(np.int32),
+                   counts.astype(np.float32), corpus_digest(texts, fold), fold)
+
+    # ---- Keyword features ----
+
+    def phrase_ids(self, phrase: str) -> Optional[List[int]]:
+        """Token ids of a keyword, or None if one of its words never occurs."""
+        ids = [self.term_ids.get(token) for token in tokenize(phrase, self.fold)]
+        return ids if ids and None not in ids else None
+
+    def phrase_counts(self, ids: List[int]) -> np.ndarray:
+        """Occurrences of a multi-word phrase per document (no match across documents)."""
+        n = len(ids)
+        starts = len(self.tokens) - n + 1
+        if starts <= 0:
+            return np.zeros(self.shape[0])
+        match = self.tokens[:starts] == ids[0]
+        for k in range(1, n):
+            match &= self.tokens[k:k + starts] == ids[k]
+        positions = np.flatnonzero(match)
+        docs = np.searchsorted(self.token_ptr, positions, side="right") - 1
+        inside = positions + n <= self.token_ptr[docs + 1]
+        return np.bincount(docs[inside], minlength=self.shape[0]).astype(np.float64)
+
+    def document_frequency(self) -> np.ndarray:
+        return np.bincount(self.indices, minlength=self.shape[1])
+
+    def dot(self, weights: np.ndarray) -> np.ndarray:
+        """X · weights for a dense (terms × k) weight matrix."""
+        return _csr_dot(self.indptr, self.indices, self.data, weights)
+
+    # ---- Persistence ----
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            vocabulary=np.array(self.vocabulary, dtype=str),
+            tokens=self.tokens, token_ptr=self.token_ptr,
+            indptr=self.indptr, indices=self.indices, data=self.data,
+            meta=np.array(json.dumps({"digest": self.digest, "fold": self.fold}))
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "TermMatrix":
+        with np.load(path) as archive:
+            meta = json.loads(str(archive["meta"]))
+            return cls(archive["vocabulary"].tolist(), archive["tokens"], archive["token_ptr"],
+                       archive["indptr"], archive["indices"], archive["data"], meta["digest"], meta["fold"])
+
+
+def corpus_digest(texts: Sequence[str], fold: bool = False) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{TOKEN_PATTERN.pattern}:{fold}".encode("utf-8"))
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_or_build(texts: Sequence[str], cache_path: Optional[str], fold: bool = False) -> Tuple[TermMatrix, bool]:
+    """Cached matrix if it was built from exactly these texts, else a fresh build."""
+    if cache_path and os.path.exists(cache_path):
+        matrix = TermMatrix.load(cache_path)
+        if matrix.digest == corpus_digest(texts, fold):
+            return matrix, True
+    matrix = TermMatrix.build(texts, fold=fold)
+    if cache_path:
+        matrix.save(cache_path)
+    return matrix, False
+
+
+# ============================================================================
+# SCORING
+# ============================================================================
+
+def keyword_hits(matrix: TermMatrix, keywords: Dict[str, List[str]], tfidf: bool = False) -> np.ndarray:
+    """
+    (documents × traits) keyword hits: X · K for single words, plus phrase
+    counts · K for multi-word keywords. With tfidf, each keyword is weighted
+    by its IDF, rescaled so the mean keyword weight is 1.
+    """
+    documents = matrix.shape[0]
+    word_weights = np.zeros((matrix.shape[1], len(keywords)))
+    phrase_columns: List[np.ndarray] = []
+    phrase_weights: List[np.ndarray] = []
+    word_terms, phrase_df = [], []
+
+    for trait, (_, words) in enumerate(keywords.items()):
+        for word in words:
+            ids = matrix.phrase_ids(word)
+            if ids is None:
+                continue  # Never occurs in the corpus
+            if len(ids) == 1:
+                word_weights[ids[0], trait] += 1.0
+                word_terms.append(ids[0])
+            else:
+                counts = matrix.phrase_counts(ids)
+                weight = np.zeros(len(keywords))
+                weight[trait] = 1.0
+                phrase_columns.append(counts)
+                phrase_weights.append(weight)
+                phrase_df.append(np.count_nonzero(counts))
+
+    if tfidf and (word_terms or phrase_df):
+        word_df = matrix.document_frequency()
+        word_idf = np.log((1 + documents) / (1 + word_df)) + 1
+        phrase_idf = np.log((1 + documents) / (1 + np.asarray(phrase_df, dtype=np.float64))) + 1
+        scale = np.concatenate([word_idf[sorted(set(word_terms))], phrase_idf]).mean()
+        word_weights *= (word_idf / scale)[:, None]
+        phrase_weights = [weight * idf / scale for weight, idf in zip(phrase_weights, phrase_idf)]
+
+    hits = matrix.dot(word_weights)
+    if phrase_columns:
+        hits += np.column_stack(phrase_columns) @ np.vstack(phrase_weights)
+    return hits
+
+
+def rescore(
+    records: List[Dict[str, Any]],
+    keywords: Dict[str, List[str]],
+    tfidf: bool = False,
+    cache_path: Optional[str] = None,
+    fold: bool = False,
+    whole_words: bool = False
+) -> Dict[str, Any]:
+    """
+    Update tags / primary_tag / neuro_score of `records` in place.
+
+    Records without a full `description` (crawled before it was stored) keep
+    their scores: their 200-char snippet would under-count.
+
+    Args:
+        tfidf: IDF-weighted whole-word hits (implies whole_words)
+        whole_words: Count whole words through the term matrix instead of
+            the crawler's substring hits (KeywordAutomaton, the default)
+
+    Returns:
+        Stats: documents, changed scores, whether the matrix came from cache
+    """
+    traits = list(keywords)
+    skipped = sum(not record_text(record) for record in records)
+    records = [record for record in records if record_text(record)]
+    texts = [record_text(record) for record in records]
+    if not (whole_words or tfidf):
+        counts = KeywordAutomaton(keywords, fold=fold).count_many(texts)
+        hits = np.array([[count[trait] for trait in traits] for count in counts], dtype=np.float64)
+        stats = {"cached_matrix": False, "terms": 0, "nnz": 0, "backend": "keyword_automaton"}
+    else:
+        matrix, cached = load_or_build(texts, cache_path, fold)
+        hits = keyword_hits(matrix, keywords, tfidf)
+        stats = {"cached_matrix": cached, "terms": matrix.shape[1], "nnz": matrix.nnz,
+                 "backend": "scipy.sparse" if sparse is not None else "numpy"}
+
+    changed = 0
+    for record, row in zip(records, hits.tolist()):
+        analysis = score_traits(dict(zip(traits, row)))
+        score = int(round(analysis["neuro_score"]))
+        changed += score != record.get("neuro_score")
+        record["tags"] = analysis["tags"]
+        record["primary_tag"] = analysis["primary_tag"]
+        record["neuro_score"] = score
+    return dict(stats, documents=len(records), changed=changed, skipped=skipped)
+
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def rescore_files(
+    json_path: str,
+    tfidf: bool = False,
+    cache_path: Optional[str] = DEFAULT_MATRIX_CACHE,
+    fold: bool = False,
+    whole_words: bool = False,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Re-score the crawl output: the JSONL log (if present) is the source of
+    truth and is rewritten first, then compacted to `json_path`.
+    """
+    from crawl_frontier import normalize_url, _atomic_write
+    from jsonl_writer import iter_jsonl, compact_jsonl
+
+    log_path = os.path.splitext(json_path)[0] + ".jsonl"
+    if os.path.exists(log_path):
+        records = list(iter_jsonl(log_path))
+    else:
+        with open(json_path, encoding="utf-8") as f:
+            records = json.load(f)
+
+    stats = rescore(records, NEURO_KEYWORDS, tfidf, cache_path, fold, whole_words)
+    if not dry_run:
+        if os.path.exists(log_path):
+            lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+            _atomic_write(log_path, lines.encode("utf-8"))
+            compact_jsonl(log_path, json_path, key_fn=normalize_url)
+        else:
+            _atomic_write(json_path, json.dumps(records, indent=2, ensure_ascii=False).encode("utf-8"))
+    return stats
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+def _demo() -> None:
+    import random
+    import time
+
+    with open(DEFAULT_JOBS_FILE, encoding="utf-8") as f:
+        crawled = json.load(f)
+
+    # Filler: stored snippet words + a long tail of other terms; a few keywords
+    # (and look-alikes such as "testers", "QA/QC") per posting
+    rng = random.Random(4)
+    filler = [word for job in crawled for word in job["description_snippet"].split()]
+    filler += [f"từ{i}" for i in range(20_000)]
+    keywords = [kw for kws in NEURO_KEYWORDS.values() for kw in kws] + ["testers", "QA/QC", "logic,"]
+
+    def description() -> str:
+        words = rng.choices(filler, k=rng.randint(150, 500))
+        for _ in range(rng.randint(0, 8)):
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        return " ".join(words)
+
+    records = [{"url": f"https://www.topcv.vn/viec-lam/job/{i}.html", "description": description()}
+               for i in range(30_000)]
+    crawler_matcher = KeywordAutomaton(NEURO_KEYWORDS)  # job_crawler.NEURO_MATCHER
+
+    def local_neuro_analyzer(text: str) -> Dict[str, Any]:
+        return score_traits(crawler_matcher.count(text))
+
+    for record in records:
+        record.update(local_neuro_analyzer(record["description"]))
+
+    print("=" * 60)
+    print("🧮 OFFLINE JOB RE-SCORING")
+    print("=" * 60)
+    print(f"\nCorpus: {len(records):,} postings, "
+          f"{sum(len(r['description']) for r in records) / len(records):,.0f} chars each")
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "term_matrix.npz")
+        started = time.perf_counter()
+        stats = rescore(records, NEURO_KEYWORDS)
+        expected = [local_neuro_analyzer(record["description"])["neuro_score"] for record in records]
+        assert stats["changed"] == 0 and [record["neuro_score"] for record in records] == expected
+        print(f"   Default (crawler count): {time.perf_counter() - started:5.2f}s (identical to the crawler)")
+
+        changed_vs_crawler = None
+        for label in ("Whole words (tokenize)", "Whole words (cached)"):
+            started = time.perf_counter()
+            stats = rescore(records, NEURO_KEYWORDS, cache_path=cache_path, whole_words=True)
+            print(f"   {label:23}: {time.perf_counter() - started:5.2f}s "
+                  f"({stats['terms']:,} terms, {stats['nnz']:,} non-zeros, {stats['backend']})")
+            if changed_vs_crawler is None:
+                changed_vs_crawler = stats["changed"]
+        print(f"   Whole-word matching would change {changed_vs_crawler:,} of the crawler's scores")
+
+        started = time.perf_counter()
+        stats = rescore(records, NEURO_KEYWORDS, tfidf=True, cache_path=cache_path)
+        print(f"   TF-IDF weighting       : {time.perf_counter() - started:5.2f}s, {stats['changed']:,} scores changed")
+
+        started = time.perf_counter()
+        edited = dict(NEURO_KEYWORDS, Low_Social=NEURO_KEYWORDS["Low_Social"] + ["làm việc online"])
+        rescore(records, edited, cache_path=cache_path, whole_words=True)
+        print(f"   Edited keyword set     : {time.perf_counter() - started:5.2f}s")
+
+    # Exactness check on a tiny corpus: whole-word hits == manual count
+    tiny = [{"description": "Tester QA/QC kiểm thử, testers; nhập liệu nhập liệu"}]
+    rescore(tiny, NEURO_KEYWORDS, whole_words=True)
+    assert tiny[0]["neuro_score"] == min(50 + 6 * 5, 99) and tiny[0]["primary_tag"] == "Visual_Detail"
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Re-score stored job postings without re-crawling.")
+    parser.add_argument("--input", default=DEFAULT_JOBS_FILE, help="Crawler output (its .jsonl log is used if present)")
+    parser.add_argument("--whole-words", action="store_true",
+                        help="Count whole words via the term matrix instead of the crawler's substring hits")
+    parser.add_argument("--tfidf", action="store_true",
+                        help="Weight whole-word hits by inverse document frequency (implies --whole-words)")
+    parser.add_argument("--fold-keywords", action="store_true", help="Ignore Vietnamese diacritics")
+    parser.add_argument("--matrix-cache", default=DEFAULT_MATRIX_CACHE, help="Term matrix cache ('' to disable)")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+    parser.add_argument("--benchmark", action="store_true", help="Run the synthetic 30k-posting benchmark instead")
+    args = parser.parse_args()
+    if args.benchmark:
+        _demo()
+        sys.exit(0)
+
+    result = rescore_files(args.input, args.tfidf, args.matrix_cache or None, args.fold_keywords,
+                           args.whole_words, args.dry_run)
+    matrix_state = "" if not (args.whole_words or args.tfidf) else ("cached term matrix, " if result["cached_matrix"] else "new term matrix, ")
+    print(f"🧮 Re-scored {result['documents']} postings: {result['changed']} scores changed "
+          f"({matrix_state}{result['backend']}; {result['skipped']} without a stored description kept as is)"
+          f"{' — dry run, nothing written' if args.dry_run else ''}")
@@ -0,0 +1,221 @@
+"""
+📝 CRASH-SAFE JSONL WRITER
+==========================
+Streams crawler results to disk one record per line, so a crash loses at
+most the last few unsynced records instead of the whole run.
+
+Writer:
+- Append-only JSONL; each record is written and flushed immediately
+- fsync batching: every `fsync_every` records or `fsync_interval_s` seconds
+- On open, a torn last line (crash mid-write) is truncated away and the URLs
+  already written are loaded, so a resumed crawl can skip them
+
+Compaction:
+- compact_jsonl() turns the JSONL log into the legacy JSON array
+  (`jobs_data.json`) read by seed_opportunities.py; later lines win per URL
+- import_legacy_array() seeds a new log from an existing jobs_data.json
+"""
+
+from typing import Dict, List, Any, Callable, Iterator, Set
+import json
+import os
+import time
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DEFAULT_FSYNC_EVERY = 20
+DEFAULT_FSYNC_INTERVAL_S = 2.0
+
+
+def _identity(url: str) -> str:
+    return url
+
+
+# ============================================================================
+# READING
+# ============================================================================
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield complete records; a torn trailing line is ignored."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                break
+
+
+def _last_good_offset(path: str) -> int:
+    """Byte offset just past the last complete, parseable line."""
+    offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                json.loads(line)
+            except json.JSONDecodeError:
+                break
+            offset += len(line)
+    return offset
+
+
+# ============================================================================
+# WRITER
+# ============================================================================
+
+class JsonlWriter:
+    """Append-only JSONL log keyed by record URL."""
+
+    def __init__(
+        self,
+        path: str,
+        key_fn: Callable[[str], str] = _identity,
+        fsync_every: int = DEFAULT_FSYNC_EVERY,
+        fsync_interval_s: float = DEFAULT_FSYNC_INTERVAL_S
+    ):
+        self.path = path
+        self.key_fn = key_fn
+        self.fsync_every = fsync_every
+        self.fsync_interval_s = fsync_interval_s
+        self.urls: Set[str] = set()
+        self.written = 0
+
+        if os.path.exists(path):
+            good = _last_good_offset(path)
+            if good < os.path.getsize(path):
+                print(f"⚠️ Truncating torn record at byte {good} of {path}")
+                with open(path, "r+b") as f:
+                    f.truncate(good)
+            for record in iter_jsonl(path):
+                if record.get("url"):
+                    self.urls.add(key_fn(record["url"]))
+
+        self._file = open(path, "ab")
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def __contains__(self, url: str) -> bool:
+        return self.key_fn(url) in self.urls
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+        self._file.write(line)
+        self._file.flush()
+        if record.get("url"):
+            self.urls.add(self.key_fn(record["url"]))
+        self.written += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval_s:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+# ============================================================================
+# COMPACTION / MIGRATION
+# ============================================================================
+
+def compact_jsonl(jsonl_path: str, json_path: str, key_fn: Callable[[str], str] = _identity) -> int:
+    """
+    Write the legacy JSON array from the JSONL log (atomic replace).
+
+    Returns:
+        Number of records written
+    """
+    records: Dict[str, Dict[str, Any]] = {}
+    for i, record in enumerate(iter_jsonl(jsonl_path)):
+        key = key_fn(record["url"]) if record.get("url") else f"__line_{i}"
+        records.pop(key, None)  # Re-insert so the latest version keeps its new position
+        records[key] = record
+
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(list(records.values()), f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, json_path)
+    return len(records)
+
+
+def import_legacy_array(writer: JsonlWriter, json_path: str) -> int:
+    """Append records from an existing JSON array that the log does not have yet."""
+    if not os.path.exists(json_path):
+        return 0
+    with open(json_path, encoding="utf-8") as f:
+        legacy: List[Dict[str, Any]] = json.load(f)
+    imported = 0
+    for record in legacy:
+        if record.get("url") and record["url"] in writer:
+            continue
+        writer.write(record)
+        imported += 1
+    writer.sync()
+    return imported
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "jobs_data.jsonl")
+        json_path = os.path.join(tmp, "jobs_data.json")
+
+        # Run 1 "crashes" in the middle of writing record 900
+        with JsonlWriter(log_path) as writer:
+            for i in range(899):
+                writer.write({"title": f"Job {i}", "url": f"https://example.vn/job/{i}"})
+        with open(log_path, "ab") as f:
+            f.write(b'{"title": "Job 899", "url": "https://exa')
+
+        # Run 2 resumes: torn line dropped, known URLs skipped
+        writer = JsonlWriter(log_path)
+        resumed = len(writer.urls)
+        skipped = 0
+        started = time.perf_counter()
+        for i in range(2_000):
+            url = f"https://example.vn/job/{i}"
+            if url in writer:
+                skipped += 1
+                continue
+            writer.write({"title": f"Job {i}", "url": url})
+        elapsed = time.perf_counter() - started
+        writer.write({"title": "Job 5 (updated)", "url": "https://example.vn/job/5"})
+        writer.close()
+
+        count = compact_jsonl(log_path, json_path)
+        with open(json_path, encoding="utf-8") as f:
+            compacted = json.load(f)
+
+        print("=" * 60)
+        print("📝 CRASH-SAFE JSONL WRITER")
+        print("=" * 60)
+        print(f"\nResumed with {resumed} records (torn line removed), skipped {skipped}")
+        print(f"Wrote {2_000 - skipped:,} records at {(2_000 - skipped) / elapsed:,.0f} records/s (batched fsync)")
+        print(f"Compacted to {count:,} records → {os.path.basename(json_path)}")
+        assert count == 2_000 and compacted[-1]["title"] == "Job 5 (updated)"
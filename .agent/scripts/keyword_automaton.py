@@ -0,0 +1,182 @@
+"""
+🔤 KEYWORD AUTOMATON (AHO–CORASICK)
+===================================
+Shared keyword counting for job_crawler.local_neuro_analyzer, job_rescorer
+and near_duplicates (normalization).
+
+Matching:
+- Keywords are normalized and compiled once from a {trait: [keywords]} dict
+- With the optional `pyahocorasick` C extension (requirements-optional.txt):
+  one Aho–Corasick pass over the text
+- Without it: one C-level `str.count` per pattern, i.e. O(keywords × text),
+  the same work as the original analyzer loop. Single-pass pure-Python
+  alternatives (automaton loop, one alternation regex) measured 2-3x slower
+  than that at the current keyword count, so they are not used
+- Per keyword, counts are non-overlapping left to right, exactly like
+  `str.count`, so scores do not change between backends
+- At ~30 keywords all backends run at about the same speed; the extension
+  only pays off for much larger keyword sets
+
+Normalization (applied to keywords and text alike):
+- Lowercasing (always)
+- fold: "kiểm thử" == "kiem thu", "đồ họa" == "do hoa"
+- collapse_whitespace: "nhập   liệu" / "nhập\\nliệu" == "nhập liệu"
+
+API:
+- KeywordAutomaton(keywords, ...).count(text) → {trait: hits}
+- count_many(texts) for batches
+"""
+
+from typing import Dict, List, Iterable
+import re
+import unicodedata
+
+try:
+    import ahocorasick  # Optional C implementation (pip install pyahocorasick)
+except ImportError:
+    ahocorasick = None
+
+# ============================================================================
+# NORMALIZATION
+# ============================================================================
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Letters NFD does not decompose
+EXTRA_FOLDS = str.maketrans({"đ": "d", "Đ": "d"})
+
+
+def fold_diacritics(text: str) -> str:
+    """Strip Vietnamese tone and vowel marks (NFD + drop combining characters)."""
+    decomposed = unicodedata.normalize("NFD", text.translate(EXTRA_FOLDS))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def normalize_text(text: str, fold: bool = False, collapse_whitespace: bool = False) -> str:
+    """Canonical form used for both keywords and documents."""
+    text = unicodedata.normalize("NFC", text).lower()
+    if fold:
+        text = fold_diacritics(text)
+    if collapse_whitespace:
+        text = WHITESPACE_PATTERN.sub(" ", text)
+    return text
+
+
+# ============================================================================
+# AUTOMATON
+# ============================================================================
+
+class KeywordAutomaton:
+    """Counts keyword hits per trait for a compiled keyword set."""
+
+    def __init__(
+        self,
+        keywords: Dict[str, List[str]],
+        fold: bool = False,
+        collapse_whitespace: bool = False,
+        use_extension: bool = True
+    ):
+        self.fold = fold
+        self.collapse_whitespace = collapse_whitespace
+        self.traits = list(keywords)
+
+        # Distinct normalized patterns; one pattern may belong to several traits
+        self.patterns: List[str] = []
+        self.pattern_traits: List[List[str]] = []
+        index_of: Dict[str, int] = {}
+        for trait, words in keywords.items():
+            for word in words:
+                pattern = normalize_text(word, fold, collapse_whitespace)
+                if not pattern:
+                    continue
+                if pattern not in index_of:
+                    index_of[pattern] = len(self.patterns)
+                    self.patterns.append(pattern)
+                    self.pattern_traits.append([])
+                self.pattern_traits[index_of[pattern]].append(trait)
+
+        self.backend = "pyahocorasick" if (use_extension and ahocorasick is not None) else "str.count"
+        if self.backend == "pyahocorasick":
+            self._automaton = ahocorasick.Automaton()
+            for i, pattern in enumerate(self.patterns):
+                self._automaton.add_word(pattern, (i, len(pattern)))
+            self._automaton.make_automaton()
+
+    # ---- Counting ----
+
+    def count_patterns(self, text: str) -> List[int]:
+        """Non-overlapping hit count per pattern (same semantics as str.count)."""
+        text = normalize_text(text, self.fold, self.collapse_whitespace)
+        if self.backend != "pyahocorasick":
+            return [text.count(pattern) for pattern in self.patterns]
+
+        counts = [0] * len(self.patterns)
+        next_free = [0] * len(self.patterns)
+        for end, (i, length) in self._automaton.iter(text):
+            start = end - length + 1
+            if start >= next_free[i]:
+                counts[i] += 1
+                next_free[i] = end + 1
+        return counts
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Keyword hits per trait."""
+        scores = {trait: 0 for trait in self.traits}
+        for i, hits in enumerate(self.count_patterns(text)):
+            if hits:
+                for trait in self.pattern_traits[i]:
+                    scores[trait] += hits
+        return scores
+
+    def count_many(self, texts: Iterable[str]) -> List[Dict[str, int]]:
+        """Batch version of count()."""
+        return [self.count(text) for text in texts]
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import json
+    import os
+    import time
+    from neuro_keywords import NEURO_KEYWORDS
+
+    def legacy_count(text: str) -> Dict[str, int]:
+        text_lower = text.lower()
+        return {
+            trait: sum(text_lower.count(keyword.lower()) for keyword in keywords)
+            for trait, keywords in NEURO_KEYWORDS.items()
+        }
+
+    jobs_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "jobs_data.json")
+    with open(jobs_file, encoding="utf-8") as f:
+        snippets = [job["description_snippet"] for job in json.load(f)]
+    # Stored snippets are short; concatenate into description-sized documents
+    corpus = [" ".join(snippets[i:] + snippets[:i]) * 3 for i in range(len(snippets))] * 400
+
+    print("=" * 60)
+    print("🔤 KEYWORD AUTOMATON")
+    print("=" * 60)
+    print(f"\nCorpus: {len(corpus):,} documents, {sum(map(len, corpus)) / len(corpus):,.0f} chars each")
+
+    started = time.perf_counter()
+    expected = [legacy_count(text) for text in corpus]
+    legacy_s = time.perf_counter() - started
+    print(f"   Legacy analyzer loop:      {len(corpus) / legacy_s:8,.0f} docs/s")
+
+    for use_extension in (False, True):
+        if use_extension and ahocorasick is None:
+            continue
+        automaton = KeywordAutomaton(NEURO_KEYWORDS, use_extension=use_extension)
+        started = time.perf_counter()
+        results = automaton.count_many(corpus)
+        elapsed = time.perf_counter() - started
+        assert results == expected
+        print(f"   Compiled ({automaton.backend:13}): {len(corpus) / elapsed:8,.0f} docs/s (identical counts)")
+
+    folded = KeywordAutomaton(NEURO_KEYWORDS, fold=True, collapse_whitespace=True)
+    sample = "Cần người KIEM THU phần mềm, soi  loi chi tiet,\nnhập\nliệu định kỳ"
+    print(f"\nExact:  {KeywordAutomaton(NEURO_KEYWORDS).count(sample)}")
+    print(f"Folded: {folded.count(sample)}")
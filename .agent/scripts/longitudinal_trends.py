@@ -0,0 +1,374 @@
+"""
+📈 LONGITUDINAL TREND & CHANGE-POINT ENGINE
+============================================
+Answers "is this child improving?" from the `cognitive_assessments` history.
+
+For every child × domain (visual, auditory, movement, logic):
+- Rolling OLS slope over the last `window` assessments (points / month)
+- Smoothed trajectory (time-aware exponential smoothing)
+- Single most likely change point (level shift beyond the linear trend)
+  with a significance test
+
+Performance:
+- A whole centre's caseload is packed into one NaN-padded
+  (children, assessments, 4) array; slopes and change points come from
+  cumulative sums along the time axis, so there is no per-child Python loop.
+
+Ethical Constraints:
+- Trend labels are descriptive, strength-based and in Vietnamese
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+from collections import defaultdict
+
+import numpy as np
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DOMAINS = ["visual", "auditory", "movement", "logic"]
+DAYS_PER_MONTH = 30.44
+
+# Slope (points / month on the 1-5 scale) below which a trend counts as stable
+STABLE_SLOPE = 0.05
+
+# |t| above which a level shift is reported as a change point (the best of
+# many candidate splits is tested, so this sits well above the usual 2)
+CHANGE_POINT_T = 4.0
+
+# Shorter histories leave too few degrees of freedom for a reliable split
+MIN_CHANGE_POINT_ASSESSMENTS = 6
+
+TREND_LABELS_VI = {
+    "improving": "Đang tiến bộ",
+    "stable": "Ổn định",
+    "declining": "Cần thêm hỗ trợ",
+    "insufficient": "Chưa đủ dữ liệu",
+}
+
+
+# ============================================================================
+# DATA MODELS
+# ============================================================================
+
+@dataclass
+class CaseloadHistory:
+    """Packed assessment history for many children."""
+    child_ids: List[str]
+    days: np.ndarray      # (children, T) days since the child's first assessment, NaN padded
+    scores: np.ndarray    # (children, T, 4) profile scores, NaN padded
+    counts: np.ndarray    # (children,) number of assessments
+    first_dates: List[datetime]
+
+
+@dataclass
+class DomainTrend:
+    """Trend summary for one child and one domain."""
+    domain: str
+    latest: float
+    smoothed_latest: float
+    rolling_slope_per_month: float
+    overall_slope_per_month: float
+    trend: str
+    trend_vi: str
+    change_point_date: Optional[str] = None
+    change_magnitude: float = 0.0
+
+
+# ============================================================================
+# PACKING
+# ============================================================================
+
+def _parse_date(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def _score(value: Any) -> float:
+    return np.nan if value is None else float(value)
+
+
+def build_history(rows: Sequence[Dict[str, Any]]) -> CaseloadHistory:
+    """
+    Pack `cognitive_assessments` rows into a CaseloadHistory.
+
+    Rows need user_id, session_completed_at and profile_<domain> columns.
+    All are nullable: NULL profile scores become NaN, and anonymous rows
+    (no user_id) and unfinished sessions (no completion date) are skipped.
+    """
+    per_child: Dict[str, List[Tuple[datetime, List[float]]]] = defaultdict(list)
+    for row in rows:
+        if row.get("user_id") is None or row.get("session_completed_at") is None:
+            continue
+        per_child[str(row["user_id"])].append((
+            _parse_date(row["session_completed_at"]),
+            [_score(row.get(f"profile_{d}")) for d in DOMAINS]
+        ))
+
+    child_ids = sorted(per_child)
+    width = max((len(v) for v in per_child.values()), default=1)
+    days = np.full((len(child_ids), width), np.nan)
+    scores = np.full((len(child_ids), width, len(DOMAINS)), np.nan)
+    counts = np.zeros(len(child_ids), dtype=np.int64)
+    first_dates = []
+
+    for i, child_id in enumerate(child_ids):
+        entries = sorted(per_child[child_id], key=lambda e: e[0])
+        start = entries[0][0]
+        first_dates.append(start)
+        counts[i] = len(entries)
+        days[i, :len(entries)] = [(date - start).total_seconds() / 86400 for date, _ in entries]
+        scores[i, :len(entries)] = [values for _, values in entries]
+
+    return CaseloadHistory(child_ids, days, scores, counts, first_dates)
+
+
+# ============================================================================
+# VECTORIZED ANALYSIS
+# ============================================================================
+
+def _windowed(cumulative: np.ndarray, window: int) -> np.ndarray:
+    """Sliding-window sums along axis 1 from a cumulative sum (zero-padded front)."""
+    padded = np.concatenate([np.zeros_like(cumulative[:, :1]), cumulative], axis=1)
+    shifted = np.concatenate(
+        [np.zeros_like(padded[:, :window]), padded[:, :-window]], axis=1
+    )[:, :padded.shape[1]]
+    return (padded - shifted)[:, 1:]
+
+
+def rolling_slopes(history: CaseloadHistory, window: int = 4) -> np.ndarray:
+    """
+    OLS slope (points / month) over the trailing `window` assessments.
+
+    Returns:
+        (children, T, 4) array; NaN where fewer than 2 points are available
+    """
+    t = (history.days / DAYS_PER_MONTH)[:, :, None]
+    valid = ~np.isnan(history.scores) & ~np.isnan(t)
+    t0 = np.where(valid, t, 0.0)
+    y0 = np.where(valid, history.scores, 0.0)
+
+    sums = {}
+    for name, values in (("n", valid.astype(np.float64)), ("t", t0), ("y", y0),
+                         ("tt", t0 * t0), ("ty", t0 * y0)):
+        sums[name] = _windowed(np.cumsum(values, axis=1), window)
+
+    n = sums["n"]
+    denominator = n * sums["tt"] - sums["t"] ** 2
+    numerator = n * sums["ty"] - sums["t"] * sums["y"]
+    slopes = np.divide(numerator, denominator, out=np.full_like(numerator, np.nan),
+                       where=(n >= 2) & (denominator > 1e-12))
+    return np.where(valid, slopes, np.nan)
+
+
+def smooth_trajectories(history: CaseloadHistory, half_life_days: float = 45.0) -> np.ndarray:
+    """
+    Time-aware exponential smoothing (irregular assessment spacing).
+
+    The loop runs over assessment index only; all children and domains are
+    updated together at each step.
+    """
+    smoothed = np.full_like(history.scores, np.nan)
+    level = np.full_like(history.scores[:, 0, :], np.nan)
+    last_day = np.full_like(level, np.nan)
+    for k in range(history.scores.shape[1]):
+        current = history.scores[:, k, :]
+        day = history.days[:, k][:, None]
+        present = ~np.isnan(current)
+        # Each child × domain is seeded from its first non-NULL score, and
+        # decays over the gap since its own last score
+        gap = np.nan_to_num(day - last_day, nan=0.0)
+        alpha = 1.0 - np.power(0.5, gap / half_life_days)
+        updated = np.where(np.isnan(level), current, level + alpha * (current - level))
+        level = np.where(present, updated, level)
+        last_day = np.where(present, day, last_day)
+        smoothed[:, k, :] = np.where(present, level, np.nan)
+    return smoothed
+
+
+def change_points(history: CaseloadHistory) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Best single level shift per child × domain, on top of the linear trend.
+
+    For every split k the model y = a + b·t + c·[j >= k] is fitted; by
+    Frisch–Waugh, c and its t-statistic only need reverse cumulative sums of
+    the detrended residuals, so all splits of all series are scored at once.
+
+    Returns:
+        (index, magnitude, t_stat) arrays of shape (children, 4); index is the
+        first assessment after the shift (-1 where nothing is significant) and
+        magnitude the shift beyond the trend line
+    """
+    y = history.scores
+    t = np.broadcast_to((history.days / DAYS_PER_MONTH)[:, :, None], y.shape)
+    valid = ~np.isnan(y)
+    n = valid.sum(axis=1, keepdims=True).astype(np.float64)
+    safe_n = np.maximum(n, 1)
+
+    # ---- Detrend: residuals around each series' own OLS line ----
+    dt = np.where(valid, t - np.where(valid, t, 0.0).sum(axis=1, keepdims=True) / safe_n, 0.0)
+    dy = np.where(valid, y - np.where(valid, y, 0.0).sum(axis=1, keepdims=True) / safe_n, 0.0)
+    var_t = (dt ** 2).sum(axis=1, keepdims=True)
+    slope = np.divide((dt * dy).sum(axis=1, keepdims=True), var_t,
+                      out=np.zeros_like(var_t), where=var_t > 1e-12)
+    residual = np.where(valid, dy - slope * dt, 0.0)
+
+    # ---- Step regressor residualized on [1, t], for every split k ----
+    def reverse_cumsum(values: np.ndarray) -> np.ndarray:
+        return np.flip(np.cumsum(np.flip(values, axis=1), axis=1), axis=1)[:, 1:, :]
+
+    right_n = reverse_cumsum(valid.astype(np.float64))
+    right_r = reverse_cumsum(residual)
+    right_dt = reverse_cumsum(dt)
+    step_ss = right_n - right_n ** 2 / safe_n - np.divide(
+        right_dt ** 2, var_t, out=np.zeros_like(right_dt), where=var_t > 1e-12
+    )
+
+    ok = (right_n >= 2) & (n - right_n >= 2) & (n >= MIN_CHANGE_POINT_ASSESSMENTS) & (step_ss > 1e-9)
+    safe_ss = np.where(ok, step_ss, 1.0)
+    shift = np.where(ok, right_r / safe_ss, 0.0)
+    sse = (residual ** 2).sum(axis=1, keepdims=True) - right_r ** 2 / safe_ss
+    sigma2 = np.maximum(sse / np.maximum(n - 3, 1), 1e-6)
+    t_stat = np.where(ok, np.abs(right_r) / np.sqrt(safe_ss * sigma2), 0.0)
+
+    if t_stat.shape[1] == 0:
+        empty = np.zeros((y.shape[0], y.shape[2]))
+        return np.full(empty.shape, -1), empty, empty
+
+    best = np.argmax(t_stat, axis=1)                                       # (C, 4)
+    best_t = np.take_along_axis(t_stat, best[:, None, :], axis=1)[:, 0, :]
+    best_shift = np.take_along_axis(shift, best[:, None, :], axis=1)[:, 0, :]
+    significant = best_t >= CHANGE_POINT_T
+    return np.where(significant, best + 1, -1), np.where(significant, best_shift, 0.0), best_t
+
+
+def analyze_caseload(
+    history: CaseloadHistory,
+    window: int = 4,
+    half_life_days: float = 45.0
+) -> Dict[str, np.ndarray]:
+    """
+    Run every trend statistic for the whole caseload in one batched call.
+
+    Returns:
+        Column dict of (children, 4) arrays: latest, smoothed_latest,
+        rolling_slope, overall_slope, change_index, change_magnitude, change_t
+    """
+    # Latest assessment with a score, per domain (NULL domain scores are NaN)
+    positions = np.arange(history.scores.shape[1])[None, :, None]
+    last = np.where(~np.isnan(history.scores), positions, 0).max(axis=1)[:, None, :]
+
+    def latest(values: np.ndarray) -> np.ndarray:
+        return np.take_along_axis(values, last, axis=1)[:, 0, :]
+
+    slopes = rolling_slopes(history, window)
+    overall = rolling_slopes(history, max(2, history.scores.shape[1]))
+    smoothed = smooth_trajectories(history, half_life_days)
+    change_index, change_magnitude, change_t = change_points(history)
+
+    return {
+        "latest": latest(history.scores),
+        "smoothed_latest": latest(smoothed),
+        "rolling_slope": latest(slopes),
+        "overall_slope": latest(overall),
+        "change_index": change_index,
+        "change_magnitude": change_magnitude,
+        "change_t": change_t,
+    }
+
+
+def _classify(slope: float) -> str:
+    if np.isnan(slope):
+        return "insufficient"
+    if slope >= STABLE_SLOPE:
+        return "improving"
+    if slope <= -STABLE_SLOPE:
+        return "declining"
+    return "stable"
+
+
+def summarize_child(history: CaseloadHistory, results: Dict[str, np.ndarray], child_id: str) -> List[DomainTrend]:
+    """Per-domain trend summary for one child from analyze_caseload() output."""
+    i = history.child_ids.index(child_id)
+    trends = []
+    for d, domain in enumerate(DOMAINS):
+        slope = float(results["rolling_slope"][i, d])
+        trend = _classify(slope)
+        change_index = int(results["change_index"][i, d])
+        change_date = None
+        if change_index >= 0:
+            offset = float(history.days[i, change_index])
+            change_date = (history.first_dates[i] + timedelta(days=offset)).date().isoformat()
+        trends.append(DomainTrend(
+            domain=domain,
+            latest=round(float(results["latest"][i, d]), 2),
+            smoothed_latest=round(float(results["smoothed_latest"][i, d]), 2),
+            rolling_slope_per_month=round(slope, 3) if not np.isnan(slope) else 0.0,
+            overall_slope_per_month=round(float(np.nan_to_num(results["overall_slope"][i, d])), 3),
+            trend=trend,
+            trend_vi=TREND_LABELS_VI[trend],
+            change_point_date=change_date,
+            change_magnitude=round(float(results["change_magnitude"][i, d]), 2)
+        ))
+    return trends
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(3)
+    rows = []
+    start = datetime(2025, 9, 1)
+    for child in range(5000):
+        n_sessions = int(rng.integers(3, 24))
+        jump_at = int(rng.integers(1, n_sessions))
+        date = start
+        for k in range(n_sessions):
+            date += timedelta(days=int(rng.integers(7, 35)))
+            base = np.array([3.0, 2.8, 3.2, 3.0]) + 0.04 * k
+            if child % 4 == 0 and k >= jump_at:
+                base[3] += 1.0  # Logic jumps (e.g. new support plan)
+            values = np.clip(base + rng.normal(0, 0.15, size=4), 1, 5)
+            rows.append({"user_id": f"child-{child}", "session_completed_at": date.isoformat(),
+                         **{f"profile_{d}": v for d, v in zip(DOMAINS, values)}})
+
+    # NULL columns as returned by the REST API: unfinished session, missing domain score
+    rows += [
+        {"user_id": "child-null", "session_completed_at": "2025-09-10", **{f"profile_{d}": 3.0 for d in DOMAINS}},
+        {"user_id": "child-null", "session_completed_at": None, **{f"profile_{d}": None for d in DOMAINS}},
+        {"user_id": "child-null", "session_completed_at": "2025-10-10",
+         **{f"profile_{d}": (None if d == DOMAINS[0] else 3.5) for d in DOMAINS}},
+        # First assessment lacks a domain score; later ones still smooth it
+        {"user_id": "child-late", "session_completed_at": "2025-09-10",
+         **{f"profile_{d}": (None if d == DOMAINS[0] else 3.0) for d in DOMAINS}},
+        {"user_id": "child-late", "session_completed_at": "2025-10-10", **{f"profile_{d}": 4.0 for d in DOMAINS}},
+        # Anonymous assessment: not a child of the caseload
+        {"user_id": None, "session_completed_at": "2025-10-10", **{f"profile_{d}": 2.0 for d in DOMAINS}},
+    ]
+
+    history = build_history(rows)
+    t0 = time.perf_counter()
+    results = analyze_caseload(history)
+    elapsed = time.perf_counter() - t0
+
+    print("=" * 60)
+    print("📈 LONGITUDINAL TRENDS")
+    print("=" * 60)
+    print(f"\nCaseload: {len(history.child_ids):,} children, {len(rows):,} assessments "
+          f"→ {elapsed * 1000:.0f}ms")
+    null_child = {trend.domain: trend.latest for trend in summarize_child(history, results, "child-null")}
+    assert null_child == {DOMAINS[0]: 3.0, **{d: 3.5 for d in DOMAINS[1:]}}, null_child
+    late_child = {trend.domain: trend.smoothed_latest for trend in summarize_child(history, results, "child-late")}
+    assert late_child[DOMAINS[0]] == 4.0 and all(3.0 < v < 4.0 for v in list(late_child.values())[1:]), late_child
+    assert "None" not in history.child_ids
+    for trend in summarize_child(history, results, "child-0"):
+        print(f"   {trend.domain:9} {trend.latest:4.2f}  {trend.rolling_slope_per_month:+.3f}/tháng  "
+              f"{trend.trend_vi}  change={trend.change_point_date} ({trend.change_magnitude:+.2f})")
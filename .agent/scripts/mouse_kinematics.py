@@ -0,0 +1,317 @@
+"""
+🖱️ MOUSE-PATH KINEMATICS ANALYZER
+==================================
+Derives movement metrics from the raw pointer samples stored in
+`game_sessions.telemetry` (key: "mouse_paths"):
+- Velocity, Acceleration, Jerk
+- Path Efficiency (straight-line distance / travelled distance)
+- Idle Ratio (share of session time spent (almost) still)
+
+Outputs:
+- KinematicsMetrics per session
+- interaction_intensity (0-100) for GameMetrics / calculate_profile()
+
+Performance:
+- All sessions of a batch are concatenated into one flat array and every
+  statistic is computed with a single vectorized pass (np.diff + bincount),
+  so there is no Python loop over samples.
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Sequence
+import time
+
+import numpy as np
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+# Browsers report pointer events with ~1ms resolution; repeated timestamps
+# are clamped to this step instead of producing infinite speeds.
+MIN_DT_MS = 1.0
+
+# Below this speed (px/s) the pointer is considered idle
+IDLE_SPEED_PX_S = 20.0
+
+# Speed that maps to the top of the intensity scale (px/s)
+REFERENCE_SPEED_PX_S = 1200.0
+
+METRIC_FIELDS = [
+    "sample_count",
+    "duration_ms",
+    "path_length_px",
+    "mean_speed_px_s",
+    "peak_speed_px_s",
+    "mean_abs_acceleration",
+    "mean_abs_jerk",
+    "path_efficiency",
+    "idle_ratio",
+    "interaction_intensity",
+]
+
+
+# ============================================================================
+# DATA MODELS
+# ============================================================================
+
+@dataclass
+class KinematicsMetrics:
+    """Movement metrics for one session's pointer path."""
+    sample_count: int = 0
+    duration_ms: float = 0.0
+    path_length_px: float = 0.0
+    mean_speed_px_s: float = 0.0
+    peak_speed_px_s: float = 0.0
+    mean_abs_acceleration: float = 0.0  # px/s²
+    mean_abs_jerk: float = 0.0          # px/s³
+    path_efficiency: float = 0.0        # 0-1 (1 = perfectly straight)
+    idle_ratio: float = 1.0             # 0-1 (1 = never moved)
+    interaction_intensity: float = 0.0  # 0-100, feeds GameMetrics
+
+    def to_dict(self) -> Dict[str, float]:
+        return {key: round(value, 4) if isinstance(value, float) else value
+                for key, value in asdict(self).items()}
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+def path_to_array(samples: Sequence[Any]) -> np.ndarray:
+    """
+    Convert pointer samples to an (n, 3) float array of [x, y, t_ms].
+
+    Accepts either dicts ({"x": .., "y": .., "t": ..}) or sequences
+    ([x, y, t]) as produced by the assessment games.
+    """
+    if len(samples) == 0:
+        return np.empty((0, 3), dtype=np.float64)
+    if isinstance(samples[0], dict):
+        return np.array(
+            [(s.get("x", 0), s.get("y", 0), s.get("t", s.get("timestamp", 0))) for s in samples],
+            dtype=np.float64
+        )
+    return np.asarray(samples, dtype=np.float64).reshape(-1, 3)
+
+
+def extract_mouse_path(telemetry: Any) -> np.ndarray:
+    """
+    Pull the pointer path out of a `game_sessions.telemetry` value.
+
+    The column is either a dict with a "mouse_paths" key or a legacy list
+    of events; strokes (a list of paths) are flattened in time order.
+    """
+    if isinstance(telemetry, dict):
+        paths = telemetry.get("mouse_paths") or []
+    else:
+        paths = [e for e in (telemetry or []) if isinstance(e, dict) and "x" in e and "y" in e]
+
+    if paths and isinstance(paths[0], list) and paths[0] and isinstance(paths[0][0], (list, dict)):
+        arrays = [path_to_array(stroke) for stroke in paths]
+        return np.concatenate(arrays) if arrays else path_to_array([])
+
+    return path_to_array(paths)
+
+
+# ============================================================================
+# BATCH KINEMATICS
+# ============================================================================
+
+def _segment_max(values: np.ndarray, seg_ids: np.ndarray, n_segments: int) -> np.ndarray:
+    """Per-segment maximum of a seg_id-sorted array (0 for empty segments)."""
+    out = np.zeros(n_segments, dtype=np.float64)
+    if values.size == 0:
+        return out
+    starts = np.flatnonzero(np.r_[True, seg_ids[1:] != seg_ids[:-1]])
+    out[seg_ids[starts]] = np.maximum.reduceat(values, starts)
+    return out
+
+
+def _safe_divide(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    return np.divide(num, den, out=np.zeros_like(num, dtype=np.float64), where=den > 0)
+
+
+def compute_kinematics_batch(
+    paths: Sequence[np.ndarray],
+    idle_speed_px_s: float = IDLE_SPEED_PX_S
+) -> Dict[str, np.ndarray]:
+    """
+    Compute kinematics for many sessions in one vectorized pass.
+
+    Args:
+        paths: One (n_i, 3) array of [x, y, t_ms] per session (see path_to_array)
+        idle_speed_px_s: Speed threshold below which time counts as idle
+
+    Returns:
+        Column dict keyed by METRIC_FIELDS, each an array of len(paths)
+    """
+    n_sessions = len(paths)
+    lengths = np.array([len(p) for p in paths], dtype=np.int64)
+    if n_sessions == 0 or lengths.sum() == 0:
+        empty = {key: np.zeros(n_sessions) for key in METRIC_FIELDS}
+        empty["sample_count"] = lengths
+        empty["idle_ratio"] = np.ones(n_sessions)
+        return empty
+
+    points = np.concatenate([p for p in paths if len(p)])
+    session_of_point = np.repeat(np.arange(n_sessions), lengths)
+
+    # ---- First differences (drop the ones that cross a session boundary) ----
+    same = session_of_point[1:] == session_of_point[:-1]
+    seg = session_of_point[1:][same]
+    delta = np.diff(points, axis=0)[same]
+    dt_ms = np.maximum(delta[:, 2], MIN_DT_MS)
+    dist = np.hypot(delta[:, 0], delta[:, 1])
+    speed = dist / dt_ms * 1000.0  # px/s
+
+    # ---- Higher derivatives (acceleration, jerk) ----
+    seg_pair = seg[1:] == seg[:-1]
+    dt_mid_s = (dt_ms[1:] + dt_ms[:-1]) / 2000.0
+    accel = np.diff(speed) / dt_mid_s
+    accel_seg = seg[1:][seg_pair]
+    accel_dt = dt_mid_s[seg_pair]
+    accel = accel[seg_pair]
+
+    jerk_pair = accel_seg[1:] == accel_seg[:-1]
+    jerk = (np.diff(accel) / ((accel_dt[1:] + accel_dt[:-1]) / 2))[jerk_pair]
+    jerk_seg = accel_seg[1:][jerk_pair]
+
+    # ---- Per-session aggregates ----
+    duration = np.bincount(seg, weights=dt_ms, minlength=n_sessions)
+    path_length = np.bincount(seg, weights=dist, minlength=n_sessions)
+    idle_time = np.bincount(seg, weights=dt_ms * (speed < idle_speed_px_s), minlength=n_sessions)
+
+    accel_count = np.bincount(accel_seg, minlength=n_sessions).astype(np.float64)
+    jerk_count = np.bincount(jerk_seg, minlength=n_sessions).astype(np.float64)
+    mean_abs_accel = _safe_divide(
+        np.bincount(accel_seg, weights=np.abs(accel), minlength=n_sessions), accel_count
+    )
+    mean_abs_jerk = _safe_divide(
+        np.bincount(jerk_seg, weights=np.abs(jerk), minlength=n_sessions), jerk_count
+    )
+
+    starts = np.cumsum(lengths) - lengths
+    has_points = lengths > 0
+    first = np.zeros((n_sessions, 3))
+    last = np.zeros((n_sessions, 3))
+    first[has_points] = points[starts[has_points]]
+    last[has_points] = points[(starts + lengths - 1)[has_points]]
+    displacement = np.hypot(last[:, 0] - first[:, 0], last[:, 1] - first[:, 1])
+
+    mean_speed = _safe_divide(path_length * 1000.0, duration)
+    path_efficiency = np.clip(_safe_divide(displacement, path_length), 0.0, 1.0)
+    idle_ratio = np.where(duration > 0, _safe_divide(idle_time, duration), 1.0)
+
+    return {
+        "sample_count": lengths,
+        "duration_ms": duration,
+        "path_length_px": path_length,
+        "mean_speed_px_s": mean_speed,
+        "peak_speed_px_s": _segment_max(speed, seg, n_sessions),
+        "mean_abs_acceleration": mean_abs_accel,
+        "mean_abs_jerk": mean_abs_jerk,
+        "path_efficiency": path_efficiency,
+        "idle_ratio": idle_ratio,
+        "interaction_intensity": interaction_intensity_from_columns(mean_speed, idle_ratio),
+    }
+
+
+def interaction_intensity_from_columns(
+    mean_speed_px_s: np.ndarray,
+    idle_ratio: np.ndarray
+) -> np.ndarray:
+    """
+    Map kinematics to the 0-100 `interaction_intensity` scale.
+
+    Weight: movement speed (60%), share of active time (40%)
+    """
+    speed_score = np.clip(mean_speed_px_s / REFERENCE_SPEED_PX_S, 0.0, 1.0) * 100
+    activity_score = (1.0 - np.clip(idle_ratio, 0.0, 1.0)) * 100
+    return speed_score * 0.6 + activity_score * 0.4
+
+
+def compute_kinematics(samples: Any, idle_speed_px_s: float = IDLE_SPEED_PX_S) -> KinematicsMetrics:
+    """Compute kinematics for a single session (samples or (n, 3) array)."""
+    path = samples if isinstance(samples, np.ndarray) else path_to_array(samples)
+    columns = compute_kinematics_batch([path], idle_speed_px_s=idle_speed_px_s)
+    return KinematicsMetrics(**{
+        key: int(columns[key][0]) if key == "sample_count" else float(columns[key][0])
+        for key in METRIC_FIELDS
+    })
+
+
+def batch_to_metrics(columns: Dict[str, np.ndarray]) -> List[KinematicsMetrics]:
+    """Convert batch columns to a list of KinematicsMetrics (one per session)."""
+    n = len(columns["sample_count"])
+    return [
+        KinematicsMetrics(**{
+            key: int(columns[key][i]) if key == "sample_count" else float(columns[key][i])
+            for key in METRIC_FIELDS
+        })
+        for i in range(n)
+    ]
+
+
+# ============================================================================
+# GROWTH ENGINE INTEGRATION
+# ============================================================================
+
+def enrich_game_data(game_data: Dict[str, Any], telemetry: Any) -> Dict[str, Any]:
+    """
+    Return a copy of game_data with `interaction_intensity` derived from
+    the session's mouse path. Leaves game_data untouched if there is no path.
+    """
+    path = extract_mouse_path(telemetry)
+    if len(path) < 2:
+        return dict(game_data)
+
+    metrics = compute_kinematics(path)
+    return {**game_data, "interaction_intensity": round(metrics.interaction_intensity, 2)}
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+def _synthetic_path(rng: np.random.Generator, n_samples: int) -> np.ndarray:
+    """Random-walk pointer path sampled at ~60Hz with occasional pauses."""
+    dt = rng.choice([16.0, 17.0, 250.0], size=n_samples, p=[0.48, 0.48, 0.04])
+    steps = rng.normal(0, 6, size=(n_samples, 2))
+    xy = np.cumsum(steps, axis=0) + 500
+    return np.column_stack([xy, np.cumsum(dt)])
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(42)
+
+    # Single session from a telemetry payload
+    telemetry = {
+        "mouse_paths": [
+            {"x": 100, "y": 100, "t": 0},
+            {"x": 110, "y": 104, "t": 16},
+            {"x": 125, "y": 110, "t": 33},
+            {"x": 125, "y": 110, "t": 300},
+            {"x": 160, "y": 130, "t": 316},
+        ]
+    }
+    metrics = compute_kinematics(extract_mouse_path(telemetry))
+
+    print("=" * 60)
+    print("🖱️ MOUSE KINEMATICS")
+    print("=" * 60)
+    for key, value in metrics.to_dict().items():
+        print(f"   - {key}: {value}")
+    print(f"\nEnriched game data: {enrich_game_data({'pattern_accuracy': 85}, telemetry)}")
+
+    # Batch benchmark
+    n_sessions, n_samples = 2000, 2000
+    paths = [_synthetic_path(rng, n_samples) for _ in range(n_sessions)]
+    start = time.perf_counter()
+    columns = compute_kinematics_batch(paths)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 60)
+    print(f"⏱️ Batch: {n_sessions} sessions x {n_samples} samples in {elapsed:.2f}s "
+          f"({n_sessions / elapsed:,.0f} sessions/s)")
+    print(f"   Mean intensity: {columns['interaction_intensity'].mean():.1f}")
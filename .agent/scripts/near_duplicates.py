@@ -0,0 +1,269 @@
+"""
+🧬 NEAR-DUPLICATE JOB POSTINGS (MINHASH + LSH)
+==============================================
+Clusters reposts of the same job ("Tester - Có Thể Đi Làm Sau Tết" vs
+"NV Kiểm Thử Phần Mềm Tester", new URL, a few words edited) so the database
+and the matching engines see each posting once.
+
+Fingerprint:
+- Text = title + company + description, normalized like keyword_automaton
+  (lowercase, diacritics folded, whitespace collapsed)
+- Shingles: overlapping word 3-grams
+- MinHash signature: NUM_PERM universal hashes (a·x + b mod 2^31−1), NumPy
+
+Index:
+- LSH banding: BANDS bands × ROWS rows; postings sharing any band bucket are
+  candidates (≈ (1/BANDS)^(1/ROWS) ≈ 0.7 Jaccard threshold by default)
+- Candidates are confirmed with the estimated Jaccard similarity
+- Clusters kept with union–find; the first posting seen is canonical
+- Cost per new posting: one signature + BANDS dict lookups, independent of
+  how many postings are indexed
+"""
+
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+import hashlib
+
+import numpy as np
+
+from keyword_automaton import normalize_text
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.7
+
+MERSENNE_PRIME = (1 << 31) - 1
+MAX_HASH = MERSENNE_PRIME
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    """Text fingerprinted for a crawled job record (jobs_data.json row)."""
+    description = job.get("description") or job.get("description_snippet", "")
+    return " ".join([job.get("title", ""), job.get("company", ""), description])
+
+
+# ============================================================================
+# MINHASH
+# ============================================================================
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    """Overlapping word n-grams of the normalized text."""
+    words = normalize_text(text, fold=True, collapse_whitespace=True).split()
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+class MinHasher:
+    """Fixed family of NUM_PERM hash functions (shared by every signature)."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature (uint64[num_perm]); all MAX_HASH for empty text."""
+        tokens = set(shingles(text))
+        if not tokens:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        values = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=4).digest(), "little")
+             for t in tokens),
+            dtype=np.uint64, count=len(tokens)
+        ) % np.uint64(MERSENNE_PRIME)
+        # Products stay below 2^62, so uint64 arithmetic does not overflow
+        hashed = (np.outer(self._a, values) + self._b[:, None]) % np.uint64(MERSENNE_PRIME)
+        return hashed.min(axis=1)
+
+
+def estimated_jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+# ============================================================================
+# LSH INDEX
+# ============================================================================
+
+class NearDuplicateIndex:
+    """Incremental MinHash-LSH index that clusters near-duplicate postings."""
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = NUM_PERM,
+        bands: int = BANDS
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._parent: Dict[str, str] = {}
+        self._seq: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    # ---- Queries ----
+
+    def query(self, text: str, signature: Optional[np.ndarray] = None) -> List[Tuple[str, float]]:
+        """Indexed postings similar to `text`, most similar first."""
+        signature = self.hasher.signature(text) if signature is None else signature
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        matches = []
+        for key in candidates:
+            similarity = estimated_jaccard(signature, self._signatures[key])
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        return sorted(matches, key=lambda match: -match[1])
+
+    def canonical(self, key: str) -> str:
+        """First-seen posting of the cluster `key` belongs to."""
+        root = key
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[key] != root:  # Path compression
+            self._parent[key], key = root, self._parent[key]
+        return root
+
+    # ---- Updates ----
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        """
+        Index a posting.
+
+        Returns:
+            Canonical key of the cluster it duplicates, or None if it is new
+        """
+        if key in self._signatures:
+            root = self.canonical(key)
+            return root if root != key else None
+
+        signature = self.hasher.signature(text)
+        matches = self.query(text, signature)
+
+        self._signatures[key] = signature
+        self._parent[key] = key
+        self._seq[key] = len(self._seq)
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+        if not matches:
+            return None
+        roots = {self.canonical(match) for match, _ in matches}
+        canonical = min(roots, key=self._seq.__getitem__)
+        for root in roots:
+            self._parent[root] = canonical
+        self._parent[key] = canonical
+        return canonical
+
+    def clusters(self, min_size: int = 2) -> List[List[str]]:
+        """Duplicate clusters (canonical key first)."""
+        groups: Dict[str, List[str]] = {}
+        for key in self._signatures:
+            groups.setdefault(self.canonical(key), []).append(key)
+        return [members for members in groups.values() if len(members) >= min_size]
+
+
+def deduplicate_jobs(
+    jobs: Iterable[Dict[str, Any]],
+    index: Optional[NearDuplicateIndex] = None
+) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], str]]]:
+    """
+    Split crawled jobs into unique postings and near-duplicates.
+
+    Returns:
+        (unique jobs, [(duplicate job, canonical url)])
+    """
+    index = index or NearDuplicateIndex()
+    unique, duplicates = [], []
+    for job in jobs:
+        canonical = index.add(job["url"], job_text(job))
+        if canonical is None:
+            unique.append(job)
+        else:
+            duplicates.append((job, canonical))
+    return unique, duplicates
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import json
+    import os
+    import random
+    import time
+
+    jobs_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "jobs_data.json")
+    with open(jobs_file, encoding="utf-8") as f:
+        crawled = json.load(f)
+
+    rng = random.Random(3)
+    vocabulary = sorted({word for job in crawled for word in job_text(job).split()})
+
+    def posting(i: int) -> Dict[str, Any]:
+        words = rng.choices(vocabulary, k=60)
+        return {"title": f"Job {i}", "company": f"Công ty {i % 500}",
+                "description": " ".join(words), "url": f"https://www.topcv.vn/viec-lam/job/{i}.html"}
+
+    def repost(job: Dict[str, Any], i: int) -> Dict[str, Any]:
+        words = job_text(job).split()
+        for _ in range(max(1, len(words) // 40)):  # edit ~2.5% of the words
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        return {"title": job["title"] + " - Đi Làm Ngay", "company": job["company"],
+                "description": " ".join(words), "url": job["url"] + f"?repost={i}"}
+
+    corpus = [posting(i) for i in range(20_000)]
+    originals = crawled + corpus[:200]
+    reposts = [repost(job, i) for i, job in enumerate(originals)]
+    stream = corpus + reposts
+
+    print("=" * 60)
+    print("🧬 NEAR-DUPLICATE JOB POSTINGS")
+    print("=" * 60)
+
+    index = NearDuplicateIndex()
+    for job in crawled:
+        index.add(job["url"], job_text(job))
+    started = time.perf_counter()
+    timings = []
+    for n, job in enumerate(stream, 1):
+        index.add(job["url"], job_text(job))
+        if n % 5_000 == 0:
+            timings.append((n, (time.perf_counter() - started) / n * 1e3))
+    elapsed = time.perf_counter() - started
+
+    print(f"\nIndexed {len(index):,} postings in {elapsed:.1f}s")
+    for n, ms in timings:
+        print(f"   after {n:6,}: {ms:.2f} ms/posting")
+
+    found = sum(index.canonical(job["url"]) == index.canonical(original["url"])
+                for job, original in zip(reposts, originals))
+    clusters = index.clusters()
+    false_merges = sum(len(members) > 2 for members in clusters)
+    print(f"Reposts clustered with their original: {found}/{len(originals)}")
+    print(f"Clusters: {len(clusters)} (larger than original + repost: {false_merges})")
+
+    unique, duplicates = deduplicate_jobs(crawled + [repost(crawled[0], 99)])
+    print(f"\njobs_data.json + 1 repost → {len(unique)} unique, {len(duplicates)} duplicate")
+    print(f"   '{duplicates[0][0]['title'][:50]}' → {duplicates[0][1][:70]}")
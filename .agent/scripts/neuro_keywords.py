@@ -0,0 +1,59 @@
+"""
+🏷️ NEURO KEYWORDS & TRAIT SCORING
+=================================
+Keyword lists and the tag / neuro_score formula shared by job_crawler
+(new postings) and job_rescorer (stored postings).
+
+Dependency-free on purpose: offline re-scoring imports it without pulling
+in the crawler's browser stack (playwright, bs4, caches, archive).
+
+Scoring:
+- No keyword hits: tag "General", neuro_score 50
+- Otherwise: primary tag = trait with most hits,
+  neuro_score = min(50 + 5 × total hits, 99)
+"""
+
+from typing import Dict, List, Any
+
+# ============================================================================
+# KEYWORDS
+# ============================================================================
+
+NEURO_KEYWORDS: Dict[str, List[str]] = {
+    "High_Focus": ["nhập liệu", "định kỳ", "lặp lại", "dữ liệu", "data entry", "kiên nhẫn"],
+    "Visual_Detail": ["soi lỗi", "chi tiết", "kiểm thử", "tester", "qa", "qc", "đồ họa", "pixel"],
+    "Logic_System": ["thuật toán", "backend", "logic", "hệ thống", "phân tích", "sql"],
+    "Low_Social": ["remote", "tại nhà", "ít giao tiếp", "chat support", "không nghe gọi", "độc lập"]
+}
+
+
+# ============================================================================
+# SCORING
+# ============================================================================
+
+def score_traits(scores: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Tags and neuro score from keyword hits per trait.
+    """
+    total_hits = sum(scores.values())
+
+    # Determine primary tag
+    if total_hits == 0:
+        primary_tag = "General"
+        neuro_score = 50 # Neutral
+    else:
+        primary_tag = max(scores, key=scores.get)
+        # Cap score at 99, base 50
+        neuro_score = min(50 + (total_hits * 5), 99)
+
+    # Get all tags with at least 1 hit
+    active_tags = [trait for trait, score in scores.items() if score > 0]
+    if not active_tags:
+        active_tags = ["General"]
+
+    return {
+        "tags": active_tags,
+        "primary_tag": primary_tag,
+        "neuro_score": neuro_score,
+        "keyword_hits": total_hits
+    }
@@ -0,0 +1,353 @@
+"""
+🏷️ OPPORTUNITY TAG BITMAP INDEX
+===============================
+In-memory filtering of opportunities by crawler tags and neuro_score without
+scanning the whole list.
+
+Structure:
+- One bitmap per tag (plain Python int, bit i = row i)
+- `neuro_score` kept as a sorted NumPy array (with parallel row ids) for
+  range filters; bitmaps are converted to/from row arrays with packbits
+- Live-row bitmap so NOT and deletions stay correct
+- Rows freed by remove() / re-upserts are reused (lowest first), so a
+  re-crawl that replaces postings does not grow the records or bitmaps
+
+Queries:
+- Tag expressions: "High_Focus AND (Visual_Detail OR NOT Low_Social)"
+- Score ranges: min_score / max_score (inclusive)
+
+Sources: jobs_data.json records ("tags") or `opportunities` rows ("neuro_traits").
+Updates are incremental: upsert() / remove() as the crawler adds postings.
+"""
+
+from typing import Dict, List, Any, Hashable, Iterable, Optional, Tuple
+import heapq
+import json
+import re
+
+import numpy as np
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+KNOWN_TAGS = ["High_Focus", "Visual_Detail", "Logic_System", "Low_Social", "General"]
+
+# Used when neuro_score is missing or NULL
+DEFAULT_NEURO_SCORE = 50.0
+
+TOKEN_PATTERN = re.compile(r"\(|\)|[A-Za-z_][A-Za-z0-9_]*")
+
+
+class QuerySyntaxError(ValueError):
+    """Raised for malformed tag expressions."""
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+class TagBitmapIndex:
+    """Tag bitmaps + sorted score array over opportunity records."""
+
+    def __init__(self, key_field: str = "url"):
+        self.key_field = key_field
+        self.records: List[Optional[Dict[str, Any]]] = []
+        self.row_of: Dict[Hashable, int] = {}
+        self.bitmaps: Dict[str, int] = {}
+        self.live = 0
+        self._free_rows: List[int] = []  # Min-heap of removed rows
+        self._score_values = np.empty(0, dtype=np.float64)
+        self._score_rows = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], key_field: str = "url") -> "TagBitmapIndex":
+        index = cls(key_field)
+        index.bulk_load(records)
+        return index
+
+    @classmethod
+    def from_jobs_file(cls, path: str = "jobs_data.json") -> "TagBitmapIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_records(json.load(f))
+
+    # ---- Updates ----
+
+    def bulk_load(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Append many postings at once (bitmaps built in one pass per tag).
+
+        Keys repeated within the batch keep only their last record, like a
+        sequence of upsert() calls would.
+        """
+        records = list(records)
+        last_of = {record.get(self.key_field): i for i, record in enumerate(records)}
+        rows_by_tag: Dict[str, List[int]] = {}
+        new_rows: List[int] = []
+        new_scores: List[float] = []
+        for i, record in enumerate(records):
+            key = record.get(self.key_field)
+            if key is not None and last_of[key] != i:
+                continue  # Superseded later in this batch
+            if key in self.row_of:
+                self.remove(key)
+            row = self._claim_row(record)
+            self.row_of[key if key is not None else ("__row__", row)] = row
+            for tag in self._tags_of(record):
+                rows_by_tag.setdefault(tag, []).append(row)
+            new_rows.append(row)
+            new_scores.append(self._score_of(record))
+
+        self.live |= _rows_to_bitmap(new_rows)
+        for tag, rows in rows_by_tag.items():
+            self.bitmaps[tag] = self.bitmaps.get(tag, 0) | _rows_to_bitmap(rows)
+
+        values = np.concatenate([self._score_values, new_scores])
+        rows = np.concatenate([self._score_rows, np.asarray(new_rows, dtype=np.int64)])
+        order = np.argsort(values, kind="stable")
+        self._score_values, self._score_rows = values[order], rows[order]
+
+    @staticmethod
+    def _tags_of(record: Dict[str, Any]) -> List[str]:
+        return list(record.get("neuro_traits") or record.get("tags") or ["General"])
+
+    @staticmethod
+    def _score_of(record: Dict[str, Any]) -> float:
+        score = record.get("neuro_score")
+        return DEFAULT_NEURO_SCORE if score is None else float(score)
+
+    def _claim_row(self, record: Dict[str, Any]) -> int:
+        """Store `record` in the lowest free row, or a new one."""
+        if self._free_rows:
+            row = heapq.heappop(self._free_rows)
+            self.records[row] = record
+        else:
+            row = len(self.records)
+            self.records.append(record)
+        return row
+
+    def upsert(self, record: Dict[str, Any]) -> int:
+        """Add a posting, or replace the one with the same key. Returns its row."""
+        key = record.get(self.key_field)
+        if key in self.row_of:
+            self.remove(key)
+
+        row = self._claim_row(record)
+        bit = 1 << row
+        if key is not None:
+            self.row_of[key] = row
+        else:
+            self.row_of[("__row__", row)] = row
+        self.live |= bit
+        for tag in self._tags_of(record):
+            self.bitmaps[tag] = self.bitmaps.get(tag, 0) | bit
+        score = self._score_of(record)
+        position = np.searchsorted(self._score_values, score, side="right")
+        self._score_values = np.insert(self._score_values, position, score)
+        self._score_rows = np.insert(self._score_rows, position, row)
+        return row
+
+    def remove(self, key: Hashable) -> bool:
+        """Drop a posting by key (its row is reused by the next insert)."""
+        row = self.row_of.pop(key, None)
+        if row is None:
+            return False
+        record = self.records[row]
+        mask = ~(1 << row)
+        self.live &= mask
+        for tag in self._tags_of(record):
+            self.bitmaps[tag] &= mask
+        position = np.flatnonzero(self._score_rows == row)
+        self._score_values = np.delete(self._score_values, position)
+        self._score_rows = np.delete(self._score_rows, position)
+        self.records[row] = None
+        heapq.heappush(self._free_rows, row)
+        return True
+
+    # ---- Bitmap primitives ----
+
+    def tag(self, name: str) -> int:
+        return self.bitmaps.get(name, 0)
+
+    def score_range(self, min_score: Optional[float] = None, max_score: Optional[float] = None) -> int:
+        """Bitmap of rows with min_score <= neuro_score <= max_score."""
+        lo = 0 if min_score is None else np.searchsorted(self._score_values, min_score, side="left")
+        hi = len(self._score_values) if max_score is None else np.searchsorted(self._score_values, max_score, side="right")
+        return _rows_to_bitmap(self._score_rows[lo:hi])
+
+    # ---- Queries ----
+
+    def evaluate(self, expression: str) -> int:
+        """Evaluate a tag expression (AND / OR / NOT / parentheses) to a bitmap."""
+        tokens = TOKEN_PATTERN.findall(expression)
+        if "".join(tokens) != re.sub(r"\s+", "", expression):
+            raise QuerySyntaxError(f"Unexpected characters in: {expression!r}")
+        bits, position = self._parse_or(tokens, 0)
+        if position != len(tokens):
+            raise QuerySyntaxError(f"Unexpected token {tokens[position]!r}")
+        return bits
+
+    def _parse_or(self, tokens: List[str], i: int) -> Tuple[int, int]:
+        bits, i = self._parse_and(tokens, i)
+        while i < len(tokens) and tokens[i].upper() == "OR":
+            rhs, i = self._parse_and(tokens, i + 1)
+            bits |= rhs
+        return bits, i
+
+    def _parse_and(self, tokens: List[str], i: int) -> Tuple[int, int]:
+        bits, i = self._parse_not(tokens, i)
+        while i < len(tokens) and tokens[i].upper() == "AND":
+            rhs, i = self._parse_not(tokens, i + 1)
+            bits &= rhs
+        return bits, i
+
+    def _parse_not(self, tokens: List[str], i: int) -> Tuple[int, int]:
+        if i >= len(tokens):
+            raise QuerySyntaxError("Expression ended early")
+        if tokens[i].upper() == "NOT":
+            bits, i = self._parse_not(tokens, i + 1)
+            return self.live & ~bits, i
+        if tokens[i] == "(":
+            bits, i = self._parse_or(tokens, i + 1)
+            if i >= len(tokens) or tokens[i] != ")":
+                raise QuerySyntaxError("Missing closing parenthesis")
+            return bits, i + 1
+        if tokens[i] == ")" or tokens[i].upper() in ("AND", "OR"):
+            raise QuerySyntaxError(f"Unexpected token {tokens[i]!r}")
+        return self.tag(tokens[i]), i + 1
+
+    def query(
+        self,
+        expression: Optional[str] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Filter postings.
+
+        Args:
+            expression: Tag expression; None means every live posting
+            min_score / max_score: Inclusive neuro_score bounds
+
+        Returns:
+            Matching records in row order (insertion order until rows are reused)
+        """
+        bits = self.live if expression is None else self.evaluate(expression)
+        if min_score is not None or max_score is not None:
+            bits &= self.score_range(min_score, max_score)
+        return [self.records[row] for row in iter_rows(bits).tolist()]
+
+    def count(self, expression: Optional[str] = None, **score_bounds: Any) -> int:
+        bits = self.live if expression is None else self.evaluate(expression)
+        if score_bounds:
+            bits &= self.score_range(**score_bounds)
+        return bin(bits).count("1")
+
+
+# ============================================================================
+# BIT HELPERS
+# ============================================================================
+
+def _rows_to_bitmap(rows: Any) -> int:
+    """Build an int bitmap from row numbers (vectorised; OR-ing big ints is O(n) each)."""
+    rows = np.asarray(rows, dtype=np.int64)
+    if not len(rows):
+        return 0
+    mask = np.zeros(int(rows.max()) + 1, dtype=bool)
+    mask[rows] = True
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+def iter_rows(bits: int) -> np.ndarray:
+    """Set bit positions in ascending order."""
+    data = np.frombuffer(bits.to_bytes((bits.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(data, bitorder="little"))
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import os
+    import random
+    import time
+
+    jobs_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "jobs_data.json")
+
+    print("=" * 60)
+    print("🏷️ OPPORTUNITY TAG BITMAP INDEX")
+    print("=" * 60)
+
+    if os.path.exists(jobs_file):
+        index = TagBitmapIndex.from_jobs_file(jobs_file)
+        print(f"\njobs_data.json: {len(index)} postings")
+        for title in (r["title"] for r in index.query("Visual_Detail AND NOT Low_Social", min_score=80)):
+            print(f"   - {title[:60]}")
+
+    random.seed(4)
+    postings = [{
+        "url": f"https://example.vn/job/{i}",
+        "tags": random.sample(KNOWN_TAGS[:4], random.randint(1, 3)),
+        "neuro_score": random.randint(50, 99),
+    } for i in range(200_000)]
+
+    started = time.perf_counter()
+    index = TagBitmapIndex.from_records(postings[:190_000])
+    print(f"\nBulk-loaded 190,000 postings in {time.perf_counter() - started:.2f}s")
+    started = time.perf_counter()
+    for posting in postings[190_000:]:  # crawler increments
+        index.upsert(posting)
+    index.upsert({**postings[0], "tags": ["General"], "neuro_score": 50})
+    per_upsert_ms = (time.perf_counter() - started) / 10_001 * 1000
+    print(f"Incremental upserts: {per_upsert_ms:.2f} ms each ({len(index):,} postings now)")
+
+    expression = "(High_Focus OR Logic_System) AND NOT Low_Social"
+    started = time.perf_counter()
+    for _ in range(20):
+        hits = index.query(expression, min_score=70, max_score=90)
+    indexed_ms = (time.perf_counter() - started) / 20 * 1000
+
+    current = [index.records[index.row_of[p["url"]]] for p in postings]
+    started = time.perf_counter()
+    for _ in range(5):
+        scanned = [
+            p for p in current
+            if ("High_Focus" in p["tags"] or "Logic_System" in p["tags"])
+            and "Low_Social" not in p["tags"] and 70 <= p["neuro_score"] <= 90
+        ]
+    scan_ms = (time.perf_counter() - started) / 5 * 1000
+
+    assert sorted(p["url"] for p in hits) == sorted(p["url"] for p in scanned)
+    print(f"   {expression}, score 70-90: {len(hits):,} hits")
+    print(f"   Bitmap: {indexed_ms:.1f} ms   List scan: {scan_ms:.1f} ms")
+    print(f"   Count only: {index.count(expression, min_score=70, max_score=90):,}")
+
+    # Duplicate keys inside one batch (new and already indexed tags): last record wins
+    batch = [
+        {"url": "dup-1", "tags": ["New_Tag"], "neuro_score": 60},
+        {"url": "dup-1", "tags": ["High_Focus"], "neuro_score": 70},
+        {"url": postings[1]["url"], "tags": ["High_Focus"], "neuro_score": 80},
+        {"url": postings[1]["url"], "tags": ["Low_Social"], "neuro_score": 85},
+    ]
+    small = TagBitmapIndex.from_records(batch)
+    assert len(small) == 2 and small.count("New_Tag") == 0 and small.count("High_Focus") == 1
+    before = index.count("High_Focus")
+    index.bulk_load(batch)
+    assert index.count("Low_Social AND NOT High_Focus", min_score=85, max_score=85) >= 1
+    assert index.count("High_Focus") == before + 1 - ("High_Focus" in postings[1]["tags"])
+    assert all(r is not None for r in index.query("High_Focus OR Low_Social OR New_Tag"))
+
+    # Re-crawl: replacing postings reuses their rows instead of growing the index
+    rows_before, bits_before = len(index.records), index.live.bit_length()
+    for posting in postings[:5_000]:
+        index.upsert({**posting, "neuro_score": None})  # NULL column → default score
+    index.bulk_load({**posting, "tags": ["General"]} for posting in postings[5_000:10_000])
+    index.remove(postings[10_000]["url"])
+    index.upsert({"url": "new-after-remove", "tags": ["General"]})
+    assert len(index.records) == rows_before and index.live.bit_length() == bits_before
+    assert index.count(min_score=DEFAULT_NEURO_SCORE, max_score=DEFAULT_NEURO_SCORE) >= 5_000
+    assert index.count() == len(index) == sum(r is not None for r in index.records)
@@ -0,0 +1,236 @@
+"""
+🎯 PROFILE ↔ OPPORTUNITY MATCHER
+================================
+Matches children (growth_engine.CognitiveProfile) with `opportunities` rows
+(neuro_traits / neuro_score from job_crawler.local_neuro_analyzer) at scale.
+
+Shared trait space (one axis per job_crawler.NEURO_KEYWORDS trait):
+- Opportunity: its neuro_traits tags, one-hot ("General" → uniform)
+- Profile: domain scores centred on 3 and projected through PROFILE_TO_TRAIT
+
+Engine:
+- Both sides stored as precomputed L2-normalised float32 matrices
+- Score = cosine similarity × opportunity strength (neuro_score / 100)
+- Top-k via batched matrix products + argpartition, in both directions:
+  opportunities per profile, profiles per (new) opportunity
+- match_all() streams every child's top-k for overnight jobs
+"""
+
+from typing import Dict, List, Any, Hashable, Iterator, Sequence, Tuple
+
+import numpy as np
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DOMAINS = ["visual", "auditory", "movement", "logic"]
+
+# Same order as job_crawler.NEURO_KEYWORDS
+TRAITS = ["High_Focus", "Visual_Detail", "Logic_System", "Low_Social"]
+
+# Weight of each (centred) domain score on each trait axis.
+# Rows: TRAITS, columns: DOMAINS
+PROFILE_TO_TRAIT = np.array([
+    # visual  auditory  movement  logic
+    [0.3,     0.0,     -0.4,      0.3],   # High_Focus: calm, structured attention
+    [0.8,     0.0,      0.0,      0.2],   # Visual_Detail
+    [0.2,     0.0,      0.0,      0.8],   # Logic_System
+    [0.2,    -0.5,      0.0,      0.3],   # Low_Social: prefers written / visual channels
+], dtype=np.float32)
+
+# Keeps every profile vector non-zero (neutral profiles match everything a little)
+TRAIT_FLOOR = 0.05
+
+DEFAULT_BATCH_SIZE = 1024
+
+
+# ============================================================================
+# VECTORISATION
+# ============================================================================
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def profiles_to_matrix(profiles: Sequence[Any]) -> np.ndarray:
+    """
+    Project profiles into the trait space.
+
+    Args:
+        profiles: CognitiveProfile objects or dicts with the four domains
+
+    Returns:
+        (n, len(TRAITS)) L2-normalised float32 matrix
+    """
+    scores = np.array([
+        [float((p if isinstance(p, dict) else p.to_dict())[d]) for d in DOMAINS]
+        for p in profiles
+    ], dtype=np.float32).reshape(-1, len(DOMAINS))
+    centred = (scores - 3.0) / 2.0
+    traits = np.maximum(centred @ PROFILE_TO_TRAIT.T, 0.0) + TRAIT_FLOOR
+    return _normalize_rows(traits)
+
+
+def opportunities_to_matrix(rows: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorise `opportunities` rows (or jobs_data.json records).
+
+    Returns:
+        (L2-normalised trait matrix, strength vector in [0, 1])
+    """
+    matrix = np.zeros((len(rows), len(TRAITS)), dtype=np.float32)
+    strength = np.empty(len(rows), dtype=np.float32)
+    for i, row in enumerate(rows):
+        tags = row.get("neuro_traits") or row.get("tags") or []
+        for tag in tags:
+            if tag in TRAITS:
+                matrix[i, TRAITS.index(tag)] = 1.0
+        if not matrix[i].any():
+            matrix[i] = 1.0  # "General"
+        strength[i] = float(row.get("neuro_score", 50)) / 100.0
+    return _normalize_rows(matrix), strength
+
+
+def _top_k_rows(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-row top-k (indices, scores), best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((len(scores), 0), dtype=np.int64), np.empty((len(scores), 0), dtype=scores.dtype)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+# ============================================================================
+# MATCHING ENGINE
+# ============================================================================
+
+class OpportunityMatcher:
+    """Holds both precomputed matrices and serves top-k in either direction."""
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.profile_ids: List[Hashable] = []
+        self.profile_matrix = np.empty((0, len(TRAITS)), dtype=np.float32)
+        self.opportunity_ids: List[Hashable] = []
+        self.opportunity_matrix = np.empty((0, len(TRAITS)), dtype=np.float32)
+        self.opportunity_strength = np.empty(0, dtype=np.float32)
+        self._weighted = self.opportunity_matrix
+
+    def set_profiles(self, ids: Sequence[Hashable], profiles: Sequence[Any]) -> None:
+        self.profile_ids = list(ids)
+        self.profile_matrix = profiles_to_matrix(profiles)
+
+    def set_opportunities(self, rows: Sequence[Dict[str, Any]], id_field: str = "id") -> None:
+        self.opportunity_ids = [row.get(id_field, row.get("url", i)) for i, row in enumerate(rows)]
+        self.opportunity_matrix, self.opportunity_strength = opportunities_to_matrix(rows)
+        # Strength folded into the matrix once so scoring is a single GEMM
+        self._weighted = self.opportunity_matrix * self.opportunity_strength[:, None]
+
+    # ---- Profile → opportunities ----
+
+    def top_opportunities(
+        self,
+        profiles: Sequence[Any],
+        k: int = 10
+    ) -> List[List[Tuple[Hashable, float]]]:
+        """Top-k opportunities for ad-hoc profiles (e.g. a freshly generated plan)."""
+        return self._rank(profiles_to_matrix(profiles), self._weighted, self.opportunity_ids, k)
+
+    def match_all(self, k: int = 10) -> Iterator[Tuple[Hashable, List[Tuple[Hashable, float]]]]:
+        """Stream (profile id, top-k opportunities) for every stored profile."""
+        for start in range(0, len(self.profile_ids), self.batch_size):
+            batch = self.profile_matrix[start:start + self.batch_size]
+            indices, scores = _top_k_rows(batch @ self._weighted.T, k)
+            for row, profile_id in enumerate(self.profile_ids[start:start + self.batch_size]):
+                yield profile_id, [
+                    (self.opportunity_ids[j], round(float(s), 4))
+                    for j, s in zip(indices[row], scores[row])
+                ]
+
+    # ---- Opportunity → profiles ----
+
+    def top_profiles(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        k: int = 50
+    ) -> List[List[Tuple[Hashable, float]]]:
+        """Top-k stored profiles for new opportunity rows (e.g. right after a crawl)."""
+        matrix, strength = opportunities_to_matrix(rows)
+        return self._rank(matrix * strength[:, None], self.profile_matrix, self.profile_ids, k)
+
+    def _rank(
+        self,
+        queries: np.ndarray,
+        targets: np.ndarray,
+        target_ids: Sequence[Hashable],
+        k: int
+    ) -> List[List[Tuple[Hashable, float]]]:
+        results = []
+        for start in range(0, len(queries), self.batch_size):
+            indices, scores = _top_k_rows(queries[start:start + self.batch_size] @ targets.T, k)
+            for row_indices, row_scores in zip(indices, scores):
+                results.append([
+                    (target_ids[j], round(float(s), 4)) for j, s in zip(row_indices, row_scores)
+                ])
+        return results
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import json
+    import os
+    import time
+
+    rng = np.random.default_rng(21)
+
+    jobs_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "jobs_data.json")
+    jobs: List[Dict[str, Any]] = []
+    if os.path.exists(jobs_file):
+        with open(jobs_file, encoding="utf-8") as f:
+            jobs = json.load(f)
+
+    print("=" * 60)
+    print("🎯 PROFILE ↔ OPPORTUNITY MATCHING")
+    print("=" * 60)
+
+    matcher = OpportunityMatcher()
+    if jobs:
+        matcher.set_opportunities(jobs, id_field="title")
+        matcher.set_profiles(["visual_child"], [{"visual": 4.8, "auditory": 2.0, "movement": 2.5, "logic": 3.5}])
+        print("\nTop opportunities from jobs_data.json for a strongly visual child:")
+        for title, score in next(matcher.match_all(k=3))[1]:
+            print(f"   {score:.3f}  {title[:50]}")
+
+    # Overnight scale: all children × all postings
+    n_children, n_postings = 100_000, 20_000
+    profiles = [dict(zip(DOMAINS, row)) for row in np.clip(rng.normal(3, 0.8, (n_children, 4)), 1, 5)]
+    postings = [{
+        "id": f"opp-{i}",
+        "neuro_traits": rng.choice(TRAITS, size=int(rng.integers(0, 4)), replace=False).tolist(),
+        "neuro_score": int(rng.integers(50, 100)),
+    } for i in range(n_postings)]
+
+    started = time.perf_counter()
+    matcher.set_profiles([f"child-{i}" for i in range(n_children)], profiles)
+    matcher.set_opportunities(postings)
+    prepared = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matched = sum(1 for _ in matcher.match_all(k=10))
+    elapsed = time.perf_counter() - started
+    print(f"\n{n_children:,} children × {n_postings:,} postings")
+    print(f"   Vectorise: {prepared:.2f}s   Top-10 for all children: {elapsed:.2f}s "
+          f"({matched / elapsed:,.0f} children/s)")
+
+    # Reverse direction and a brute-force spot check
+    best_children = matcher.top_profiles(postings[:1], k=5)[0]
+    full = matcher.profile_matrix @ matcher._weighted[0]
+    assert np.isclose(best_children[0][1], full.max(), atol=1e-4)
+    print(f"   Top children for {postings[0]['neuro_traits']}: {[c for c, _ in best_children]}")
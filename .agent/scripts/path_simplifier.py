@@ -0,0 +1,248 @@
+"""
+✂️ MOUSE-PATH SIMPLIFIER (INGEST STAGE)
+=======================================
+Shape- and timing-preserving downsampling of `telemetry["mouse_paths"]`
+before it is stored.
+
+Algorithm:
+- Single streaming pass over the samples (no full-path recursion like
+  classic Ramer–Douglas–Peucker, which needs the whole path in memory)
+- Error metric is the Synchronized Euclidean Distance (SED): a dropped sample
+  must lie within `tolerance_px` of where the kept segment places the pointer
+  *at the same timestamp*, so speeds and pauses survive, not just the shape
+- Samples where the pointer switches between idle and moving are always kept,
+  and a kept segment must have the same idle/moving state as the samples it
+  replaces, so the idle ratio derived downstream is not smeared across pauses
+- `max_gap_ms` / `max_window` force a key point so work per sample stays bounded
+
+Validation:
+- validate_simplification() compares mouse_kinematics metrics on the full and
+  simplified paths (interaction intensity, path efficiency)
+"""
+
+from typing import Dict, List, Any, Iterable, Iterator, Sequence, Tuple
+import math
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DEFAULT_TOLERANCE_PX = 2.0
+DEFAULT_MAX_GAP_MS = 1000.0
+DEFAULT_MAX_WINDOW = 64
+
+# Same threshold as mouse_kinematics.IDLE_SPEED_PX_S
+IDLE_SPEED_PX_S = 20.0
+
+# Acceptance thresholds used by validate_simplification()
+MAX_INTENSITY_DRIFT = 2.0      # points on the 0-100 scale
+MAX_EFFICIENCY_DRIFT = 0.02    # absolute, on the 0-1 scale
+
+Point = Tuple[float, float, float]  # (x, y, t_ms)
+
+
+# ============================================================================
+# STREAMING SIMPLIFIER
+# ============================================================================
+
+def _sed(anchor: Point, end: Point, point: Point) -> float:
+    """Distance between `point` and the time-interpolated position on anchor→end."""
+    span = end[2] - anchor[2]
+    ratio = (point[2] - anchor[2]) / span if span > 0 else 0.0
+    x = anchor[0] + (end[0] - anchor[0]) * ratio
+    y = anchor[1] + (end[1] - anchor[1]) * ratio
+    return math.hypot(point[0] - x, point[1] - y)
+
+
+def simplify_stream(
+    points: Iterable[Point],
+    tolerance_px: float = DEFAULT_TOLERANCE_PX,
+    max_gap_ms: float = DEFAULT_MAX_GAP_MS,
+    max_window: int = DEFAULT_MAX_WINDOW,
+    idle_speed_px_s: float = IDLE_SPEED_PX_S
+) -> Iterator[Point]:
+    """
+    Yield the key points of a pointer stream in one pass.
+
+    Args:
+        points: (x, y, t_ms) samples in time order
+        tolerance_px: Max SED of any dropped sample from the kept path
+        max_gap_ms: Never let a kept segment span more than this
+        max_window: Max samples dropped in a row (bounds per-sample work)
+        idle_speed_px_s: Speed separating idle from moving samples
+
+    Yields:
+        Kept (x, y, t_ms) samples, always including the first and last
+    """
+    anchor = None
+    last = None
+    last_idle = None
+    window: List[Point] = []
+
+    for point in points:
+        if anchor is None:
+            anchor = point
+            yield point
+            continue
+
+        if last is not None:
+            dt = point[2] - last[2]
+            step_speed = math.hypot(point[0] - last[0], point[1] - last[1]) / dt * 1000 if dt > 0 else 0.0
+            idle = step_speed < idle_speed_px_s
+            span = point[2] - anchor[2]
+            span_speed = math.hypot(point[0] - anchor[0], point[1] - anchor[1]) / span * 1000 if span > 0 else 0.0
+            candidate_ok = (
+                idle == last_idle and
+                (span_speed < idle_speed_px_s) == idle and
+                point[2] - anchor[2] <= max_gap_ms and
+                len(window) < max_window and
+                # `last` joins the window too, so check it against anchor→point as well
+                _sed(anchor, point, last) <= tolerance_px and
+                all(_sed(anchor, point, p) <= tolerance_px for p in window)
+            )
+            if not candidate_ok:
+                # `last` becomes a key point; anchor→last was verified for the window
+                yield last
+                anchor = last
+                window = []
+            else:
+                window.append(last)
+            last_idle = idle
+        last = point
+
+    if last is not None:
+        yield last
+
+
+def simplify_path(
+    samples: Sequence[Any],
+    tolerance_px: float = DEFAULT_TOLERANCE_PX,
+    max_gap_ms: float = DEFAULT_MAX_GAP_MS,
+    max_window: int = DEFAULT_MAX_WINDOW
+) -> List[Dict[str, float]]:
+    """Simplify telemetry point dicts ({"x", "y", "t"}) and return point dicts."""
+    stream = ((s.get("x", 0), s.get("y", 0), s["t"]) for s in samples)
+    return [
+        {"x": x, "y": y, "t": t}
+        for x, y, t in simplify_stream(stream, tolerance_px, max_gap_ms, max_window)
+    ]
+
+
+def simplify_telemetry(telemetry: Dict[str, Any], **options: Any) -> Dict[str, Any]:
+    """Return a copy of a telemetry dict with `mouse_paths` simplified."""
+    paths = telemetry.get("mouse_paths")
+    if not paths or not isinstance(paths[0], dict):
+        return dict(telemetry)
+    return {**telemetry, "mouse_paths": simplify_path(paths, **options)}
+
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+def max_dropped_sed(full: Sequence[Point], kept: Sequence[Point]) -> float:
+    """Worst SED of any dropped sample from the kept segment spanning it."""
+    worst = 0.0
+    segment = 0
+    kept_times = [p[2] for p in kept]
+    for point in full:
+        while segment + 2 < len(kept) and kept_times[segment + 1] <= point[2]:
+            segment += 1
+        if point in (kept[segment], kept[segment + 1]):
+            continue
+        worst = max(worst, _sed(kept[segment], kept[segment + 1], point))
+    return worst
+
+
+def validate_simplification(
+    paths: Sequence[Sequence[Point]],
+    tolerance_px: float = DEFAULT_TOLERANCE_PX,
+    max_gap_ms: float = DEFAULT_MAX_GAP_MS
+) -> Dict[str, Any]:
+    """
+    Check that derived kinematics survive simplification.
+
+    Args:
+        paths: Full-resolution sessions as sequences of (x, y, t_ms)
+
+    Returns:
+        Reduction ratio, worst metric drifts and a pass/fail flag
+    """
+    import numpy as np
+    from mouse_kinematics import compute_kinematics_batch
+
+    full = [np.asarray(p, dtype=np.float64).reshape(-1, 3) for p in paths]
+    reduced = [
+        np.asarray(list(simplify_stream(map(tuple, p), tolerance_px, max_gap_ms)),
+                   dtype=np.float64).reshape(-1, 3)
+        for p in full
+    ]
+
+    before = compute_kinematics_batch(full)
+    after = compute_kinematics_batch(reduced)
+
+    intensity_drift = float(np.max(np.abs(before["interaction_intensity"] - after["interaction_intensity"])))
+    efficiency_drift = float(np.max(np.abs(before["path_efficiency"] - after["path_efficiency"])))
+    kept = sum(len(p) for p in reduced)
+    total = sum(len(p) for p in full)
+
+    return {
+        "samples_before": total,
+        "samples_after": kept,
+        "reduction_ratio": total / max(1, kept),
+        "max_intensity_drift": intensity_drift,
+        "max_efficiency_drift": efficiency_drift,
+        "passed": intensity_drift <= MAX_INTENSITY_DRIFT and efficiency_drift <= MAX_EFFICIENCY_DRIFT,
+    }
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+def _synthetic_session(rng: Any, n_moves: int = 40) -> List[Point]:
+    """Ballistic moves between targets sampled at 60Hz with pauses (integer px like browsers)."""
+    points: List[Point] = []
+    x, y, t = 500.0, 400.0, 0.0
+    for _ in range(n_moves):
+        tx, ty = rng.uniform(0, 1000), rng.uniform(0, 800)
+        steps = int(rng.integers(20, 60))
+        for k in range(1, steps + 1):
+            # Minimum-jerk-like easing between start and target
+            s = k / steps
+            ease = 10 * s**3 - 15 * s**4 + 6 * s**5
+            t += 16.7
+            points.append((round(x + (tx - x) * ease + rng.normal(0, 0.5)),
+                           round(y + (ty - y) * ease + rng.normal(0, 0.5)), round(t)))
+        x, y = tx, ty
+        for _ in range(int(rng.integers(5, 30))):  # Hover: occasional 1px tremor
+            t += 16.7
+            points.append((round(x) + int(rng.random() < 0.1), round(y), round(t)))
+    return points
+
+
+if __name__ == "__main__":
+    import numpy as np
+
+    rng = np.random.default_rng(11)
+    sessions = [_synthetic_session(rng) for _ in range(200)]
+
+    print("=" * 60)
+    print("✂️ MOUSE-PATH SIMPLIFICATION")
+    print("=" * 60)
+    for tolerance in (1.0, 2.0, 4.0):
+        report = validate_simplification(sessions, tolerance_px=tolerance)
+        status = "✅" if report["passed"] else "❌"
+        print(f"\n{status} tolerance={tolerance}px: "
+              f"{report['samples_before']:,} → {report['samples_after']:,} samples "
+              f"({report['reduction_ratio']:.1f}x)")
+        print(f"   max intensity drift:  {report['max_intensity_drift']:.2f}")
+        print(f"   max efficiency drift: {report['max_efficiency_drift']:.4f}")
+
+        # Every dropped sample stays within the tolerance of the kept path
+        worst = max(max_dropped_sed(s, list(simplify_stream(s, tolerance))) for s in sessions)
+        print(f"   max dropped-sample SED: {worst:.2f}px")
+        assert worst <= tolerance, f"dropped sample {worst:.2f}px off (tolerance {tolerance}px)"
+
+    spike = [(0, 0, 0), (10, 0, 10), (20, 0, 20), (30, 40, 30), (40, 0, 40), (50, 0, 50)]
+    assert (30, 40, 30) in list(simplify_stream(spike, 2.0))
@@ -0,0 +1,335 @@
+"""
+🧭 PEER INDEX (NEAREST-NEIGHBOUR SEARCH OVER COGNITIVE PROFILES)
+================================================================
+Finds children with similar profiles so the dashboard can show
+"trẻ có hồ sơ tương tự đã tiến bộ với phương pháp X".
+
+Vector space:
+- The four CognitiveProfile domains (1-5)
+- Optionally the analyze_traits composite scores (0-100, rescaled to 1-5 so
+  every axis carries the same weight)
+
+Index:
+- KD-tree with bounding boxes per node and contiguous leaf buckets; leaves
+  are scanned with NumPy, nodes are visited best-first by box distance
+- k-NN and radius queries, single and batched
+- Incremental inserts go to an unindexed tail that is scanned brute force and
+  merged into the tree once it outgrows `rebuild_ratio` of the indexed part
+- Re-inserting an existing id replaces its vector (old row is tombstoned)
+"""
+
+from typing import Dict, List, Any, Hashable, Iterable, Optional, Sequence, Tuple
+from collections import Counter
+import heapq
+
+import numpy as np
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DOMAINS = ["visual", "auditory", "movement", "logic"]
+COMPOSITES = ["working_memory", "inhibition", "flexibility", "processing_speed"]
+
+DEFAULT_LEAF_SIZE = 32
+DEFAULT_REBUILD_RATIO = 0.25
+
+
+# ============================================================================
+# FEATURE VECTORS
+# ============================================================================
+
+def profile_vector(
+    profile: Any,
+    composite_scores: Optional[Dict[str, float]] = None
+) -> np.ndarray:
+    """
+    Build the search vector for one child.
+
+    Args:
+        profile: growth_engine.CognitiveProfile or a dict with the four domains
+        composite_scores: Optional `generate_trait_report()["composite_scores"]`
+
+    Returns:
+        4-d vector, or 8-d when composite scores are given
+    """
+    scores = profile if isinstance(profile, dict) else profile.to_dict()
+    vector = [float(scores[d]) for d in DOMAINS]
+    if composite_scores is not None:
+        vector += [1.0 + float(composite_scores.get(c, 50)) / 25.0 for c in COMPOSITES]
+    return np.asarray(vector, dtype=np.float64)
+
+
+# ============================================================================
+# KD-TREE
+# ============================================================================
+
+class PeerIndex:
+    """KD-tree over profile vectors with an incremental insert tail."""
+
+    def __init__(
+        self,
+        dim: int = len(DOMAINS),
+        leaf_size: int = DEFAULT_LEAF_SIZE,
+        rebuild_ratio: float = DEFAULT_REBUILD_RATIO
+    ):
+        self.dim = dim
+        self.leaf_size = leaf_size
+        self.rebuild_ratio = rebuild_ratio
+
+        self._points = np.empty((0, dim), dtype=np.float64)
+        self._ids: List[Hashable] = []
+        self._alive = np.empty(0, dtype=bool)
+        self._row_of: Dict[Hashable, int] = {}
+        self._indexed = 0  # rows [0, _indexed) are covered by the tree
+
+        # Flat node arrays (Python lists: scalar access is faster than NumPy)
+        self._lo: List[Tuple[float, ...]] = []
+        self._hi: List[Tuple[float, ...]] = []
+        self._children: List[Tuple[int, int]] = []
+        self._ranges: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    # ---- Building ----
+
+    def add(self, ids: Sequence[Hashable], vectors: Any) -> None:
+        """Insert (or replace) vectors; rebuilds the tree when the tail grows too big."""
+        vectors = np.asarray(vectors, dtype=np.float64).reshape(-1, self.dim)
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+
+        start = len(self._ids)
+        for offset, item_id in enumerate(ids):
+            if item_id in self._row_of:
+                self._alive[self._row_of[item_id]] = False
+            self._row_of[item_id] = start + offset
+        self._ids.extend(ids)
+        self._points = np.vstack([self._points, vectors])
+        self._alive = np.concatenate([self._alive, np.ones(len(ids), dtype=bool)])
+
+        if len(self._ids) - self._indexed > self.rebuild_ratio * max(self._indexed, self.leaf_size * 4):
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Drop tombstones and build the tree over every live row."""
+        keep = np.flatnonzero(self._alive)
+        self._points = self._points[keep]
+        self._ids = [self._ids[i] for i in keep]
+        self._alive = np.ones(len(keep), dtype=bool)
+
+        order = np.arange(len(keep))
+        self._lo, self._hi, self._children, self._ranges = [], [], [], []
+        if len(order):
+            self._build(order, 0, len(order))
+        self._points = self._points[order]
+        self._ids = [self._ids[i] for i in order]
+        self._row_of = {item_id: row for row, item_id in enumerate(self._ids)}
+        self._indexed = len(self._ids)
+
+    def _build(self, order: np.ndarray, start: int, end: int) -> int:
+        """Build the subtree over order[start:end] in place; returns its node id."""
+        points = self._points[order[start:end]]
+        node = len(self._ranges)
+        self._lo.append(tuple(points.min(axis=0)))
+        self._hi.append(tuple(points.max(axis=0)))
+        self._ranges.append((start, end))
+        self._children.append((-1, -1))
+
+        if end - start <= self.leaf_size:
+            return node
+
+        axis = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+        mid = (end - start) // 2
+        split = np.argpartition(points[:, axis], mid)
+        order[start:end] = order[start:end][split]
+
+        left = self._build(order, start, start + mid)
+        right = self._build(order, start + mid, end)
+        self._children[node] = (left, right)
+        return node
+
+    # ---- Queries ----
+
+    def _box_d2(self, node: int, q: Tuple[float, ...]) -> float:
+        total = 0.0
+        for value, lo, hi in zip(q, self._lo[node], self._hi[node]):
+            if value < lo:
+                total += (lo - value) ** 2
+            elif value > hi:
+                total += (value - hi) ** 2
+        return total
+
+    def _scan(self, start: int, end: int, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Squared distances for rows [start, end), tombstones set to +inf."""
+        d2 = ((self._points[start:end] - query) ** 2).sum(axis=1)
+        d2[~self._alive[start:end]] = np.inf
+        return np.arange(start, end), d2
+
+    def knn(self, query: Any, k: int = 10) -> List[Tuple[Hashable, float]]:
+        """k nearest neighbours as (id, euclidean distance), closest first."""
+        query = np.asarray(query, dtype=np.float64)
+        q = tuple(query.tolist())
+        best_rows, best_d2 = self._scan(self._indexed, len(self._ids), query)
+        best_rows, best_d2 = _top_k(best_rows, best_d2, k)
+
+        heap = [(self._box_d2(0, q), 0)] if self._ranges else []
+        while heap:
+            bound, node = heapq.heappop(heap)
+            if len(best_d2) == k and bound > best_d2.max():
+                break
+            left, right = self._children[node]
+            if left < 0:
+                rows, d2 = self._scan(*self._ranges[node], query)
+                best_rows, best_d2 = _top_k(np.concatenate([best_rows, rows]), np.concatenate([best_d2, d2]), k)
+            else:
+                heapq.heappush(heap, (self._box_d2(left, q), left))
+                heapq.heappush(heap, (self._box_d2(right, q), right))
+
+        order = np.argsort(best_d2, kind="stable")
+        return [(self._ids[best_rows[i]], float(np.sqrt(best_d2[i]))) for i in order if np.isfinite(best_d2[i])]
+
+    def radius(self, query: Any, r: float) -> List[Tuple[Hashable, float]]:
+        """All neighbours within distance r, closest first."""
+        query = np.asarray(query, dtype=np.float64)
+        q = tuple(query.tolist())
+        r2 = r * r
+        found_rows = []
+        found_d2 = []
+
+        rows, d2 = self._scan(self._indexed, len(self._ids), query)
+        found_rows.append(rows[d2 <= r2])
+        found_d2.append(d2[d2 <= r2])
+
+        stack = [0] if self._ranges else []
+        while stack:
+            node = stack.pop()
+            if self._box_d2(node, q) > r2:
+                continue
+            left, right = self._children[node]
+            if left < 0:
+                rows, d2 = self._scan(*self._ranges[node], query)
+                found_rows.append(rows[d2 <= r2])
+                found_d2.append(d2[d2 <= r2])
+            else:
+                stack.extend((left, right))
+
+        rows = np.concatenate(found_rows)
+        d2 = np.concatenate(found_d2)
+        order = np.argsort(d2, kind="stable")
+        return [(self._ids[rows[i]], float(np.sqrt(d2[i]))) for i in order]
+
+    def knn_batch(self, queries: Any, k: int = 10) -> List[List[Tuple[Hashable, float]]]:
+        """k-NN for every row of `queries`."""
+        return [self.knn(q, k) for q in np.asarray(queries, dtype=np.float64).reshape(-1, self.dim)]
+
+    def radius_batch(self, queries: Any, r: float) -> List[List[Tuple[Hashable, float]]]:
+        """Radius search for every row of `queries`."""
+        return [self.radius(q, r) for q in np.asarray(queries, dtype=np.float64).reshape(-1, self.dim)]
+
+
+def _top_k(rows: np.ndarray, d2: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    if len(d2) <= k:
+        return rows, d2
+    keep = np.argpartition(d2, k - 1)[:k]
+    return rows[keep], d2[keep]
+
+
+# ============================================================================
+# BRUTE FORCE (REFERENCE)
+# ============================================================================
+
+def brute_force_knn(
+    ids: Sequence[Hashable],
+    vectors: np.ndarray,
+    query: Any,
+    k: int = 10
+) -> List[Tuple[Hashable, float]]:
+    """Linear-scan k-NN used to validate and benchmark PeerIndex."""
+    d2 = ((vectors - np.asarray(query, dtype=np.float64)) ** 2).sum(axis=1)
+    rows, d2 = _top_k(np.arange(len(d2)), d2, k)
+    order = np.argsort(d2, kind="stable")
+    return [(ids[rows[i]], float(np.sqrt(d2[i]))) for i in order]
+
+
+# ============================================================================
+# PEER SUMMARY
+# ============================================================================
+
+def peer_strategies(
+    neighbours: Iterable[Tuple[Hashable, float]],
+    strategy_by_child: Dict[Hashable, str],
+    exclude: Optional[Hashable] = None
+) -> List[Tuple[str, int]]:
+    """
+    Count growth-plan strategies used by a child's peers.
+
+    Args:
+        neighbours: Output of PeerIndex.knn / radius
+        strategy_by_child: child id → primary strategy of their growth plan
+        exclude: The query child itself
+
+    Returns:
+        (strategy, peer count) pairs, most common first
+    """
+    counts = Counter(
+        strategy_by_child[child_id]
+        for child_id, _ in neighbours
+        if child_id != exclude and child_id in strategy_by_child
+    )
+    return counts.most_common()
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(3)
+    n_children = 100_000
+    ids = [f"child-{i}" for i in range(n_children)]
+    vectors = np.clip(rng.normal(3.0, 0.8, size=(n_children, len(DOMAINS))), 1, 5)
+
+    print("=" * 60)
+    print("🧭 PEER INDEX")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    index = PeerIndex()
+    index.add(ids[:90_000], vectors[:90_000])
+    index.rebuild()
+    for start in range(90_000, n_children, 1_000):  # incremental arrivals
+        index.add(ids[start:start + 1_000], vectors[start:start + 1_000])
+    print(f"\nIndexed {len(index):,} profiles in {time.perf_counter() - started:.2f}s "
+          f"({index._indexed:,} in tree, {len(index) - index._indexed:,} in tail)")
+
+    queries = np.clip(rng.normal(3.0, 0.8, size=(500, len(DOMAINS))), 1, 5)
+    for label, run in (
+        ("KD-tree", lambda: index.knn_batch(queries, k=10)),
+        ("Brute force", lambda: [brute_force_knn(ids, vectors, q, k=10) for q in queries]),
+    ):
+        started = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - started
+        print(f"   {label:12} k=10: {len(queries) / elapsed:8,.0f} queries/s")
+        if label == "KD-tree":
+            tree_result = result
+        else:
+            mismatches = sum(
+                [d for _, d in a] != [d for _, d in b] for a, b in zip(tree_result, result)
+            )
+            print(f"   Mismatches vs brute force: {mismatches}")
+
+    neighbours = index.radius(queries[0], 0.3)
+    assert sorted(c for c, _ in neighbours) == sorted(
+        ids[i] for i in np.flatnonzero(np.linalg.norm(vectors - queries[0], axis=1) <= 0.3)
+    )
+    print(f"   Radius 0.3 around query 0: {len(neighbours)} peers (matches brute force)")
+
+    strategies = {child_id: ["high_visual", "high_movement", "high_logic"][i % 3]
+                  for i, child_id in enumerate(ids)}
+    print(f"\nPeer strategies for child-7: "
+          f"{peer_strategies(index.knn(vectors[7], k=25), strategies, exclude='child-7')}")
@@ -0,0 +1,242 @@
+"""
+📍 PROXIMITY INDEX (PARTNERS & THERAPISTS)
+==========================================
+Distance-aware matching for families: "trung tâm phù hợp gần nhà".
+
+Index:
+- Uniform latitude/longitude grid (cell ≈ `cell_km`), bucket = list of rows
+- Radius query only visits the cells overlapping the search circle, then
+  filters candidates with a vectorised haversine distance
+- Incremental add / remove as partners or therapists update their location
+
+Coordinates:
+- Therapists: `profiles.latitude` / `profiles.longitude`
+  (set via TherapistLocationPicker)
+- Partners: `latitude` / `longitude` on the partner record when available
+
+Ranking (rank_nearby_partners):
+- Focus-area score from growth_engine (same 90 / 60 / 50 rules as match_partners)
+- Distance score decays linearly to 0 at the search radius
+- Radius grows (×2) up to `max_radius_km` until enough candidates are found
+"""
+
+from typing import Dict, List, Any, Hashable, Iterable, Optional, Tuple
+from collections import defaultdict
+import math
+
+import numpy as np
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180.0
+
+DEFAULT_CELL_KM = 2.0
+DEFAULT_RADIUS_KM = 5.0
+DEFAULT_MAX_RADIUS_KM = 40.0
+
+# Share of the combined score coming from distance (rest from focus match)
+DISTANCE_WEIGHT = 0.4
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distance from one point to many (km)."""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+# ============================================================================
+# GRID INDEX
+# ============================================================================
+
+class ProximityIndex:
+    """Lat/lon grid over records with coordinates."""
+
+    def __init__(self, cell_km: float = DEFAULT_CELL_KM):
+        self.cell_deg = cell_km / KM_PER_DEGREE_LAT
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self.records: List[Optional[Dict[str, Any]]] = []
+        self.row_of: Dict[Hashable, int] = {}
+        self._lats: List[float] = []
+        self._lons: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        # Longitude cells use the same degree size; the query widens them by 1/cos(lat)
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg))
+
+    def add(self, record: Dict[str, Any], key_field: str = "id") -> bool:
+        """Index a record; returns False if it has no coordinates."""
+        lat, lon = record.get("latitude"), record.get("longitude")
+        if lat is None or lon is None:
+            return False
+        key = record.get(key_field, len(self.records))
+        if key in self.row_of:
+            self.remove(key)
+
+        row = len(self.records)
+        self.records.append(record)
+        self._lats.append(float(lat))
+        self._lons.append(float(lon))
+        self.row_of[key] = row
+        self.cells[self._cell(float(lat), float(lon))].append(row)
+        return True
+
+    def add_many(self, records: Iterable[Dict[str, Any]], key_field: str = "id") -> int:
+        return sum(self.add(record, key_field) for record in records)
+
+    def remove(self, key: Hashable) -> bool:
+        row = self.row_of.pop(key, None)
+        if row is None:
+            return False
+        self.cells[self._cell(self._lats[row], self._lons[row])].remove(row)
+        self.records[row] = None
+        return True
+
+    def within(self, lat: float, lon: float, radius_km: float) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Records within `radius_km` of (lat, lon).
+
+        Returns:
+            (record, distance_km) pairs, nearest first
+        """
+        d_lat = radius_km / KM_PER_DEGREE_LAT
+        d_lon = d_lat / max(math.cos(math.radians(min(abs(lat) + d_lat, 89.0))), 1e-6)
+        lat_lo, lon_lo = self._cell(lat - d_lat, lon - d_lon)
+        lat_hi, lon_hi = self._cell(lat + d_lat, lon + d_lon)
+
+        candidates: List[int] = []
+        for i in range(lat_lo, lat_hi + 1):
+            for j in range(lon_lo, lon_hi + 1):
+                bucket = self.cells.get((i, j))
+                if bucket:
+                    candidates.extend(bucket)
+        if not candidates:
+            return []
+
+        rows = np.asarray(candidates, dtype=np.int64)
+        lats = np.fromiter((self._lats[r] for r in candidates), dtype=np.float64, count=len(candidates))
+        lons = np.fromiter((self._lons[r] for r in candidates), dtype=np.float64, count=len(candidates))
+        distances = haversine_km(lat, lon, lats, lons)
+        keep = distances <= radius_km
+        rows, distances = rows[keep], distances[keep]
+        order = np.argsort(distances, kind="stable")
+        return [(self.records[rows[i]], float(distances[i])) for i in order]
+
+
+# ============================================================================
+# COMBINED RANKING
+# ============================================================================
+
+def rank_nearby_partners(
+    profile: Any,
+    lat: float,
+    lon: float,
+    index: ProximityIndex,
+    radius_km: float = DEFAULT_RADIUS_KM,
+    max_radius_km: float = DEFAULT_MAX_RADIUS_KM,
+    min_candidates: int = 10,
+    limit: int = 20,
+    distance_weight: float = DISTANCE_WEIGHT
+) -> List[Dict[str, Any]]:
+    """
+    Rank partners by focus-area fit and travel distance.
+
+    Args:
+        profile: growth_engine.CognitiveProfile
+        lat / lon: Family location
+        index: ProximityIndex over partner records
+        radius_km: Initial search radius
+        max_radius_km: Radius is doubled up to this bound until
+                       `min_candidates` partners are found
+        limit: Number of results
+
+    Returns:
+        Partner records with match_score, focus_score, distance_km
+    """
+    from growth_engine import preferred_focus_areas, focus_match_score
+
+    preferred = preferred_focus_areas(profile)
+    radius = radius_km
+    nearby = index.within(lat, lon, radius)
+    while len(nearby) < min_candidates and radius < max_radius_km:
+        radius = min(radius * 2, max_radius_km)
+        nearby = index.within(lat, lon, radius)
+
+    ranked = []
+    for partner, distance in nearby:
+        focus_score = focus_match_score(partner.get("focus_area", ""), preferred)
+        distance_score = 100.0 * (1.0 - distance / radius) if radius > 0 else 100.0
+        ranked.append({
+            **partner,
+            "focus_score": focus_score,
+            "distance_km": round(distance, 2),
+            "match_score": round((1 - distance_weight) * focus_score + distance_weight * distance_score, 1),
+        })
+    ranked.sort(key=lambda p: (-p["match_score"], p["distance_km"]))
+    return ranked[:limit]
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import time
+    from growth_engine import CognitiveProfile, FOCUS_AREAS, match_partners
+
+    random.seed(6)
+    cities = [(21.0285, 105.8542), (10.7769, 106.7009), (16.0544, 108.2022), (20.8449, 106.6881)]
+    partners = []
+    for i in range(100_000):
+        city_lat, city_lon = random.choice(cities)
+        partners.append({
+            "id": f"partner-{i}",
+            "name": f"Đối tác {i}",
+            "focus_area": random.choice(FOCUS_AREAS),
+            "latitude": city_lat + random.gauss(0, 0.15),
+            "longitude": city_lon + random.gauss(0, 0.15),
+        })
+
+    print("=" * 60)
+    print("📍 PROXIMITY INDEX")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    index = ProximityIndex()
+    index.add_many(partners)
+    print(f"\nIndexed {len(index):,} partners in {time.perf_counter() - started:.2f}s")
+
+    profile = CognitiveProfile(visual=4.6, auditory=2.2, movement=3.0, logic=4.1)
+    families = [(lat + random.gauss(0, 0.1), lon + random.gauss(0, 0.1)) for lat, lon in random.choices(cities, k=200)]
+
+    started = time.perf_counter()
+    for lat, lon in families:
+        results = rank_nearby_partners(profile, lat, lon, index)
+    indexed_ms = (time.perf_counter() - started) / len(families) * 1000
+
+    # Baseline: score every partner (match_partners) and compute every distance
+    all_lats = np.array([p["latitude"] for p in partners])
+    all_lons = np.array([p["longitude"] for p in partners])
+    started = time.perf_counter()
+    for lat, lon in families[:10]:
+        scored = match_partners(profile, partners)
+        distances = haversine_km(lat, lon, all_lats, all_lons)
+    full_ms = (time.perf_counter() - started) / 10 * 1000
+
+    lat, lon = families[-1]
+    within = {p["id"] for p, _ in index.within(lat, lon, 5.0)}
+    assert within == {partners[i]["id"] for i in np.flatnonzero(haversine_km(lat, lon, all_lats, all_lons) <= 5.0)}
+
+    print(f"   Bounded-radius ranking: {indexed_ms:.2f} ms/query")
+    print(f"   Full scan (match_partners + all distances): {full_ms:.1f} ms/query")
+    print("\nTop 3 for the last family:")
+    for partner in results[:3]:
+        print(f"   {partner['match_score']:5.1f}  {partner['name']} ({partner['focus_area']}, {partner['distance_km']} km)")
@@ -0,0 +1,281 @@
+"""
+⏱️ REACTION-TIME DISTRIBUTION FITTER
+=====================================
+Fits per-session reaction-time (RT) distributions from raw trial times so the
+growth engine can tell a slow-but-steady child from an erratic one:
+- Robust quantile summary (median, IQR, MAD, robust CV)
+- Ex-Gaussian parameters (mu, sigma, tau) by the method of moments
+
+Outputs:
+- RTDistribution per session
+- attention_consistency (0-100) and reaction_avg_time_ms for calculate_profile()
+
+Performance:
+- Sessions are packed into one NaN-padded (n_sessions, max_trials) matrix and
+  every estimator runs column-wise over it, so a full backlog is one call.
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Sequence
+import time
+
+import numpy as np
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+# Trials outside this window are anticipations / lapses, not real responses
+MIN_RT_MS = 100.0
+MAX_RT_MS = 5000.0
+
+# Fewer valid trials than this gives unstable fits; neutral values are used
+MIN_TRIALS = 5
+
+# Per-event RT keys, in priority order (games disagree on the name)
+REACTION_TIME_KEYS = ("reaction_time_ms", "reaction_time")
+
+# Robust CV (IQR / median) at which consistency bottoms out at 0
+CV_CEILING = 0.6
+
+FIT_FIELDS = [
+    "n_trials",
+    "mean_ms",
+    "median_ms",
+    "iqr_ms",
+    "mad_ms",
+    "robust_cv",
+    "mu_ms",
+    "sigma_ms",
+    "tau_ms",
+    "attention_consistency",
+]
+
+
+# ============================================================================
+# DATA MODELS
+# ============================================================================
+
+@dataclass
+class RTDistribution:
+    """Reaction-time distribution summary for one session."""
+    n_trials: int = 0
+    mean_ms: float = 0.0
+    median_ms: float = 0.0
+    iqr_ms: float = 0.0
+    mad_ms: float = 0.0
+    robust_cv: float = 0.0
+    # Ex-Gaussian: Normal(mu, sigma) + Exponential(tau)
+    mu_ms: float = 0.0
+    sigma_ms: float = 0.0
+    tau_ms: float = 0.0                 # Slow "attention lapse" tail
+    attention_consistency: float = 50.0  # 0-100, feeds GameMetrics
+
+    def to_dict(self) -> Dict[str, float]:
+        return {key: round(value, 3) if isinstance(value, float) else value
+                for key, value in asdict(self).items()}
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+def event_reaction_time(event: Any) -> Optional[float]:
+    """
+    RT (ms) of one telemetry event, or None if it has none.
+
+    Newer games write `reaction_time_ms`; N-Back (time_warp_cargo) and
+    Stroop (command_override) write `reaction_time`.
+    """
+    if not isinstance(event, dict):
+        return None
+    for key in REACTION_TIME_KEYS:
+        if event.get(key) is not None:
+            return float(event[key])
+    return None
+
+
+def extract_reaction_times(telemetry: Any) -> np.ndarray:
+    """
+    Pull raw trial RTs (ms) out of a `game_sessions.telemetry` value.
+
+    Supports a dict with a "reaction_times" list, or the per-trial event
+    list written by the games (see event_reaction_time).
+    """
+    if isinstance(telemetry, dict):
+        values = telemetry.get("reaction_times") or []
+    else:
+        values = [rt for rt in map(event_reaction_time, telemetry or []) if rt is not None]
+    return np.asarray(values, dtype=np.float64)
+
+
+def _pack(sessions: Sequence[Sequence[float]]) -> np.ndarray:
+    """Pack ragged RT lists into a NaN-padded matrix, dropping out-of-range trials."""
+    lengths = [len(s) for s in sessions]
+    width = max(lengths, default=0)
+    matrix = np.full((len(sessions), max(width, 1)), np.nan)
+    for row, values in enumerate(sessions):
+        if len(values):
+            matrix[row, :len(values)] = values
+    matrix[(matrix < MIN_RT_MS) | (matrix > MAX_RT_MS)] = np.nan
+    return matrix
+
+
+# ============================================================================
+# BATCH FITTING
+# ============================================================================
+
+def _row_quantiles(sorted_matrix: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolated quantile per row of a NaN-last sorted matrix."""
+    position = np.maximum(counts - 1, 0) * q
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, np.maximum(counts - 1, 0))
+    rows = np.arange(sorted_matrix.shape[0])
+    low_val = sorted_matrix[rows, lower]
+    high_val = sorted_matrix[rows, upper]
+    return np.where(counts > 0, low_val + (high_val - low_val) * (position - lower), 0.0)
+
+
+def fit_rt_batch(sessions: Sequence[Sequence[float]]) -> Dict[str, np.ndarray]:
+    """
+    Fit RT distributions for many sessions at once.
+
+    Args:
+        sessions: One sequence of raw trial RTs (ms) per session
+
+    Returns:
+        Column dict keyed by FIT_FIELDS, each an array of len(sessions)
+    """
+    matrix = _pack(sessions)
+    valid = ~np.isnan(matrix)
+    counts = valid.sum(axis=1)
+    safe_counts = np.maximum(counts, 1)
+    values = np.where(valid, matrix, 0.0)
+
+    # ---- Moments ----
+    mean = values.sum(axis=1) / safe_counts
+    centered = np.where(valid, matrix - mean[:, None], 0.0)
+    variance = (centered ** 2).sum(axis=1) / np.maximum(counts - 1, 1)
+    std = np.sqrt(variance)
+    third = (centered ** 3).sum(axis=1) / safe_counts
+    skew = np.divide(third, std ** 3, out=np.zeros_like(third), where=std > 0)
+
+    # ---- Robust quantiles (NaN sorts last) ----
+    ordered = np.sort(matrix, axis=1)
+    median = _row_quantiles(ordered, counts, 0.5)
+    iqr = _row_quantiles(ordered, counts, 0.75) - _row_quantiles(ordered, counts, 0.25)
+    abs_dev = np.sort(np.abs(matrix - median[:, None]), axis=1)
+    mad = _row_quantiles(abs_dev, counts, 0.5)
+    robust_cv = np.divide(iqr, median, out=np.zeros_like(iqr), where=median > 0)
+
+    # ---- Ex-Gaussian (method of moments) ----
+    # tau = std * (skew / 2)^(1/3), clipped so sigma² stays non-negative
+    tau = std * np.cbrt(np.clip(skew, 0.0, 2.0) / 2.0)
+    tau = np.minimum(tau, std)
+    sigma = np.sqrt(np.maximum(variance - tau ** 2, 0.0))
+    mu = mean - tau
+
+    # ---- Consistency score ----
+    consistency = (1.0 - np.clip(robust_cv / CV_CEILING, 0.0, 1.0)) * 100
+    enough = counts >= MIN_TRIALS
+    consistency = np.where(enough, consistency, 50.0)
+
+    return {
+        "n_trials": counts,
+        "mean_ms": np.where(counts > 0, mean, 0.0),
+        "median_ms": median,
+        "iqr_ms": np.where(enough, iqr, 0.0),
+        "mad_ms": np.where(enough, mad, 0.0),
+        "robust_cv": np.where(enough, robust_cv, 0.0),
+        "mu_ms": np.where(enough, mu, 0.0),
+        "sigma_ms": np.where(enough, sigma, 0.0),
+        "tau_ms": np.where(enough, tau, 0.0),
+        "attention_consistency": consistency,
+    }
+
+
+def fit_rt_distribution(reaction_times: Sequence[float]) -> RTDistribution:
+    """Fit the RT distribution of a single session."""
+    columns = fit_rt_batch([reaction_times])
+    return RTDistribution(**{
+        key: int(columns[key][0]) if key == "n_trials" else float(columns[key][0])
+        for key in FIT_FIELDS
+    })
+
+
+def batch_to_distributions(columns: Dict[str, np.ndarray]) -> List[RTDistribution]:
+    """Convert batch columns to a list of RTDistribution (one per session)."""
+    return [
+        RTDistribution(**{
+            key: int(columns[key][i]) if key == "n_trials" else float(columns[key][i])
+            for key in FIT_FIELDS
+        })
+        for i in range(len(columns["n_trials"]))
+    ]
+
+
+# ============================================================================
+# GROWTH ENGINE INTEGRATION
+# ============================================================================
+
+def enrich_game_data(game_data: Dict[str, Any], telemetry: Any) -> Dict[str, Any]:
+    """
+    Return a copy of game_data with `attention_consistency` and
+    `reaction_avg_time_ms` derived from the raw trial RTs.
+    Leaves game_data untouched if there are too few valid trials.
+    """
+    fit = fit_rt_distribution(extract_reaction_times(telemetry))
+    if fit.n_trials < MIN_TRIALS:
+        return dict(game_data)
+
+    return {
+        **game_data,
+        "attention_consistency": round(fit.attention_consistency, 2),
+        "reaction_avg_time_ms": round(fit.mean_ms, 1),
+    }
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(7)
+
+    # Same average speed, very different consistency
+    steady = rng.normal(600, 40, size=40)
+    erratic = rng.normal(420, 60, size=40) + rng.exponential(180, size=40)
+
+    print("=" * 60)
+    print("⏱️ REACTION-TIME DISTRIBUTIONS")
+    print("=" * 60)
+    for label, trials in [("Steady", steady), ("Erratic", erratic)]:
+        fit = fit_rt_distribution(trials)
+        print(f"\n{label}: mean={fit.mean_ms:.0f}ms  mu={fit.mu_ms:.0f}  "
+              f"sigma={fit.sigma_ms:.0f}  tau={fit.tau_ms:.0f}  "
+              f"consistency={fit.attention_consistency:.1f}")
+
+    telemetry = [{"reaction_time_ms": float(rt), "is_correct": True} for rt in steady]
+    print(f"\nEnriched game data: {enrich_game_data({'pattern_accuracy': 85}, telemetry)}")
+
+    # N-Back / Stroop events use `reaction_time`; timeouts carry no RT
+    nback_telemetry = [{"type": "response", "reaction_time": int(rt), "is_correct": True} for rt in steady]
+    nback_telemetry.append({"type": "timeout", "is_correct": False})
+    assert len(extract_reaction_times(nback_telemetry)) == len(steady)
+    assert fit_rt_distribution(extract_reaction_times(nback_telemetry)).n_trials == len(steady)
+
+    # Batch benchmark
+    n_sessions = 100_000
+    trial_counts = rng.integers(20, 80, size=n_sessions)
+    backlog = [
+        rng.normal(450, 50, size=n) + rng.exponential(150, size=n)
+        for n in trial_counts
+    ]
+    start = time.perf_counter()
+    columns = fit_rt_batch(backlog)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 60)
+    print(f"⏱️ Batch: {n_sessions:,} sessions in {elapsed:.2f}s "
+          f"({n_sessions / elapsed:,.0f} sessions/s)")
+    print(f"   Mean tau: {columns['tau_ms'].mean():.0f}ms (true 150ms)")
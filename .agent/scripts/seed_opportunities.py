@@ -3,6 +3,7 @@ import os
 import asyncio
 import requests
 from dotenv import load_dotenv
+from near_duplicates import deduplicate_jobs
 
 # Load environment variables
 dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.env')
@@ -28,9 +29,14 @@ async def seed_opportunities():
             jobs = json.load(f)
         
         print(f"Loaded {len(jobs)} jobs from file.")
+
+        # Drop reposts of the same job (new URL / reworded title) before hitting the DB
+        jobs, near_duplicates = deduplicate_jobs(jobs)
+        for job, canonical_url in near_duplicates:
+            print(f"Skipping near-duplicate: {job['title']} (same as {canonical_url})")
         
         count = 0
-        skipped = 0
+        skipped = len(near_duplicates)
         
         for job in jobs:
             # Check duplicates via GET
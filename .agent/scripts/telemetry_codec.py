@@ -0,0 +1,391 @@
+"""
+📦 TELEMETRY CODEC
+===================
+Compact binary encoding for `game_sessions.telemetry` event streams.
+
+Format:
+- Timestamps: delta-encoded, zigzag varint (whole ms)
+- Coordinates: delta-encoded, zigzag varint (whole px)
+- Optional zlib / zstd frame around the payload
+- Stored as bytea or base64 text
+
+Streams (lossless: only integer data is delta-encoded):
+- Point streams (e.g. "mouse_paths"): [{"x", "y", "t"}, ...] where every
+  point has exactly those keys and integer values
+- Time streams (e.g. "click_times"): [t, ...] of integers
+- Anything else (floats, extra/missing keys, nested data) is kept as a JSON
+  section unchanged
+- A legacy top-level event list is flagged in the frame and decoded back
+  to a list
+
+Decoding:
+- decode_telemetry() rebuilds the full dict
+- iter_events() yields (stream, event) lazily without materializing arrays
+"""
+
+from typing import Dict, List, Any, Iterator, Iterable, Tuple, Union
+import base64
+import json
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+MAGIC = b"AT"
+VERSION = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+# High bit of the compression byte: payload is a legacy top-level list
+FLAG_LIST = 0x80
+
+COMPRESSION_CODES = {
+    None: COMPRESSION_NONE,
+    "none": COMPRESSION_NONE,
+    "zlib": COMPRESSION_ZLIB,
+    "zstd": COMPRESSION_ZSTD,
+}
+
+SECTION_POINTS = 1
+SECTION_TIMES = 2
+SECTION_JSON = 3
+
+# Decompressed bytes pulled per step by the streaming decoder
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+class TelemetryCodecError(ValueError):
+    """Raised when a telemetry blob is malformed or uses an unknown codec."""
+
+
+# ============================================================================
+# VARINT PRIMITIVES
+# ============================================================================
+
+def _zigzag(value: int) -> int:
+    # Arbitrary precision: deltas of int64 timestamps can exceed 64 bits
+    return value << 1 if value >= 0 else (~value << 1) | 1
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_svarint(out: bytearray, value: int) -> None:
+    _write_varint(out, _zigzag(value))
+
+
+def _write_str(out: bytearray, text: str) -> None:
+    raw = text.encode("utf-8")
+    _write_varint(out, len(raw))
+    out.extend(raw)
+
+
+# ============================================================================
+# ENCODER
+# ============================================================================
+
+POINT_KEYS = {"x", "y", "t"}
+
+
+def _is_int(value: Any) -> bool:
+    # Exact type: bools and integral floats (2.0) would not survive the round trip
+    return type(value) is int
+
+
+def _is_point_stream(values: Any) -> bool:
+    return (
+        isinstance(values, list) and len(values) > 0 and
+        all(isinstance(v, dict) and v.keys() == POINT_KEYS and
+            all(_is_int(c) for c in v.values()) for v in values)
+    )
+
+
+def _is_time_stream(values: Any) -> bool:
+    return isinstance(values, list) and len(values) > 0 and all(_is_int(v) for v in values)
+
+
+def _encode_points(out: bytearray, points: List[Dict[str, int]]) -> None:
+    _write_varint(out, len(points))
+    prev_x = prev_y = prev_t = 0
+    for point in points:
+        x, y, t = point["x"], point["y"], point["t"]
+        _write_svarint(out, t - prev_t)
+        _write_svarint(out, x - prev_x)
+        _write_svarint(out, y - prev_y)
+        prev_x, prev_y, prev_t = x, y, t
+
+
+def _encode_times(out: bytearray, times: List[int]) -> None:
+    _write_varint(out, len(times))
+    prev_t = 0
+    for t in times:
+        _write_svarint(out, t - prev_t)
+        prev_t = t
+
+
+def encode_payload(telemetry: Dict[str, Any]) -> bytes:
+    """Encode a telemetry dict to the uncompressed section payload."""
+    out = bytearray()
+    _write_varint(out, len(telemetry))
+    for name, values in telemetry.items():
+        if _is_point_stream(values):
+            out.append(SECTION_POINTS)
+            _write_str(out, name)
+            _encode_points(out, values)
+        elif _is_time_stream(values):
+            out.append(SECTION_TIMES)
+            _write_str(out, name)
+            _encode_times(out, values)
+        else:
+            out.append(SECTION_JSON)
+            _write_str(out, name)
+            _write_str(out, json.dumps(values, ensure_ascii=False, separators=(",", ":")))
+    return bytes(out)
+
+
+def encode_telemetry(
+    telemetry: Union[Dict[str, Any], List[Any]],
+    compression: str = "zlib",
+    as_base64: bool = False
+) -> Union[bytes, str]:
+    """
+    Encode telemetry to the compact binary form.
+
+    Args:
+        telemetry: Telemetry dict, or a legacy top-level event list
+        compression: "none", "zlib" or "zstd" (requires `zstandard`)
+        as_base64: Return base64 text instead of raw bytes (for JSON/text columns)
+
+    Returns:
+        Framed blob: MAGIC + version + compression code (| FLAG_LIST) + payload
+    """
+    if compression not in COMPRESSION_CODES:
+        raise TelemetryCodecError(f"Unknown compression: {compression}")
+
+    code = COMPRESSION_CODES[compression]
+    flags = 0
+    if isinstance(telemetry, list):
+        telemetry, flags = {"events": telemetry}, FLAG_LIST
+    payload = encode_payload(telemetry)
+
+    if code == COMPRESSION_ZLIB:
+        payload = zlib.compress(payload, 6)
+    elif code == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise TelemetryCodecError("zstd compression requires the 'zstandard' package")
+        payload = zstandard.ZstdCompressor(level=3).compress(payload)
+
+    blob = MAGIC + bytes([VERSION, code | flags]) + payload
+    return base64.b64encode(blob).decode("ascii") if as_base64 else blob
+
+
+# ============================================================================
+# STREAMING DECODER
+# ============================================================================
+
+def _to_bytes(blob: Union[bytes, bytearray, memoryview, str]) -> bytes:
+    """Accept raw bytes, base64 text or a Postgres bytea hex literal (\\x...)."""
+    if isinstance(blob, str):
+        if blob.startswith("\\x"):
+            return bytes.fromhex(blob[2:])
+        return base64.b64decode(blob)
+    return bytes(blob)
+
+
+def _payload_chunks(blob: bytes) -> Iterator[bytes]:
+    """Yield decompressed payload chunks without inflating the whole blob."""
+    if len(blob) < 4 or blob[:2] != MAGIC:
+        raise TelemetryCodecError("Not a telemetry blob (bad magic)")
+    if blob[2] != VERSION:
+        raise TelemetryCodecError(f"Unsupported telemetry codec version: {blob[2]}")
+
+    code, body = blob[3] & ~FLAG_LIST, memoryview(blob)[4:]
+    if code == COMPRESSION_NONE:
+        yield bytes(body)
+        return
+
+    if code == COMPRESSION_ZLIB:
+        decompressor = zlib.decompressobj()
+    elif code == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise TelemetryCodecError("zstd blob requires the 'zstandard' package")
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+    else:
+        raise TelemetryCodecError(f"Unknown compression code: {code}")
+
+    for offset in range(0, len(body), STREAM_CHUNK_SIZE):
+        chunk = decompressor.decompress(bytes(body[offset:offset + STREAM_CHUNK_SIZE]))
+        if chunk:
+            yield chunk
+    if code == COMPRESSION_ZLIB:
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+class _Reader:
+    """Pull-based byte reader over an iterator of chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer = self._buffer[self._pos:] + chunk
+                self._pos = 0
+                return True
+        return False
+
+    def read_byte(self) -> int:
+        if self._pos >= len(self._buffer) and not self._fill():
+            raise TelemetryCodecError("Unexpected end of telemetry blob")
+        value = self._buffer[self._pos]
+        self._pos += 1
+        return value
+
+    def read(self, size: int) -> bytes:
+        while len(self._buffer) - self._pos < size:
+            if not self._fill():
+                raise TelemetryCodecError("Unexpected end of telemetry blob")
+        value = self._buffer[self._pos:self._pos + size]
+        self._pos += size
+        return value
+
+    def read_varint(self) -> int:
+        shift = result = 0
+        while True:
+            byte = self.read_byte()
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def read_svarint(self) -> int:
+        return _unzigzag(self.read_varint())
+
+    def read_str(self) -> str:
+        return self.read(self.read_varint()).decode("utf-8")
+
+
+def _iter_sections(blob: Union[bytes, str]) -> Iterator[Tuple[int, str, Any]]:
+    """Lazily decode a telemetry blob into (section_kind, stream_name, event)."""
+    reader = _Reader(_payload_chunks(_to_bytes(blob)))
+    for _ in range(reader.read_varint()):
+        kind = reader.read_byte()
+        name = reader.read_str()
+
+        if kind == SECTION_POINTS:
+            x = y = t = 0
+            for _ in range(reader.read_varint()):
+                t += reader.read_svarint()
+                x += reader.read_svarint()
+                y += reader.read_svarint()
+                yield kind, name, {"x": x, "y": y, "t": t}
+        elif kind == SECTION_TIMES:
+            t = 0
+            for _ in range(reader.read_varint()):
+                t += reader.read_svarint()
+                yield kind, name, t
+        elif kind == SECTION_JSON:
+            yield kind, name, json.loads(reader.read_str())
+        else:
+            raise TelemetryCodecError(f"Unknown section type: {kind}")
+
+
+def iter_events(blob: Union[bytes, str]) -> Iterator[Tuple[str, Any]]:
+    """
+    Lazily decode a telemetry blob.
+
+    Yields:
+        (stream_name, event) pairs: point dicts for point streams, ints for
+        time streams, and the whole decoded value for JSON sections
+    """
+    for _, name, event in _iter_sections(blob):
+        yield name, event
+
+
+def decode_telemetry(blob: Union[bytes, str]) -> Union[Dict[str, Any], List[Any]]:
+    """Decode a telemetry blob back to the dict (or legacy list) it was encoded from."""
+    blob = _to_bytes(blob)
+    telemetry: Dict[str, Any] = {}
+    for kind, name, event in _iter_sections(blob):
+        if kind == SECTION_JSON:
+            telemetry[name] = event
+        else:
+            telemetry.setdefault(name, []).append(event)
+    if len(blob) > 3 and blob[3] & FLAG_LIST:
+        return telemetry.get("events", [])
+    return telemetry
+
+
+def compression_ratio(telemetry: Dict[str, Any], compression: str = "zlib") -> float:
+    """Size of the JSON form divided by the encoded size."""
+    json_size = len(json.dumps(telemetry, separators=(",", ":")).encode("utf-8"))
+    return json_size / max(1, len(encode_telemetry(telemetry, compression=compression)))
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+
+    random.seed(3)
+    t, x, y = 0, 400, 300
+    mouse_paths, click_times = [], []
+    for i in range(5000):
+        t += random.choice([16, 17])
+        x += random.randint(-8, 8)
+        y += random.randint(-8, 8)
+        mouse_paths.append({"x": x, "y": y, "t": t})
+        if i % 40 == 0:
+            click_times.append(t)
+
+    telemetry = {
+        "mouse_paths": mouse_paths,
+        "click_times": click_times,
+        "device": {"pointer": "mouse", "dpr": 2},
+    }
+
+    print("=" * 60)
+    print("📦 TELEMETRY CODEC")
+    print("=" * 60)
+
+    # Round trip (every compression mode available here)
+    modes = ["none", "zlib"] + (["zstd"] if zstandard else [])
+    for mode in modes:
+        blob = encode_telemetry(telemetry, compression=mode)
+        assert decode_telemetry(blob) == telemetry, f"round trip failed ({mode})"
+        assert decode_telemetry(encode_telemetry(telemetry, mode, as_base64=True)) == telemetry
+        print(f"   {mode:5} {len(blob):>8,} bytes  ratio {compression_ratio(telemetry, mode):5.1f}x")
+
+    # Edge cases (varint limits, legacy lists, irregular JSON): tests/test_telemetry_codec.py
+
+    json_size = len(json.dumps(telemetry, separators=(",", ":")))
+    print(f"\n   JSON  {json_size:>8,} bytes")
+    assert compression_ratio(telemetry, "zlib") > 5, "expected at least 5x over JSON"
+
+    # Streaming: first few events without decoding the rest
+    stream = iter_events(encode_telemetry(telemetry))
+    print(f"\n   First events: {[next(stream) for _ in range(3)]}")
+    print("\n✅ Round-trip and compression checks passed (edge cases: python -m pytest tests)")
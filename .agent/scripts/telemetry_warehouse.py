@@ -0,0 +1,332 @@
+"""
+🗄️ COLUMNAR TELEMETRY WAREHOUSE
+================================
+Exports `game_sessions` rows into partitioned, memory-mapped NumPy columns
+so cohort research queries only touch the data they need.
+
+Layout:
+    <root>/game_type=<type>/month=<YYYY-MM>/part-<n>/<column>.npy
+                                                    /_meta.json
+
+Columns:
+- Session fields (id, user_id, completed_at, final_score, ...)
+- advanced_metrics.*  → "am_<key>"
+- Telemetry-derived   → "kin_<metric>" (mouse_kinematics), "rt_<metric>"
+                        (reaction_time_fitting)
+
+Query API:
+- Partition pruning on game_type / month (predicate pushdown)
+- Column projection (only the requested .npy files are mapped)
+- Optional row predicate evaluated on the projected columns
+"""
+
+from typing import Dict, List, Any, Callable, Iterable, Optional, Sequence, Tuple
+from collections import defaultdict
+import json
+import os
+import re
+
+import numpy as np
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+META_FILE = "_meta.json"
+PARTITION_PATTERN = re.compile(r"^game_type=(?P<game_type>[^/]+)$")
+MONTH_PATTERN = re.compile(r"^month=(?P<month>\d{4}-\d{2}|unknown)$")
+
+# Nested or partition-key fields that are not copied as plain columns
+SKIPPED_FIELDS = {"telemetry", "advanced_metrics", "metrics", "game_type"}
+
+
+# ============================================================================
+# ROW FLATTENING
+# ============================================================================
+
+def _month_of(timestamp: Any) -> str:
+    """Partition key (YYYY-MM) from an ISO timestamp / datetime."""
+    if timestamp is None:
+        return "unknown"
+    return str(timestamp)[:7]
+
+
+def _derive_telemetry_columns(telemetry: Any) -> Dict[str, float]:
+    """Telemetry-derived columns; skipped quietly if the analyzers are unavailable."""
+    columns: Dict[str, float] = {}
+    try:
+        from mouse_kinematics import compute_kinematics, extract_mouse_path
+        from reaction_time_fitting import fit_rt_distribution, extract_reaction_times
+    except ImportError:
+        return columns
+
+    path = extract_mouse_path(telemetry)
+    if len(path) >= 2:
+        for key, value in compute_kinematics(path).to_dict().items():
+            columns[f"kin_{key}"] = float(value)
+
+    reaction_times = extract_reaction_times(telemetry)
+    if len(reaction_times):
+        for key, value in fit_rt_distribution(reaction_times).to_dict().items():
+            columns[f"rt_{key}"] = float(value)
+    return columns
+
+
+def flatten_session(row: Dict[str, Any], derive_telemetry: bool = True) -> Dict[str, Any]:
+    """Flatten one `game_sessions` row into scalar columns."""
+    flat: Dict[str, Any] = {}
+    for key, value in row.items():
+        if key in SKIPPED_FIELDS or isinstance(value, (dict, list)):
+            continue
+        flat[key] = value
+
+    for key, value in (row.get("advanced_metrics") or {}).items():
+        if isinstance(value, (int, float, str, bool)):
+            flat[f"am_{key}"] = value
+
+    if derive_telemetry and row.get("telemetry"):
+        flat.update(_derive_telemetry_columns(row["telemetry"]))
+    return flat
+
+
+def _to_column(values: List[Any]) -> np.ndarray:
+    """Build a typed column: float64 (NaN for missing) or fixed-width unicode."""
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, (int, float, bool)) for v in present):
+        return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+    return np.array(["" if v is None else str(v) for v in values], dtype=np.str_)
+
+
+# ============================================================================
+# EXPORTER
+# ============================================================================
+
+def export_sessions(
+    rows: Iterable[Dict[str, Any]],
+    root: str,
+    derive_telemetry: bool = True
+) -> Dict[Tuple[str, str], int]:
+    """
+    Write sessions into partitioned columnar files.
+
+    Each call appends a new part to every partition it touches, so exports
+    can run incrementally (e.g. nightly) without rewriting old months.
+
+    Args:
+        rows: `game_sessions` rows (dicts as returned by the REST API)
+        root: Warehouse directory
+        derive_telemetry: Compute kin_* / rt_* columns from raw telemetry
+
+    Returns:
+        Row count per (game_type, month) partition written
+    """
+    partitions: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        key = (str(row.get("game_type") or "unknown"), _month_of(row.get("completed_at")))
+        partitions[key].append(flatten_session(row, derive_telemetry))
+
+    written = {}
+    for (game_type, month), flat_rows in partitions.items():
+        partition_dir = os.path.join(root, f"game_type={game_type}", f"month={month}")
+        os.makedirs(partition_dir, exist_ok=True)
+        part_index = len([d for d in os.listdir(partition_dir) if d.startswith("part-")])
+        part_dir = os.path.join(partition_dir, f"part-{part_index:05d}")
+        os.makedirs(part_dir)
+
+        column_names = sorted({key for r in flat_rows for key in r})
+        dtypes = {}
+        for name in column_names:
+            column = _to_column([r.get(name) for r in flat_rows])
+            np.save(os.path.join(part_dir, f"{name}.npy"), column)
+            dtypes[name] = column.dtype.str
+
+        with open(os.path.join(part_dir, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"rows": len(flat_rows), "columns": dtypes}, f, indent=2)
+        written[(game_type, month)] = len(flat_rows)
+
+    return written
+
+
+# ============================================================================
+# QUERY API
+# ============================================================================
+
+class TelemetryWarehouse:
+    """Read-side view over an exported warehouse directory."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def partitions(
+        self,
+        game_types: Optional[Sequence[str]] = None,
+        month_from: Optional[str] = None,
+        month_to: Optional[str] = None
+    ) -> List[Tuple[str, str, str]]:
+        """
+        List (game_type, month, part_dir) entries that survive partition pruning.
+
+        Months are compared as "YYYY-MM" strings (inclusive bounds).
+        """
+        selected = []
+        if not os.path.isdir(self.root):
+            return selected
+
+        for type_dir in sorted(os.listdir(self.root)):
+            match = PARTITION_PATTERN.match(type_dir)
+            if not match or (game_types and match["game_type"] not in game_types):
+                continue
+            type_path = os.path.join(self.root, type_dir)
+            for month_dir in sorted(os.listdir(type_path)):
+                month_match = MONTH_PATTERN.match(month_dir)
+                if not month_match:
+                    continue
+                month = month_match["month"]
+                if (month_from and month < month_from) or (month_to and month > month_to):
+                    continue
+                month_path = os.path.join(type_path, month_dir)
+                for part in sorted(os.listdir(month_path)):
+                    if part.startswith("part-"):
+                        selected.append((match["game_type"], month, os.path.join(month_path, part)))
+        return selected
+
+    def scan(
+        self,
+        columns: Sequence[str],
+        game_types: Optional[Sequence[str]] = None,
+        month_from: Optional[str] = None,
+        month_to: Optional[str] = None,
+        where: Optional[Callable[[Dict[str, np.ndarray]], np.ndarray]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Read projected columns from the pruned partitions.
+
+        Args:
+            columns: Columns to load; "game_type" and "month" are virtual
+                     columns filled from the partition path
+            game_types / month_from / month_to: Partition predicates
+            where: Optional row filter; receives the projected columns of one
+                   part and returns a boolean mask
+
+        Returns:
+            Column dict with all matching rows concatenated; string columns
+            missing from some parts come back as object arrays with None there
+        """
+        chunks: Dict[str, List[np.ndarray]] = {name: [] for name in columns}
+
+        metas = []
+        for game_type, month, part_dir in self.partitions(game_types, month_from, month_to):
+            with open(os.path.join(part_dir, META_FILE), encoding="utf-8") as f:
+                metas.append((game_type, month, part_dir, json.load(f)))
+        # A column missing from a part is filled with None if it holds strings
+        # anywhere else (NaN would turn into the literal 'nan'), NaN otherwise
+        string_columns = {
+            name for *_, meta in metas for name, dtype in meta["columns"].items()
+            if np.dtype(dtype).kind == "U"
+        }
+
+        for game_type, month, part_dir, meta in metas:
+            n_rows = meta["rows"]
+
+            part: Dict[str, np.ndarray] = {}
+            for name in columns:
+                if name == "game_type":
+                    part[name] = np.full(n_rows, game_type)
+                elif name == "month":
+                    part[name] = np.full(n_rows, month)
+                elif name in meta["columns"]:
+                    part[name] = np.load(os.path.join(part_dir, f"{name}.npy"), mmap_mode="r")
+                elif name in string_columns:
+                    part[name] = np.full(n_rows, None, dtype=object)
+                else:
+                    part[name] = np.full(n_rows, np.nan)
+
+            if where is not None:
+                mask = np.asarray(where(part), dtype=bool)
+                part = {name: values[mask] for name, values in part.items()}
+
+            for name in columns:
+                chunks[name].append(np.asarray(part[name]))
+
+        return {
+            name: np.concatenate(parts) if parts else np.empty(0)
+            for name, parts in chunks.items()
+        }
+
+    def group_mean(
+        self,
+        value: str,
+        by: Sequence[str],
+        **scan_options: Any
+    ) -> Dict[Tuple[Any, ...], float]:
+        """Mean of `value` grouped by the `by` columns (NaNs and missing keys ignored)."""
+        data = self.scan(list(by) + [value], **scan_options)
+        values = data[value].astype(np.float64)
+        keep = ~np.isnan(values)
+        for name in by:
+            if data[name].dtype == object:
+                keep &= np.array([v is not None for v in data[name]], dtype=bool)
+        if not keep.any():
+            return {}
+
+        keys = np.rec.fromarrays([
+            data[name][keep].astype(str) if data[name].dtype == object else data[name][keep]
+            for name in by
+        ])
+        unique, inverse = np.unique(keys, return_inverse=True)
+        sums = np.bincount(inverse, weights=values[keep])
+        counts = np.bincount(inverse)
+        return {tuple(u): float(s / c) for u, s, c in zip(unique.tolist(), sums, counts)}
+
+
+# ============================================================================
+# EXAMPLE USAGE
+# ============================================================================
+
+if __name__ == "__main__":
+    import tempfile
+
+    rng = np.random.default_rng(5)
+    game_types = ["stroop", "nback", "detail_spotter"]
+    rows = []
+    for i in range(3000):
+        game_type = game_types[i % 3]
+        rt_key = "reaction_time_ms" if game_type == "detail_spotter" else "reaction_time"
+        rows.append({
+            "id": f"session-{i}",
+            "user_id": f"user-{i % 200}",
+            "game_type": game_type,
+            "completed_at": f"2026-0{1 + i % 4}-15T10:00:00Z",
+            "final_score": int(rng.integers(0, 100)),
+            "avg_reaction_time_ms": float(rng.normal(600, 80)),
+            "age_band": ["10-12", "13-14", "15-16"][i % 200 % 3],
+            "advanced_metrics": {"stroop_effect": float(rng.normal(50, 15)), "scan_efficiency": float(rng.random())},
+            # N-Back / Stroop write `reaction_time`, newer games `reaction_time_ms`
+            "telemetry": [{rt_key: float(rt), "is_correct": True}
+                          for rt in rng.normal(600, 80, size=20)],
+        })
+
+    with tempfile.TemporaryDirectory() as root:
+        written = export_sessions(rows, root)
+        print("=" * 60)
+        print("🗄️ TELEMETRY WAREHOUSE")
+        print("=" * 60)
+        print(f"\nPartitions written: {len(written)} ({sum(written.values())} rows)")
+
+        warehouse = TelemetryWarehouse(root)
+        stroop = warehouse.partitions(game_types=["stroop"], month_from="2026-02", month_to="2026-03")
+        print(f"Pruned to {len(stroop)} of {len(warehouse.partitions())} parts for Stroop Feb-Mar")
+
+        print("\nMean Stroop RT by age band per month:")
+        cohort = warehouse.group_mean(
+            "rt_mean_ms", by=["age_band", "month"], game_types=["stroop"]
+        )
+        for (age_band, month), mean_rt in sorted(cohort.items()):
+            print(f"   {month}  {age_band:6}  {mean_rt:6.1f} ms")
+        assert len(cohort) == 12 and all(500 < mean_rt < 700 for mean_rt in cohort.values()), cohort
+
+        # A later export without the age_band column: no bogus 'nan' group
+        export_sessions([{k: v for k, v in row.items() if k != "age_band"}
+                         for row in rows[:30]], root, derive_telemetry=False)
+        by_band = warehouse.group_mean("final_score", by=["age_band"], game_types=["stroop"])
+        assert set(by_band) == {("10-12",), ("13-14",), ("15-16",)}, by_band
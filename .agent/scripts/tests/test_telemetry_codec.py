@@ -0,0 +1,217 @@
+"""
+Round-trip tests for telemetry_codec.
+
+Run from .agent/scripts: python -m pytest tests
+"""
+
+import base64
+import json
+import random
+
+import pytest
+
+from telemetry_codec import (
+    FLAG_LIST,
+    MAGIC,
+    SECTION_JSON,
+    SECTION_POINTS,
+    SECTION_TIMES,
+    TelemetryCodecError,
+    _Reader,
+    _unzigzag,
+    _write_svarint,
+    _write_varint,
+    _zigzag,
+    compression_ratio,
+    decode_telemetry,
+    encode_payload,
+    encode_telemetry,
+    iter_events,
+    zstandard,
+)
+
+MODES = ["none", "zlib"] + (["zstd"] if zstandard else [])
+
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+EDGE_INTS = [0, 1, -1, 63, -64, 64, -65, 127, 128, -128, 16383, 16384,
+             (1 << 31) - 1, -(1 << 31), INT64_MAX, INT64_MIN, 1 << 64, -(1 << 70)]
+
+
+def _mouse_session(n: int = 2000, seed: int = 3):
+    rng = random.Random(seed)
+    t, x, y = 1_700_000_000_000, 400, 300
+    mouse_paths, click_times = [], []
+    for i in range(n):
+        t += rng.choice([16, 17])
+        x += rng.randint(-8, 8)
+        y += rng.randint(-8, 8)
+        mouse_paths.append({"x": x, "y": y, "t": t})
+        if i % 40 == 0:
+            click_times.append(t)
+    return {"mouse_paths": mouse_paths, "click_times": click_times,
+            "device": {"pointer": "mouse", "dpr": 2}}
+
+
+# ============================================================================
+# VARINT / ZIGZAG
+# ============================================================================
+
+@pytest.mark.parametrize("value", EDGE_INTS)
+def test_zigzag_round_trip(value):
+    assert _zigzag(value) >= 0
+    assert _unzigzag(_zigzag(value)) == value
+
+
+def test_zigzag_interleaves_signs():
+    assert [_zigzag(v) for v in (0, -1, 1, -2, 2)] == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("value", [v for v in EDGE_INTS if v >= 0])
+def test_varint_round_trip(value):
+    out = bytearray()
+    _write_varint(out, value)
+    assert _Reader([bytes(out)]).read_varint() == value
+
+
+@pytest.mark.parametrize("value, size", [(0, 1), (127, 1), (128, 2), (16383, 2), (16384, 3)])
+def test_varint_size_boundaries(value, size):
+    out = bytearray()
+    _write_varint(out, value)
+    assert len(out) == size
+
+
+def test_svarints_read_across_chunk_boundaries():
+    out = bytearray()
+    for value in EDGE_INTS:
+        _write_svarint(out, value)
+    chunks = [bytes(out[i:i + 1]) for i in range(len(out))]  # One byte per chunk
+    reader = _Reader(chunks)
+    assert [reader.read_svarint() for _ in EDGE_INTS] == EDGE_INTS
+
+
+def test_extreme_deltas_round_trip():
+    telemetry = {
+        "click_times": [INT64_MIN, INT64_MAX, 0, 1 << 64, -(1 << 70)],
+        "mouse_paths": [{"x": INT64_MAX, "y": INT64_MIN, "t": 0},
+                        {"x": INT64_MIN, "y": INT64_MAX, "t": INT64_MAX}],
+    }
+    assert encode_payload(telemetry)[1] == SECTION_TIMES
+    assert decode_telemetry(encode_telemetry(telemetry)) == telemetry
+
+
+# ============================================================================
+# ROUND TRIP
+# ============================================================================
+
+@pytest.mark.parametrize("mode", MODES)
+def test_round_trip_all_compressions(mode):
+    telemetry = _mouse_session()
+    blob = encode_telemetry(telemetry, compression=mode)
+    assert blob[:2] == MAGIC
+    assert decode_telemetry(blob) == telemetry
+    assert decode_telemetry(encode_telemetry(telemetry, mode, as_base64=True)) == telemetry
+
+
+def test_bytea_hex_literal():
+    edge = {"mouse_paths": [{"x": 5, "y": -3, "t": 10}, {"x": -400, "y": 2, "t": 2}], "empty": []}
+    assert decode_telemetry("\\x" + encode_telemetry(edge).hex()) == edge
+
+
+def test_integer_streams_are_delta_encoded():
+    payload = encode_payload(_mouse_session(50))
+    assert payload[1] == SECTION_POINTS  # First section: mouse_paths
+    assert compression_ratio(_mouse_session(), "zlib") > 5
+
+
+def test_iter_events_is_lazy_and_ordered():
+    telemetry = _mouse_session()
+    stream = iter_events(encode_telemetry(telemetry))
+    assert [next(stream) for _ in range(3)] == [("mouse_paths", p) for p in telemetry["mouse_paths"][:3]]
+
+
+# ============================================================================
+# FLAG_LIST (LEGACY TOP-LEVEL EVENT LISTS)
+# ============================================================================
+
+@pytest.mark.parametrize("mode", MODES)
+def test_legacy_list_round_trip(mode):
+    legacy = [{"x": 1, "y": 2, "t": 3}, {"type": "click", "t": 9.5}]
+    blob = encode_telemetry(legacy, compression=mode)
+    assert blob[3] & FLAG_LIST
+    assert decode_telemetry(blob) == legacy
+    assert decode_telemetry(encode_telemetry(legacy, mode, as_base64=True)) == legacy
+
+
+def test_empty_legacy_list_stays_a_list():
+    assert decode_telemetry(encode_telemetry([])) == []
+
+
+def test_dict_with_events_key_is_not_flagged():
+    telemetry = {"events": [{"type": "click", "t": 1}]}
+    blob = encode_telemetry(telemetry)
+    assert not blob[3] & FLAG_LIST
+    assert decode_telemetry(blob) == telemetry
+
+
+# ============================================================================
+# IRREGULAR PAYLOADS (JSON SECTIONS)
+# ============================================================================
+
+IRREGULAR = {
+    "mixed": [1, 2.5],
+    "accuracy": [0.85, 0.92],
+    "flags": [True, False],
+    "floats": [{"x": 1.5, "y": 2.25, "t": 1234.567}],
+    "partial": [{"t": 5}],
+    "extra": [{"x": 1, "y": 2, "t": 3, "button": "left"}],
+    "whole_floats": [1.0, 2.0],
+    "nested": [[1, 2], [3]],
+    "text": "Bé Minh 🧠",
+    "t": 1234.567,
+}
+
+
+@pytest.mark.parametrize("name", sorted(IRREGULAR))
+def test_irregular_streams_go_to_json_sections(name):
+    payload = encode_payload({name: IRREGULAR[name]})
+    assert payload[1] == SECTION_JSON
+
+
+def test_irregular_round_trip_keeps_types():
+    decoded = decode_telemetry(encode_telemetry(IRREGULAR))
+    assert decoded == IRREGULAR
+    assert [type(v) for v in decoded["whole_floats"]] == [float, float]
+    assert [type(v) for v in decoded["flags"]] == [bool, bool]
+    assert json.dumps(decoded, sort_keys=True) == json.dumps(IRREGULAR, sort_keys=True)
+
+
+# ============================================================================
+# MALFORMED BLOBS
+# ============================================================================
+
+def test_rejects_bad_magic():
+    with pytest.raises(TelemetryCodecError):
+        decode_telemetry(b"XX\x01\x00\x00")
+
+
+def test_rejects_unknown_version():
+    blob = bytearray(encode_telemetry({"click_times": [1]}, compression="none"))
+    blob[2] = 99
+    with pytest.raises(TelemetryCodecError):
+        decode_telemetry(bytes(blob))
+
+
+def test_rejects_truncated_payload():
+    blob = encode_telemetry(_mouse_session(100), compression="none")
+    with pytest.raises(TelemetryCodecError):
+        decode_telemetry(blob[:len(blob) // 2])
+
+
+def test_rejects_unknown_compression():
+    with pytest.raises(TelemetryCodecError):
+        encode_telemetry({"click_times": [1]}, compression="brotli")
+
+
+def test_base64_text_is_accepted():
+    blob = encode_telemetry({"click_times": [1, 2, 3]})
+    assert decode_telemetry(base64.b64encode(blob).decode("ascii")) == {"click_times": [1, 2, 3]}